@@ -0,0 +1,86 @@
+"""
+对比`NetCore.send_request`与`NetCore.send_and_parse`读取大响应时的内存分配
+
+用法: python scripts/bench_body_alloc.py [次数]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+import yarl
+from aiohttp import web
+
+from aiotieba.api.get_posts.protobuf import PbPageResIdl_pb2
+from aiotieba.core import ConnectionPool, NetCore
+
+
+def make_body(post_num: int = 400) -> bytes:
+    res_proto = PbPageResIdl_pb2.PbPageResIdl()
+    for i in range(post_num):
+        post = res_proto.data.post_list.add()
+        post.id = i
+        post.floor = i + 2
+        content = post.content.add()
+        content.type = 0
+        content.text = "测试文本" * 100
+    return res_proto.SerializeToString()
+
+
+def parse(body: bytes | memoryview) -> int:
+    res_proto = PbPageResIdl_pb2.PbPageResIdl()
+    res_proto.ParseFromString(body)
+    return len(res_proto.data.post_list)
+
+
+async def run(net_core: NetCore, url: yarl.URL, zero_copy: bool, times: int) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(times):
+        request = aiohttp.ClientRequest(aiohttp.hdrs.METH_GET, url, ssl=False)
+        if zero_copy:
+            await net_core.send_and_parse(request, parse, read_bufsize=256 * 1024)
+        else:
+            body = await net_core.send_request(request, read_bufsize=256 * 1024)
+            parse(body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+async def main(times: int) -> None:
+    body = make_body()
+
+    async def handler(_: web.Request) -> web.Response:
+        return web.Response(body=body)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    url = yarl.URL.build(scheme="http", host="127.0.0.1", port=port)
+
+    async with ConnectionPool(prewarm_num=0) as pool:
+        net_core = NetCore(pool.connector)
+        # 预热连接与缓冲区池
+        await run(net_core, url, True, 2)
+
+        print(f"body size: {len(body) / 1024:.0f} KiB, requests: {times}")
+        for zero_copy in (False, True):
+            elapsed, peak = await run(net_core, url, zero_copy, times)
+            name = "send_and_parse" if zero_copy else "send_request"
+            print(f"{name:>15}: {elapsed / times * 1e3:.3f} ms/req, peak traced memory {peak / 1024:.0f} KiB")
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
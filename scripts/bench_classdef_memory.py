@@ -0,0 +1,132 @@
+"""
+对比`slots_dataclass`与普通dataclass下`Thread`与`Post`等结果对象的常驻内存
+
+用法: python scripts/bench_classdef_memory.py [贴子数]
+"""
+
+from __future__ import annotations
+
+import dataclasses as dcs
+import gc
+import importlib.util
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+
+def use_plain_dataclass() -> None:
+    """
+    在导入api之前将slots_dataclass替换为dcs.dataclass 以得到不含__slots__的等价类
+    """
+
+    root = Path(importlib.util.find_spec("aiotieba").origin).parent
+    name = "aiotieba.api._classdef.common"
+    spec = importlib.util.spec_from_file_location(name, root / "api" / "_classdef" / "common.py")
+    common = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(common)
+    common.slots_dataclass = dcs.dataclass
+    sys.modules[name] = common
+
+
+def make_threads_body(thread_num: int) -> bytes:
+    from bench_lazy_threads import make_body
+
+    return make_body(thread_num)
+
+
+def make_posts_body(post_num: int = 100) -> bytes:
+    from aiotieba.api.get_posts.protobuf import PbPageResIdl_pb2
+
+    res_proto = PbPageResIdl_pb2.PbPageResIdl()
+    data_proto = res_proto.data
+    data_proto.forum.id = 425
+    data_proto.forum.name = "天堂鸡汤"
+    data_proto.thread.id = 8000000000
+    data_proto.thread.author.id = 1000
+    data_proto.page.total_page = 1
+
+    for i in range(post_num):
+        post = data_proto.post_list.add()
+        post.id = 140000000000 + i
+        post.floor = i + 1
+        post.author_id = 1000 + i % 40
+        post.time = 1700000000 + i
+        post.agree.agree_num = i
+        for j in range(3):
+            frag = post.content.add()
+            frag.type = 0
+            frag.text = f"第{j}段回复 " * 8
+        frag = post.content.add()
+        frag.type = 2
+        frag.text = "image_emoticon25"
+        frag.c = "滑稽"
+        frag = post.content.add()
+        frag.type = 4
+        frag.text = "@someone"
+        frag.uid = 42
+
+    for i in range(40):
+        user = data_proto.user_list.add()
+        user.id = 1000 + i
+        user.name = f"user{i}"
+        user.name_show = f"昵称{i}"
+        user.portrait = f"tb.1.{i:08x}.abcdefg?t=1700000000"
+        user.level_id = i % 18
+
+    return res_proto.SerializeToString()
+
+
+def retained(parse, body: bytes, touch: bool) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    objs = parse(body)
+    if touch:
+        for obj in objs:
+            _ = obj.text
+            _ = obj.user.log_name
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(objs)
+
+
+def measure(num: int) -> None:
+    from aiotieba.api import get_posts, get_threads
+
+    cases = [
+        ("Thread", get_threads.parse_body, make_threads_body(num)),
+        ("Post", get_posts.parse_body, make_posts_body(num)),
+    ]
+
+    for name, parse, body in cases:
+        for touch in (False, True):
+            size, count = retained(parse, body, touch)
+            print(f"{name} {int(touch)} {size / count:.0f}")
+
+
+def main(num: int) -> None:
+    results = {}
+    for mode in ("dict", "slots"):
+        out = subprocess.run(
+            [sys.executable, __file__, str(num), mode], capture_output=True, text=True, check=True
+        ).stdout
+        for line in out.splitlines():
+            name, touch, size = line.split()
+            results.setdefault((name, touch), {})[mode] = int(size)
+
+    print(f"{num} objs, retained bytes per obj")
+    for (name, touch), sizes in results.items():
+        state = "after text" if touch == "1" else "parsed"
+        before, after = sizes["dict"], sizes["slots"]
+        print(f"{name:>6} {state:>10}: dataclass {before:6d} B -> slots {after:6d} B ({after / before - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    if len(sys.argv) > 2:
+        if sys.argv[2] == "dict":
+            use_plain_dataclass()
+        measure(num)
+    else:
+        main(num)
@@ -0,0 +1,48 @@
+"""
+对比逐行与按列导出`Threads`的耗时与内存峰值
+
+用法: python scripts/bench_columns.py [次数]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+import tracemalloc
+
+from bench_lazy_threads import make_body
+
+from aiotieba.api.get_threads import parse_body
+
+
+def by_rows(body: bytes) -> list[dict]:
+    # 逐行构造字典 再交给pandas.DataFrame
+    threads = parse_body(body)
+    columns = threads._columns()
+    return [{name: getattr(thread, name) for name in columns} for thread in threads]
+
+
+def by_columns(body: bytes, lazy: bool) -> dict[str, list]:
+    return parse_body(body, lazy).to_columns()
+
+
+def main(times: int) -> None:
+    body = make_body()
+    cases = [
+        ("rows", lambda: by_rows(body)),
+        ("columns", lambda: by_columns(body, False)),
+        ("columns lazy", lambda: by_columns(body, True)),
+    ]
+
+    print(f"body size: {len(body) / 1024:.1f} KiB, loops: {times}")
+    for name, func in cases:
+        elapsed = min(timeit.repeat(func, number=times, repeat=5)) / times
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:>12}: {elapsed * 1e3:.3f} ms/export, peak {peak / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,66 @@
+"""
+统计内容碎片解码的耗时
+
+用法: python scripts/bench_frag_decode.py [次数]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from aiotieba.api.get_comments._classdef import Contents_c
+from aiotieba.api.get_posts._classdef import Contents_p
+from aiotieba.api.get_posts.protobuf import PbPageResIdl_pb2
+from aiotieba.api.get_threads._classdef import Contents_t
+from aiotieba.api.get_threads.protobuf import FrsPageResIdl_pb2
+
+# 按常见比例混合的碎片类型 以纯文本 表情与@为主
+FRAG_TYPES = [0, 0, 0, 2, 2, 4, 0, 9, 1, 18, 2, 0, 3, 35, 27, 0]
+
+
+def fill_contents(content_protos, frag_num: int) -> None:
+    for i in range(frag_num):
+        frag = content_protos.add()
+        frag.type = _type = FRAG_TYPES[i % len(FRAG_TYPES)]
+        frag.text = f"第{i}段 " * 4
+        if _type == 1:
+            frag.link = "http://tieba.baidu.com/p/8000000000"
+        elif _type == 2:
+            frag.c = "滑稽"
+        elif _type == 3:
+            frag.cdn_src = f"http://tiebapic.baidu.com/forum/pic/item/{i:040x}.jpg"
+            frag.bsize = "560,420"
+        elif _type == 4:
+            frag.uid = i
+        elif _type == 35:
+            frag.tiebaplus_info.desc = "贴吧plus"
+
+
+def make_cases(frag_num: int) -> list:
+    thread_proto = FrsPageResIdl_pb2.FrsPageResIdl().data.thread_list.add()
+    fill_contents(thread_proto.first_post_content, frag_num)
+    post_proto = PbPageResIdl_pb2.PbPageResIdl().data.post_list.add()
+    fill_contents(post_proto.content, frag_num)
+    comment_proto = post_proto.sub_post_list.sub_post_list.add()
+    fill_contents(comment_proto.content, frag_num)
+
+    return [
+        ("Contents_t", Contents_t.from_proto, thread_proto),
+        ("Contents_p", Contents_p.from_proto, post_proto),
+        ("Contents_c", Contents_c.from_proto, comment_proto),
+    ]
+
+
+def main(times: int) -> None:
+    frag_num = 64
+    print(f"fragments per content: {frag_num}, loops: {times}")
+
+    for name, from_proto, proto in make_cases(frag_num):
+        # 取多轮中的最小值以降低噪声
+        elapsed = min(timeit.repeat(lambda: from_proto(proto), number=times, repeat=5)) / times  # noqa: B023
+        print(f"{name}: {elapsed * 1e6:.1f} us/content, {elapsed / frag_num * 1e9:.0f} ns/frag")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,91 @@
+"""
+以模拟的网络延迟对比逐页请求与`fetch_full_thread`获取完整主题帖的耗时
+
+用法: python scripts/bench_full_thread.py [楼层数] [单次请求延迟ms]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from aiotieba.api.get_comments import Comment, Comments
+from aiotieba.api.get_comments._classdef import Page_c, Post_c
+from aiotieba.api.get_posts import Comment_p, Post, Posts
+from aiotieba.api.get_posts._classdef import Page_p
+from aiotieba.crawler import fetch_full_thread
+
+RN = 30
+COMMENT_PAGE_SIZE = 30
+
+
+class FakeClient:
+    def __init__(self, floor_num: int, latency: float) -> None:
+        self.floor_num = floor_num
+        self.latency = latency
+        self.total_page = (floor_num + RN - 1) // RN
+        self.requests = 0
+
+    def reply_num(self, floor: int) -> int:
+        # 每20层有一个长楼中楼
+        return 120 if floor % 20 == 0 else floor % 5
+
+    async def get_posts(self, tid, pn, *, comment_rn=4, **kwargs) -> Posts:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        posts = []
+        for floor in range((pn - 1) * RN + 1, min(pn * RN, self.floor_num) + 1):
+            reply_num = self.reply_num(floor)
+            comments = [Comment_p(pid=i) for i in range(min(reply_num, comment_rn))]
+            posts.append(Post(pid=floor, floor=floor, reply_num=reply_num, comments=comments))
+        page = Page_p(current_page=pn, total_page=self.total_page, has_more=pn < self.total_page)
+        return Posts(posts, page=page)
+
+    async def get_comments(self, tid, pid, pn, **kwargs) -> Comments:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        reply_num = self.reply_num(pid)
+        total_page = (reply_num + COMMENT_PAGE_SIZE - 1) // COMMENT_PAGE_SIZE
+        comments = [Comment(pid=i) for i in range((pn - 1) * COMMENT_PAGE_SIZE, min(pn * COMMENT_PAGE_SIZE, reply_num))]
+        return Comments(comments, page=Page_c(current_page=pn, total_page=total_page), post=Post_c(pid=pid))
+
+
+async def sequential(client: FakeClient) -> int:
+    num = 0
+    pn = 1
+    while True:
+        posts = await client.get_posts(1, pn, comment_rn=4)
+        for post in posts:
+            num += 1
+            if post.reply_num > len(post.comments):
+                cpn = 1
+                while True:
+                    comments = await client.get_comments(1, post.pid, cpn)
+                    num += len(comments)
+                    if cpn >= comments.page.total_page:
+                        break
+                    cpn += 1
+        if not posts.has_more:
+            return num
+        pn += 1
+
+
+async def main(floor_num: int, latency: float) -> None:
+    client = FakeClient(floor_num, latency)
+    start = time.perf_counter()
+    await sequential(client)
+    print(f"sequential: {time.perf_counter() - start:7.2f} s, {client.requests} requests")
+
+    for concurrency in (8, 32):
+        client = FakeClient(floor_num, latency)
+        start = time.perf_counter()
+        await fetch_full_thread(client, 1, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        print(f"concurrency={concurrency:>2}: {elapsed:7.2f} s, {client.requests} requests")
+
+
+if __name__ == "__main__":
+    floor_num = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.08
+    asyncio.run(main(floor_num, latency))
@@ -0,0 +1,104 @@
+"""
+对比`FrsPage`响应的即时解析与惰性解析的耗时与内存峰值
+
+用法: python scripts/bench_lazy_threads.py [次数]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from aiotieba.api.get_threads import parse_body
+from aiotieba.api.get_threads.protobuf import FrsPageResIdl_pb2
+
+
+def make_body(thread_num: int = 100) -> bytes:
+    res_proto = FrsPageResIdl_pb2.FrsPageResIdl()
+    data_proto = res_proto.data
+    data_proto.forum.id = 425
+    data_proto.forum.name = "天堂鸡汤"
+    data_proto.page.page_size = thread_num
+    data_proto.page.has_more = 1
+
+    for i in range(thread_num):
+        user_id = 1000 + i % 40
+        thread = data_proto.thread_list.add()
+        thread.id = 8000000000 + i
+        thread.first_post_id = 140000000000 + i
+        thread.author_id = user_id
+        thread.title = f"测试标题{i}"
+        thread.reply_num = i
+        thread.view_num = i * 10
+        thread.create_time = 1700000000 + i
+        thread.last_time_int = 1700000000 + i
+        thread.agree.agree_num = i
+        for j in range(4):
+            frag = thread.first_post_content.add()
+            frag.type = 0
+            frag.text = f"第{j}段正文 " * 12
+        frag = thread.first_post_content.add()
+        frag.type = 2
+        frag.text = "image_emoticon25"
+        frag.c = "滑稽"
+        frag = thread.first_post_content.add()
+        frag.type = 4
+        frag.text = "@someone"
+        frag.uid = 42
+        frag = thread.first_post_content.add()
+        frag.type = 3
+        frag.cdn_src = f"http://tiebapic.baidu.com/forum/w%3D720/sign=0/{i:040x}.jpg"
+        frag.origin_src = f"http://tiebapic.baidu.com/forum/pic/item/{i:040x}.jpg"
+        frag.bsize = "560,420"
+        if i % 5 == 0:
+            thread.poll_info.title = "投票"
+            for k in range(3):
+                option = thread.poll_info.options.add()
+                option.text = f"选项{k}"
+                option.num = k
+
+    for i in range(40):
+        user = data_proto.user_list.add()
+        user.id = 1000 + i
+        user.name = f"user{i}"
+        user.name_show = f"昵称{i}"
+        user.portrait = f"tb.1.{i:08x}.abcdefg?t=1700000000"
+        user.level_id = i % 18
+        user.iconinfo.add().name = "icon"
+
+    return res_proto.SerializeToString()
+
+
+def consume(threads) -> int:
+    # 模拟只读取少量字段的过滤逻辑
+    return sum(1 for thread in threads if thread.author_id and "正文" in thread.text and thread.tid)
+
+
+def measure(body: bytes, lazy: bool, times: int) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    for _ in range(times):
+        consume(parse_body(body, lazy))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    threads = parse_body(body, lazy)
+    consume(threads)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, len(threads)
+
+
+def main(times: int) -> None:
+    body = make_body()
+
+    print(f"body size: {len(body) / 1024:.1f} KiB, loops: {times}")
+    for lazy in (False, True):
+        elapsed, peak, num = measure(body, lazy, times)
+        name = "lazy" if lazy else "eager"
+        print(f"{name:>5}: {elapsed / times * 1e3:.3f} ms/parse, peak {peak / 1024:.0f} KiB for {num} threads")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
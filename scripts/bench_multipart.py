@@ -0,0 +1,91 @@
+"""
+对比旧的`MultipartWriter`组包与预编码信封组包的protobuf请求吞吐量
+
+用法: python scripts/bench_multipart.py [次数]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+import aiohttp
+import yarl
+from aiohttp import web
+
+from aiotieba.core import Account, ConnectionPool, HttpCore, NetCore
+
+
+def pack_legacy(http_core: HttpCore, url: yarl.URL, data: bytes) -> aiohttp.ClientRequest:
+    writer = aiohttp.MultipartWriter("form-data", boundary="-*_r1999")
+    payload_headers = {
+        aiohttp.hdrs.CONTENT_DISPOSITION: aiohttp.helpers.content_disposition_header(
+            "form-data", name="data", filename="file"
+        )
+    }
+    payload = aiohttp.BytesPayload(data, content_type="", headers=payload_headers)
+    payload.headers.popone(aiohttp.hdrs.CONTENT_TYPE)
+    writer._parts.append((payload, None, None))
+
+    return aiohttp.ClientRequest(
+        aiohttp.hdrs.METH_POST,
+        url,
+        headers=http_core.app_proto.headers,
+        data=writer,
+        proxy=http_core.net_core.proxy.url,
+        proxy_auth=http_core.net_core.proxy.auth,
+        ssl=False,
+    )
+
+
+def pack_framed(http_core: HttpCore, url: yarl.URL, data: bytes) -> aiohttp.ClientRequest:
+    return http_core.pack_proto_request(url, data)
+
+
+async def run(http_core: HttpCore, url: yarl.URL, pack, data: bytes, times: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    for _ in range(times):
+        pack(http_core, url, data)
+    pack_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(times):
+        await http_core.net_core.send_request(pack(http_core, url, data), read_bufsize=1024)
+    send_elapsed = time.perf_counter() - start
+
+    return pack_elapsed, send_elapsed
+
+
+async def main(times: int) -> None:
+    async def handler(request: web.Request) -> web.Response:
+        await request.read()
+        return web.Response(body=b"ok")
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    url = yarl.URL.build(scheme="http", host="127.0.0.1", port=port)
+
+    data = b"\x0a\x10" + b"x" * 512
+
+    async with ConnectionPool(prewarm_num=0) as pool:
+        http_core = HttpCore(Account(), NetCore(pool.connector))
+        await run(http_core, url, pack_framed, data, 10)
+
+        print(f"proto size: {len(data)} bytes, requests: {times}")
+        for name, pack in (("MultipartWriter", pack_legacy), ("pre-framed", pack_framed)):
+            pack_elapsed, send_elapsed = await run(http_core, url, pack, data, times)
+            print(
+                f"{name:>15}: pack {pack_elapsed / times * 1e6:.1f} us/req, round trip {times / send_elapsed:.0f} req/s"
+            )
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,76 @@
+"""
+对比在事件循环中解析与交由执行器解析大响应时的事件循环延迟
+
+用法: python scripts/bench_parse_offload.py [次数]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from bench_classdef_memory import make_posts_body
+
+from aiotieba.api.get_posts import parse_body
+from aiotieba.config import ParseConfig
+from aiotieba.core import NetCore
+
+TICK = 0.001
+
+
+async def ticker(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append(loop.time() - start - TICK)
+
+
+async def run(executor: Executor | None, body: bytes, times: int) -> tuple[float, float, float]:
+    net_core = NetCore(None, parse=ParseConfig(executor, threshold=0))
+    # 预热执行器
+    await net_core.parse(parse_body, body)
+
+    lags = []
+    stop = asyncio.Event()
+    task = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(TICK * 5)
+
+    start = time.perf_counter()
+    # 模拟4个并发请求同时完成
+    for _ in range(times // 4):
+        await asyncio.gather(*[net_core.parse(parse_body, body) for _ in range(4)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await task
+
+    lags.sort()
+    return elapsed, lags[int(len(lags) * 0.99)], lags[-1]
+
+
+async def main(times: int) -> None:
+    body = make_posts_body(1000)
+    print(f"body size: {len(body) / 1024:.0f} KiB, parses: {times}")
+
+    cases = [
+        ("inline", lambda: None),
+        ("thread x1", lambda: ThreadPoolExecutor(1)),
+        ("thread x2", lambda: ThreadPoolExecutor(2)),
+        ("process x2", lambda: ProcessPoolExecutor(2)),
+    ]
+    for name, factory in cases:
+        executor = factory()
+        elapsed, p99, worst = await run(executor, body, times)
+        if executor is not None:
+            executor.shutdown()
+        print(
+            f"{name:>10}: {elapsed / times * 1e3:6.2f} ms/parse, "
+            f"loop lag p99 {p99 * 1e3:6.2f} ms, max {worst * 1e3:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 40))
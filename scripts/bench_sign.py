@@ -0,0 +1,55 @@
+"""
+对比Python实现的签名+urlencode与`crypto.sign_urlencode`的表单打包耗时
+
+用法: python scripts/bench_sign.py [次数]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+import urllib.parse
+
+from aiotieba.helper.crypto import APP_SALT, sign, sign_urlencode
+
+
+def make_data() -> list[tuple[str, str | int]]:
+    return [
+        ("BDUSS", "X" * 192),
+        ("_client_id", "wappc_1672402342424_424"),
+        ("_client_type", 2),
+        ("_client_version", "12.64.1.1"),
+        ("anonymous", 1),
+        ("barrage_time", 0),
+        ("can_no_forum", 0),
+        ("content", "测试内容 Hello World! #(滑稽)" * 4),
+        ("cuid", "06C7F37D41256F25FABA97B885DB6EFB|VAPUDW7TA"),
+        ("cuid_galaxy2", "06C7F37D41256F25FABA97B885DB6EFB|VAPUDW7TA"),
+        ("fid", 425),
+        ("is_feedback", 0),
+        ("kw", "天堂鸡汤"),
+        ("reply_uid", "null"),
+        ("tbs", "0123456789abcdef0123456789abcdef"),
+        ("tid", 8765432109),
+    ]
+
+
+def pack_python(data: list[tuple[str, str | int]]) -> bytes:
+    return urllib.parse.urlencode(sign(data, salt=APP_SALT), doseq=True).encode("utf-8")
+
+
+def pack_native(data: list[tuple[str, str | int]]) -> bytes:
+    return sign_urlencode(data, APP_SALT)
+
+
+def main(times: int) -> None:
+    assert pack_python(make_data()) == pack_native(make_data())
+
+    print(f"params: {len(make_data())}, loops: {times}")
+    for name, pack in (("python", pack_python), ("native", pack_native)):
+        elapsed = min(timeit.repeat(lambda pack=pack: pack(make_data()), number=times, repeat=5))
+        print(f"{name:>6}: {elapsed / times * 1e6:.2f} us/op")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,101 @@
+"""
+统计同一作者大量重复出现时 解析并访问`user`的耗时与内存分配
+
+用法: python scripts/bench_user_intern.py [次数]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+import tracemalloc
+
+from aiotieba.api import get_comments, get_posts
+from aiotieba.api.get_comments.protobuf import PbFloorResIdl_pb2
+from aiotieba.api.get_posts.protobuf import PbPageResIdl_pb2
+
+USER_NUM = 20
+
+
+def fill_user(user_proto, user_id: int) -> None:
+    user_proto.id = user_id
+    user_proto.name = f"user{user_id}"
+    user_proto.name_show = f"昵称{user_id}"
+    user_proto.portrait = f"tb.1.{user_id:08x}.abcdefg?t=1700000000"
+    user_proto.level_id = user_id % 18
+    user_proto.iconinfo.add().name = "icon"
+
+
+def make_posts_body(post_num: int, comment_num: int) -> bytes:
+    res_proto = PbPageResIdl_pb2.PbPageResIdl()
+    data_proto = res_proto.data
+    data_proto.forum.id = 425
+    data_proto.thread.id = 8000000000
+    data_proto.thread.author.id = 1000
+
+    for i in range(post_num):
+        post = data_proto.post_list.add()
+        post.id = 140000000000 + i
+        post.floor = i + 1
+        post.author_id = 1000 + i % USER_NUM
+        post.content.add().text = f"第{i}楼"
+        for j in range(comment_num):
+            comment = post.sub_post_list.sub_post_list.add()
+            comment.id = 150000000000 + i * comment_num + j
+            comment.author_id = 1000 + j % USER_NUM
+            comment.content.add().text = f"第{j}条楼中楼"
+
+    for i in range(USER_NUM):
+        fill_user(data_proto.user_list.add(), 1000 + i)
+
+    return res_proto.SerializeToString()
+
+
+def make_comments_body(comment_num: int) -> bytes:
+    res_proto = PbFloorResIdl_pb2.PbFloorResIdl()
+    data_proto = res_proto.data
+    data_proto.forum.id = 425
+    data_proto.thread.id = 8000000000
+    data_proto.post.id = 140000000000
+
+    for i in range(comment_num):
+        comment = data_proto.subpost_list.add()
+        comment.id = 150000000000 + i
+        comment.content.add().text = f"第{i}条楼中楼"
+        fill_user(comment.author, 1000 + i % USER_NUM)
+
+    return res_proto.SerializeToString()
+
+
+def touch_posts(posts) -> None:
+    for post in posts:
+        _ = post.user.user_id
+        for comment in post.comments:
+            _ = comment.user.user_id
+
+
+def touch_comments(comments) -> None:
+    for comment in comments:
+        _ = comment.user.user_id
+
+
+def main(times: int) -> None:
+    posts_body = make_posts_body(30, 10)
+    comments_body = make_comments_body(300)
+    cases = [
+        ("get_posts lazy", lambda: touch_posts(get_posts.parse_body(posts_body, True))),
+        ("get_comments", lambda: touch_comments(get_comments.parse_body(comments_body))),
+        ("get_comments lazy", lambda: touch_comments(get_comments.parse_body(comments_body, True))),
+    ]
+
+    for name, func in cases:
+        elapsed = min(timeit.repeat(func, number=times, repeat=5)) / times
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:>17}: {elapsed * 1e3:.2f} ms/parse, peak {peak / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
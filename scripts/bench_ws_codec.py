@@ -0,0 +1,75 @@
+"""
+对比逐帧新建加解密上下文与复用`WsCodec`时websocket帧的打包/解包吞吐
+
+用法: python scripts/bench_ws_codec.py [负载字节数] [帧数]
+"""
+
+from __future__ import annotations
+
+import gzip
+import sys
+import time
+
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import algorithms
+
+from aiotieba.core import Account, WsCodec
+
+
+def pack_legacy(account: Account, data: bytes, cmd: int, req_id: int) -> bytes:
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    data = padder.update(data) + padder.finalize()
+    encryptor = account.aes_ecb_chiper.encryptor()
+    data = encryptor.update(data) + encryptor.finalize()
+    return b"".join([(0x88).to_bytes(1, "big"), cmd.to_bytes(4, "big"), req_id.to_bytes(4, "big"), data])
+
+
+def parse_legacy(account: Account, data: bytes) -> tuple[bytes, int, int]:
+    data_view = memoryview(data)
+    flag = data_view[0]
+    cmd = int.from_bytes(data_view[1:5], "big")
+    req_id = int.from_bytes(data_view[5:9], "big")
+    data = data_view[9:]
+    if flag & 0b10000000:
+        decryptor = account.aes_ecb_chiper.decryptor()
+        data = decryptor.update(data) + decryptor.finalize()
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        data = unpadder.update(data) + unpadder.finalize()
+    if flag & 0b01000000:
+        data = gzip.decompress(data)
+    return data, cmd, req_id
+
+
+def measure(func, times: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for i in range(times):
+            func(i)
+        best = min(best, time.perf_counter() - start)
+    return times / best
+
+
+def main(size: int, times: int) -> None:
+    account = Account()
+    codec = WsCodec(account)
+    data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    frame = bytes(codec.pack(data, 1, 1))
+    assert pack_legacy(account, data, 1, 1) == frame
+    assert parse_legacy(account, frame) == codec.parse(frame)
+
+    print(f"payload: {size} bytes, frames: {times}")
+    cases = [
+        ("pack legacy", lambda i: pack_legacy(account, data, 1, i)),
+        ("pack codec", lambda i: codec.pack(data, 1, i)),
+        ("parse legacy", lambda _: parse_legacy(account, frame)),
+        ("parse codec", lambda _: codec.parse(frame)),
+    ]
+    for name, func in cases:
+        print(f"{name:>12}: {measure(func, times) / 1e3:8.1f} k frames/s")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    main(size, times)
@@ -6,10 +6,11 @@ Asynchronous I/O Client/Reviewer for Baidu Tieba
 @Documentation: https://aiotieba.cc/
 """
 
-from . import const, core, enums, exception, logging, typing
+from . import const, core, crawler, enums, exception, logging, typing
 from .__version__ import __version__
 from .client import Client
-from .config import ProxyConfig, TimeoutConfig
-from .core import Account
+from .config import ParseConfig, ProxyConfig, ReconnectConfig, RetryConfig, TimeoutConfig
+from .core import Account, ConnectionPool, RateScheduler, priority
 from .enums import *  # noqa: F403
+from .helper.cache import ForumInfoCache, ResponseCache, UserIdentityCache
 from .logging import enable_filelog, get_logger
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+
+def __getattr__(name: str) -> ModuleType:
+    """
+    按需加载api子模块
+
+    返回的模块会在首次访问其属性时才真正执行
+    从而将protobuf描述符与解析依赖的导入推迟到第一次调用该api时
+    """
+
+    fullname = f"{__name__}.{name}"
+    if (module := sys.modules.get(fullname)) is not None:
+        return module
+
+    if name.startswith("__") or (spec := importlib.util.find_spec(fullname)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[fullname] = module
+    loader.exec_module(module)
+    setattr(sys.modules[__name__], name, module)
+
+    return module
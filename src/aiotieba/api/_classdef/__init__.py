@@ -1,8 +1,9 @@
 from ...core import Account
-from .common import TypeMessage
+from .common import TypeMessage, slots_dataclass
 from .container import Containers
 from .contents import (
     FragAt,
+    FragDecoder,
     FragEmoji,
     FragImage,
     FragItem,
@@ -19,5 +20,5 @@ from .contents import (
     TypeFragText,
     TypeFragTiebaPlus,
 )
-from .user import UserInfo
+from .user import UserInfo, UserTable
 from .vote import VoteInfo
@@ -1,5 +1,76 @@
-from typing import TypeVar
+from __future__ import annotations
+
+import dataclasses as dcs
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from google.protobuf.message import Message
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 TypeMessage = TypeVar("TypeMessage", bound=Message)
+
+
+class _SlotCachedProperty:
+    """
+    将结果缓存在预留槽位中的cached_property
+    """
+
+    def __init__(self, func: Callable[[Any], Any], slot: Any) -> None:
+        self.func = func
+        self.slot = slot
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            val = self.func(instance)
+            self.slot.__set__(instance, val)
+            return val
+
+    def __set__(self, instance, val) -> None:
+        self.slot.__set__(instance, val)
+
+    def __delete__(self, instance) -> None:
+        self.slot.__delete__(instance)
+
+
+def _slots_dataclass(cls: type) -> type:
+    """
+    生成不含__dict__的紧凑dataclass
+
+    字段均存放于__slots__中
+    每个cached_property额外占用一个名为_cached_{name}的槽位作为缓存
+    """
+
+    cls = dcs.dataclass(cls)
+    cls_dict = dict(cls.__dict__)
+
+    inherited = {slot for base in cls.__mro__[1:-1] for slot in base.__dict__.get("__slots__", ())}
+    field_slots = [f.name for f in dcs.fields(cls) if f.name not in inherited]
+    cached = {name: attr.func for name, attr in cls_dict.items() if isinstance(attr, cached_property)}
+
+    for name in field_slots:
+        cls_dict.pop(name, None)
+    for name in cached:
+        del cls_dict[name]
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    cls_dict["__slots__"] = (*field_slots, *(f"_cached_{name}" for name in cached))
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    for name, func in cached.items():
+        setattr(new_cls, name, _SlotCachedProperty(func, new_cls.__dict__[f"_cached_{name}"]))
+
+    return new_cls
+
+
+if TYPE_CHECKING:
+    slots_dataclass = dcs.dataclass
+else:
+    slots_dataclass = _slots_dataclass
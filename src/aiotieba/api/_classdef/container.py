@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import dataclasses as dcs
-from typing import TYPE_CHECKING, Generic, SupportsIndex, TypeVar, overload
+import operator
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Generic, SupportsIndex, TypeVar, overload
+
+from .common import slots_dataclass
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterable, Iterator
+
+    import pyarrow as pa
+
+_SCALAR_TYPES = frozenset(["int", "float", "str", "bool"])
 
 TypeContainer = TypeVar("TypeContainer")
 
 
-@dcs.dataclass
+@slots_dataclass
 class Containers(Generic[TypeContainer]):
     """
     内容列表的泛型基类
@@ -44,3 +52,56 @@ class Containers(Generic[TypeContainer]):
 
     def __bool__(self) -> bool:
         return bool(self.objs)
+
+    def _columns(self) -> list[str]:
+        # 默认导出元素中所有标量类型的字段
+        if not self.objs or not dcs.is_dataclass(obj := self.objs[0]):
+            return []
+        return [field.name for field in dcs.fields(obj) if field.type in _SCALAR_TYPES]
+
+    def to_columns(self, columns: Iterable[str] | None = None) -> dict[str, list]:
+        """
+        按列导出内容列表
+
+        Args:
+            columns (Iterable[str], optional): 需要导出的属性名. Defaults to None.
+                为None时导出该列表的默认列
+
+        Returns:
+            dict[str, list]: 属性名 -> 该属性在各元素上的取值
+
+        Note:
+            要求所有元素为同一类型
+            对于惰性解析的元素 会直接由protobuf计算取值而不缓存 从而避免为每个元素构造属性
+        """
+
+        if columns is None:
+            columns = self._columns()
+        if not self.objs:
+            return {name: [] for name in columns}
+
+        cls = type(self.objs[0])
+        return {name: list(map(_column_getter(cls, name), self.objs)) for name in columns}
+
+    def to_arrow(self, columns: Iterable[str] | None = None) -> pa.Table:
+        """
+        按列导出为pyarrow.Table 需要安装pyarrow
+
+        Args:
+            columns (Iterable[str], optional): 需要导出的属性名. Defaults to None.
+                为None时导出该列表的默认列
+
+        Returns:
+            pa.Table: 可进一步通过to_pandas()转换为DataFrame
+        """
+
+        import pyarrow as pa
+
+        return pa.table(self.to_columns(columns))
+
+
+def _column_getter(cls: type, name: str) -> Callable[[Any], Any]:
+    attr = getattr(cls, name, None)
+    if isinstance(attr, cached_property):
+        return attr.func
+    return operator.attrgetter(name)
@@ -7,15 +7,17 @@ from typing import TYPE_CHECKING, Any, Protocol, TypeVar
 
 import yarl
 
+from .common import slots_dataclass
+
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Container, Iterable, Mapping
 
     from .common import TypeMessage
 
 TypeFragment = TypeVar("TypeFragment")
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragText:
     """
     纯文本碎片
@@ -41,7 +43,7 @@ class TypeFragText(Protocol):
     text: str
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragEmoji:
     """
     表情碎片
@@ -69,7 +71,7 @@ class TypeFragEmoji(Protocol):
 _IMAGEHASH_EXP = re.compile(r"/([a-z0-9]{32,})\.")
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage:
     """
     图像碎片
@@ -118,7 +120,7 @@ class TypeFragImage(Protocol):
     hash: str
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragAt:
     """
     @碎片
@@ -143,7 +145,7 @@ class TypeFragAt(Protocol):
     user_id: int
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragVoice:
     """
     音频碎片
@@ -171,7 +173,7 @@ class TypeFragVoice(Protocol):
     duration: int
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragVideo:
     """
     视频碎片
@@ -215,7 +217,7 @@ class TypeFragVideo(Protocol):
     view_num: int
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragLink:
     """
     链接碎片
@@ -271,7 +273,7 @@ class TypeFragLink(Protocol):
     def is_external(self) -> bool: ...
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragTiebaPlus:
     """
     贴吧plus广告碎片
@@ -296,7 +298,7 @@ class TypeFragTiebaPlus(Protocol):
     url: yarl.URL
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragItem:
     """
     item碎片
@@ -317,7 +319,7 @@ class TypeFragItem(Protocol):
     text: str
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragUnknown:
     """
     未知碎片
@@ -335,3 +337,148 @@ class FragUnknown:
     @staticmethod
     def from_json(data: Mapping) -> FragUnknown:
         return FragUnknown(data)
+
+
+class FragDecoder:
+    """
+    基于类型分派表的内容碎片解码器
+
+    一次遍历即可生成混合碎片列表与按类型划分的碎片列表
+
+    Args:
+        routes (Mapping[int, tuple | None]): 碎片类型 -> (构造函数, 追加到的列表名, 赋值到的字段名, 是否加入混合列表)
+            值为None表示跳过该类型的碎片 未登记的类型将解码为FragUnknown
+        from_json (bool, optional): 碎片数据为json字典而非protobuf. Defaults to False.
+        text_types (Iterable[int], optional): 视为纯文本碎片的类型. Defaults to ().
+    """
+
+    def __init__(
+        self,
+        routes: Mapping[int, tuple[Callable[[Any], Any], tuple[str, ...], str | None, bool] | None],
+        from_json: bool = False,
+        text_types: Iterable[int] = (),
+    ) -> None:
+        self._table = dict(routes)
+        self._lists = tuple({name: None for route in self._table.values() if route for name in route[1]})
+        self._from_json = from_json
+        self.text_types = frozenset(text_types)
+
+    @staticmethod
+    def from_frags(
+        text: type,
+        emoji: type | None = None,
+        image: type | None = None,
+        at: type | None = None,
+        link: type | None = None,
+        tiebaplus: type | None = None,
+        voice: type | None = None,
+        video: type | None = None,
+        text_types: Iterable[int] = (0, 9, 18, 27),
+        skip_types: Iterable[int] = (34,),
+    ) -> FragDecoder:
+        """
+        由各类碎片的数据类生成常规的protobuf碎片解码器
+
+        Args:
+            text (type): 纯文本碎片
+            emoji (type, optional): 表情碎片. Defaults to None.
+            image (type, optional): 图像碎片. Defaults to None.
+            at (type, optional): @碎片. Defaults to None.
+            link (type, optional): 链接碎片. Defaults to None.
+            tiebaplus (type, optional): 贴吧plus碎片. Defaults to None.
+            voice (type, optional): 音频碎片. Defaults to None.
+            video (type, optional): 视频碎片. Defaults to None.
+            text_types (Iterable[int], optional): 视为纯文本碎片的类型. Defaults to (0, 9, 18, 27).
+            skip_types (Iterable[int], optional): 直接跳过的碎片类型. Defaults to (34,).
+
+        Returns:
+            FragDecoder
+        """
+
+        routes = {}
+        # 0纯文本 9电话号 18话题 27百科词条 回复另视40梗百科为纯文本
+        for _type in text_types:
+            routes[_type] = (text.from_proto, ("texts",), None, True)
+        # 11:tid=5047676428
+        if emoji is not None:
+            routes[2] = routes[11] = (emoji.from_proto, ("emojis",), None, True)
+        # 20:tid=5470214675
+        if image is not None:
+            routes[3] = routes[20] = (image.from_proto, ("imgs",), None, True)
+        if at is not None:
+            routes[4] = (at.from_proto, ("ats", "texts"), None, True)
+        if link is not None:
+            routes[1] = (link.from_proto, ("links", "texts"), None, True)
+        if voice is not None:
+            routes[10] = (voice.from_proto, (), "voice", True)
+        if video is not None:
+            routes[5] = (video.from_proto, (), "video", True)
+        # 35|36:tid=7769728331 / 37:tid=7760184147
+        if tiebaplus is not None:
+            routes[35] = routes[36] = routes[37] = (tiebaplus.from_proto, ("tiebapluses", "texts"), None, True)
+        for _type in skip_types:
+            routes[_type] = None
+
+        return FragDecoder(routes, text_types=text_types)
+
+    def decode(self, datas: Iterable[TypeMessage] | Iterable[Mapping]) -> dict[str, Any]:
+        """
+        解码内容碎片
+
+        Args:
+            datas (Iterable[TypeMessage] | Iterable[Mapping]): 内容碎片的protobuf或json列表
+
+        Returns:
+            dict[str, Any]: 以Contents字段名为键 可直接用于构造Contents
+                objs为混合碎片列表 其余为按类型划分的碎片列表或单个碎片
+        """
+
+        objs = []
+        frags = {name: [] for name in self._lists}
+        frags["objs"] = objs
+
+        table = self._table
+        from_json = self._from_json
+        for data in datas:
+            _type = int(data["type"]) if from_json else data.type
+            route = table.get(_type, _UNKNOWN_ROUTE)
+            if route is None:
+                continue
+
+            factory, lists, field, in_objs = route
+            frag = factory(data)
+            if in_objs:
+                objs.append(frag)
+            for name in lists:
+                frags[name].append(frag)
+            if field is not None:
+                frags[field] = frag
+
+        return frags
+
+
+_UNKNOWN_ROUTE = (FragUnknown, (), None, True)
+
+
+def join_proto_text(content_protos: Iterable[TypeMessage], text_types: Container[int]) -> str:
+    """
+    不构造内容碎片 直接从protobuf拼接文本内容
+
+    Args:
+        content_protos (Iterable[TypeMessage]): 内容碎片的protobuf列表
+        text_types (Container[int]): 视为纯文本碎片的类型
+
+    Returns:
+        str: 与Contents.text一致的文本内容
+    """
+
+    texts = []
+    for proto in content_protos:
+        _type = proto.type
+        if _type in text_types or _type == 4:
+            texts.append(proto.text)
+        elif _type == 1:
+            texts.append(proto.link)
+        elif _type in [35, 36, 37]:
+            texts.append(proto.tiebaplus_info.desc)
+    return "".join(texts)
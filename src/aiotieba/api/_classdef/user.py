@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import dataclasses as dcs
+from typing import TYPE_CHECKING, Generic, TypeVar
 
 from ...enums import Gender, PrivLike, PrivReply
+from .common import slots_dataclass
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
 
-@dcs.dataclass
+    from .common import TypeMessage
+
+TypeUserInfo = TypeVar("TypeUserInfo")
+
+
+@slots_dataclass
 class UserInfo:
     """
     用户信息
@@ -104,3 +113,48 @@ class UserInfo:
             return f"{self.nick_name}/{self.portrait}"
         else:
             return str(self.user_id)
+
+
+class UserTable(Generic[TypeUserInfo]):
+    """
+    单个响应内按user_id去重的用户信息表
+
+    同一user_id只在首次访问时由protobuf构造一次用户信息
+    此后该响应中的所有贴子都引用同一个对象
+
+    Args:
+        factory (Callable[[TypeMessage], TypeUserInfo]): 由protobuf构造用户信息的函数
+        user_protos (Iterable[TypeMessage], optional): 响应附带的用户信息protobuf列表. Defaults to ().
+    """
+
+    __slots__ = ["_factory", "_protos", "_users"]
+
+    def __init__(self, factory: Callable[[TypeMessage], TypeUserInfo], user_protos: Iterable[TypeMessage] = ()) -> None:
+        self._factory = factory
+        self._protos = {p.id: p for p in user_protos}
+        self._users: dict[int, TypeUserInfo] = {}
+
+    def __getitem__(self, user_id: int) -> TypeUserInfo:
+        """
+        获取响应附带的用户信息
+
+        Raises:
+            KeyError: 响应中没有该user_id对应的用户
+        """
+
+        if (user := self._users.get(user_id)) is None:
+            user = self._users[user_id] = self._factory(self._protos[user_id])
+        return user
+
+    def intern(self, user_proto: TypeMessage) -> TypeUserInfo:
+        """
+        获取与user_proto同一user_id的用户信息 不存在时由user_proto构造
+
+        user_id为0的匿名用户之间无法区分 总是构造新的对象
+        """
+
+        if not (user_id := user_proto.id):
+            return self._factory(user_proto)
+        if (user := self._users.get(user_id)) is None:
+            user = self._users[user_id] = self._factory(user_proto)
+        return user
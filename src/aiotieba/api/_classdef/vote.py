@@ -3,11 +3,13 @@ from __future__ import annotations
 import dataclasses as dcs
 from typing import TYPE_CHECKING
 
+from .common import slots_dataclass
+
 if TYPE_CHECKING:
     from .common import TypeMessage
 
 
-@dcs.dataclass
+@slots_dataclass
 class VoteOption:
     """
     投票选项信息
@@ -27,7 +29,7 @@ class VoteOption:
         return VoteOption(vote_num, text)
 
 
-@dcs.dataclass
+@slots_dataclass
 class VoteInfo:
     """
     投票信息
@@ -6,13 +6,13 @@ from typing import TYPE_CHECKING
 
 from ...enums import PrivLike, PrivReply
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_at:
     """
     页信息
@@ -37,7 +37,7 @@ class Page_at:
         return Page_at(current_page, has_more, has_prev)
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_at:
     """
     用户信息
@@ -111,7 +111,7 @@ class UserInfo_at:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class At:
     """
     @信息
@@ -4,13 +4,13 @@ import dataclasses as dcs
 from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     import bs4
 
 
-@dcs.dataclass
+@slots_dataclass
 class BawuBlacklistUser:
     """
     用户信息
@@ -52,7 +52,7 @@ class BawuBlacklistUser:
         return str(self)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_bwblacklist:
     """
     页信息
@@ -17,7 +17,7 @@ def pack_proto(fid: int) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> BawuInfo:
+def parse_body(body: bytes | memoryview) -> BawuInfo:
     res_proto = GetBawuInfoResIdl_pb2.GetBawuInfoResIdl()
     res_proto.ParseFromString(body)
 
@@ -32,18 +32,23 @@ def parse_body(body: bytes) -> BawuInfo:
 
 async def request_http(http_core: HttpCore, fid: int) -> BawuInfo:
     data = pack_proto(fid)
+    return await http_core.net_core.fetch((CMD, data), _request_http, http_core, data)
 
+
+async def _request_http(http_core: HttpCore, data: bytes) -> BawuInfo:
     request = http_core.pack_proto_request(
         yarl.URL.build(scheme="http", host=APP_BASE_HOST, path="/c/f/forum/getBawuInfo", query_string=f"cmd={CMD}"),
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=8 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(request, parse_body, read_bufsize=8 * 1024)
 
 
 async def request_ws(ws_core: WsCore, fid: int) -> BawuInfo:
     data = pack_proto(fid)
+    return await ws_core.net_core.fetch((CMD, data), _request_ws, ws_core, data)
+
 
-    response = await ws_core.send(data, CMD)
+async def _request_ws(ws_core: WsCore, data: bytes) -> BawuInfo:
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
@@ -4,11 +4,13 @@ import dataclasses as dcs
 from functools import cached_property
 from typing import TYPE_CHECKING
 
+from .._classdef import slots_dataclass
+
 if TYPE_CHECKING:
     from .._classdef import TypeMessage
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_bawu:
     """
     用户信息
@@ -6,14 +6,14 @@ from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
 from ...helper import default_datetime
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 from .._classdef.contents import _IMAGEHASH_EXP
 
 if TYPE_CHECKING:
     import bs4
 
 
-@dcs.dataclass
+@slots_dataclass
 class Media_postlog:
     """
     媒体信息
@@ -40,7 +40,7 @@ class Media_postlog:
         return Media_postlog(src, origin_src, hash_)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Postlog:
     """
     吧务帖子管理日志
@@ -122,7 +122,7 @@ class Postlog:
         return Postlog(text, title, medias, tid, pid, op_type, post_portrait, post_time, op_user_name, op_time)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_postlog:
     """
     页信息
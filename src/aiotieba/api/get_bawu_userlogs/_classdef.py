@@ -6,13 +6,13 @@ from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
 from ...helper import default_datetime
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     import bs4
 
 
-@dcs.dataclass
+@slots_dataclass
 class Userlog:
     """
     吧务用户管理日志
@@ -54,7 +54,7 @@ class Userlog:
         return Userlog(op_type, op_duration, user_portrait, op_user_name, op_time)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_userlog:
     """
     页信息
@@ -6,13 +6,13 @@ from typing import TYPE_CHECKING
 
 from ...enums import BlacklistType
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class BlacklistUser:
     """
     用户信息
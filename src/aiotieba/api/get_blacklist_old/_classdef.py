@@ -4,10 +4,10 @@ import dataclasses as dcs
 from functools import cached_property
 
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage
+from .._classdef import Containers, TypeMessage, slots_dataclass
 
 
-@dcs.dataclass
+@slots_dataclass
 class BlacklistOldUser:
     """
     用户信息
@@ -69,7 +69,7 @@ class BlacklistOldUser:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_blacklist:
     """
     页信息
@@ -6,13 +6,13 @@ from typing import TYPE_CHECKING
 import bs4
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class Block:
     """
     待解封用户信息
@@ -39,7 +39,7 @@ class Block:
         return Block(user_id, user_name, nick_name_old, day)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_block:
     """
     页信息
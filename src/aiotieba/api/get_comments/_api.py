@@ -1,3 +1,5 @@
+import functools
+
 import yarl
 
 from ...const import APP_BASE_HOST, STABLE_VERSION
@@ -23,7 +25,7 @@ def pack_proto(tid: int, pid: int, pn: int, is_comment: bool) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> Comments:
+def parse_body(body: bytes | memoryview, lazy: bool = False) -> Comments:
     res_proto = PbFloorResIdl_pb2.PbFloorResIdl()
     res_proto.ParseFromString(body)
 
@@ -31,25 +33,34 @@ def parse_body(body: bytes) -> Comments:
         raise TiebaServerError(code, res_proto.error.errmsg)
 
     data_proto = res_proto.data
-    comments = Comments.from_proto(data_proto)
+    comments = Comments.from_proto(data_proto, lazy)
 
     return comments
 
 
-async def request_http(http_core: HttpCore, tid: int, pid: int, pn: int, is_comment: bool) -> Comments:
+async def request_http(
+    http_core: HttpCore, tid: int, pid: int, pn: int, is_comment: bool, lazy: bool = False
+) -> Comments:
     data = pack_proto(tid, pid, pn, is_comment)
+    return await http_core.net_core.fetch((CMD, data, lazy), _request_http, http_core, data, lazy)
+
 
+async def _request_http(http_core: HttpCore, data: bytes, lazy: bool) -> Comments:
     request = http_core.pack_proto_request(
         yarl.URL.build(scheme="http", host=APP_BASE_HOST, path="/c/f/pb/floor", query_string=f"cmd={CMD}"),
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=8 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(
+        request, functools.partial(parse_body, lazy=lazy), read_bufsize=8 * 1024
+    )
 
 
-async def request_ws(ws_core: WsCore, tid: int, pid: int, pn: int, is_comment: bool) -> Comments:
+async def request_ws(ws_core: WsCore, tid: int, pid: int, pn: int, is_comment: bool, lazy: bool = False) -> Comments:
     data = pack_proto(tid, pid, pn, is_comment)
+    return await ws_core.net_core.fetch((CMD, data, lazy), _request_ws, ws_core, data, lazy)
+
 
-    response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+async def _request_ws(ws_core: WsCore, data: bytes, lazy: bool) -> Comments:
+    response = await ws_core.send(data, CMD, idempotent=True)
+    return await ws_core.net_core.parse(functools.partial(parse_body, lazy=lazy), await response.read())
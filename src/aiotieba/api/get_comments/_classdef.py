@@ -7,15 +7,15 @@ from ...enums import Gender, PrivLike, PrivReply, ThreadType
 from ...exception import TbErrorExt
 from ...helper import deprecated
 from ...logging import get_logger as LOG
-from .._classdef import Containers, TypeMessage
+from .._classdef import Containers, TypeMessage, UserTable, slots_dataclass
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
+    FragDecoder,
     FragEmoji,
     FragLink,
     FragText,
     FragTiebaPlus,
-    FragUnknown,
     FragVoice,
     TypeFragment,
     TypeFragText,
@@ -29,7 +29,17 @@ FragTiebaPlus_c = FragTiebaPlus_cp = FragTiebaPlus
 FragVoice_c = FragVoice_cp = FragVoice
 
 
-@dcs.dataclass
+_FRAG_DECODER_C = FragDecoder.from_frags(
+    FragText_c,
+    emoji=FragEmoji_c,
+    at=FragAt_c,
+    link=FragLink_c,
+    tiebaplus=FragTiebaPlus_c,
+    voice=FragVoice_c,
+)
+
+
+@slots_dataclass
 class Contents_c(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -56,58 +66,7 @@ class Contents_c(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_c:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        ats = []
-        links = []
-        tiebapluses = []
-        voice = FragVoice_c()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_c.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_c.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_c.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_c.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    frag = FragVoice_c.from_proto(proto)
-                    nonlocal voice
-                    voice = frag
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_c.from_proto(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    yield FragUnknown.from_proto(proto)
-
-        objs = list(_frags())
-
-        return Contents_c(objs, texts, emojis, ats, links, tiebapluses, voice)
+        return Contents_c(**_FRAG_DECODER_C.decode(data_proto.content))
 
     @cached_property
     def text(self) -> str:
@@ -115,7 +74,7 @@ class Contents_c(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_c:
     """
     用户信息
@@ -217,7 +176,7 @@ class UserInfo_c:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Comment:
     """
     楼中楼信息
@@ -259,7 +218,7 @@ class Comment:
     is_thread_author: bool = False
 
     @staticmethod
-    def from_proto(data_proto: TypeMessage) -> None:
+    def _parse_contents(data_proto: TypeMessage) -> tuple[Contents_c, int]:
         contents = Contents_c.from_proto(data_proto)
 
         reply_to_id = 0
@@ -279,8 +238,17 @@ class Comment:
                     first_text_frag = contents.texts[0]
                     first_text_frag.text = first_text_frag.text.removeprefix(" :")
 
+        return contents, reply_to_id
+
+    @staticmethod
+    def from_proto(data_proto: TypeMessage, users: UserTable[UserInfo_c] | None = None) -> None:
+        contents, reply_to_id = Comment._parse_contents(data_proto)
+
         pid = data_proto.id
-        user = UserInfo_c.from_proto(data_proto.author)
+        if users is not None:
+            user = users.intern(data_proto.author)
+        else:
+            user = UserInfo_c.from_proto(data_proto.author)
         agree = data_proto.agree.agree_num
         disagree = data_proto.agree.disagree_num
         create_time = data_proto.time
@@ -302,7 +270,81 @@ class Comment:
         return self.user.user_id
 
 
-@dcs.dataclass
+class LazyComment(Comment):
+    """
+    惰性解析的楼中楼信息
+
+    仅持有底层protobuf消息 各属性在首次访问时才被构造
+    公开属性与Comment一致
+
+    Note:
+        该对象会一直引用整个响应的protobuf消息
+    """
+
+    def __init__(
+        self,
+        data_proto: TypeMessage,
+        users: UserTable[UserInfo_c],
+        fid: int,
+        fname: str,
+        tid: int,
+        ppid: int,
+        floor: int,
+        thread_author_id: int,
+    ) -> None:
+        self._proto = data_proto
+        self._users = users
+        self._thread_author_id = thread_author_id
+        self.fid = fid
+        self.fname = fname
+        self.tid = tid
+        self.ppid = ppid
+        self.floor = floor
+
+    def __reduce__(self) -> tuple:
+        # 序列化时转换为普通的Comment 从而不必携带protobuf消息
+        return Comment, tuple(getattr(self, field.name) for field in dcs.fields(Comment))
+
+    @cached_property
+    def contents(self) -> Contents_c:
+        contents, self.reply_to_id = Comment._parse_contents(self._proto)
+        return contents
+
+    @cached_property
+    def reply_to_id(self) -> int:
+        _, reply_to_id = Comment._parse_contents(self._proto)
+        return reply_to_id
+
+    @cached_property
+    def pid(self) -> int:
+        return self._proto.id
+
+    @cached_property
+    def user(self) -> UserInfo_c:
+        return self._users.intern(self._proto.author)
+
+    @cached_property
+    def author_id(self) -> int:
+        return self._proto.author.id
+
+    @cached_property
+    def agree(self) -> int:
+        return self._proto.agree.agree_num
+
+    @cached_property
+    def disagree(self) -> int:
+        return self._proto.agree.disagree_num
+
+    @cached_property
+    def create_time(self) -> int:
+        return self._proto.time
+
+    @cached_property
+    def is_thread_author(self) -> bool:
+        return self._thread_author_id == self.author_id
+
+
+@slots_dataclass
 class Page_c:
     """
     页信息
@@ -336,7 +378,7 @@ class Page_c:
         return Page_c(page_size, current_page, total_page, total_count, has_more, has_prev)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Forum_c:
     """
     吧信息
@@ -364,7 +406,7 @@ class Forum_c:
         return Forum_c(fid, fname, category, subcategory)
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_ct:
     """
     用户信息
@@ -434,7 +476,7 @@ class UserInfo_ct:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Thread_c:
     """
     主题帖信息
@@ -494,7 +536,7 @@ class Thread_c:
         return self.type == ThreadType.HELP
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage_cp:
     """
     图像碎片
@@ -536,7 +578,18 @@ class FragImage_cp:
         return FragImage_cp(src, big_src, origin_src, origin_size, show_width, show_height, hash_)
 
 
-@dcs.dataclass
+_FRAG_DECODER_CP = FragDecoder.from_frags(
+    FragText_cp,
+    emoji=FragEmoji_cp,
+    image=FragImage_cp,
+    at=FragAt_cp,
+    link=FragLink_cp,
+    tiebaplus=FragTiebaPlus_cp,
+    voice=FragVoice_cp,
+)
+
+
+@slots_dataclass
 class Contents_cp(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -565,64 +618,7 @@ class Contents_cp(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_cp:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        imgs = []
-        ats = []
-        links = []
-        tiebapluses = []
-        voice = FragVoice_cp()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_cp.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_cp.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                # 20:tid=5470214675
-                elif _type in [3, 20]:
-                    frag = FragImage_cp.from_proto(proto)
-                    imgs.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_cp.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_cp.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    frag = FragVoice_cp.from_proto(proto)
-                    nonlocal voice
-                    voice = frag
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_cp.from_proto(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    yield FragUnknown.from_proto(proto)
-
-        objs = list(_frags())
-
-        return Contents_cp(objs, texts, emojis, imgs, ats, links, tiebapluses, voice)
+        return Contents_cp(**_FRAG_DECODER_CP.decode(data_proto.content))
 
     @cached_property
     def text(self) -> str:
@@ -630,7 +626,7 @@ class Contents_cp(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_cp:
     """
     用户信息
@@ -718,7 +714,7 @@ class UserInfo_cp:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Post_c:
     """
     楼层信息
@@ -803,7 +799,7 @@ class Comments(TbErrorExt, Containers[Comment]):
     post: Post_c = dcs.field(default_factory=Post_c)
 
     @staticmethod
-    def from_proto(data_proto: TypeMessage) -> Comments:
+    def from_proto(data_proto: TypeMessage, lazy: bool = False) -> Comments:
         page = Page_c.from_proto(data_proto.page)
         forum = Forum_c.from_proto(data_proto.forum)
         thread = Thread_c.from_proto(data_proto.thread)
@@ -814,7 +810,17 @@ class Comments(TbErrorExt, Containers[Comment]):
         post.fname = thread.fname
         post.tid = thread.tid
 
-        objs = [Comment.from_proto(p) for p in data_proto.subpost_list]
+        # 同一用户的所有楼中楼共享一个用户信息对象
+        users = UserTable(UserInfo_c.from_proto)
+
+        if lazy:
+            objs = [
+                LazyComment(p, users, forum.fid, forum.fname, thread.tid, post.pid, post.floor, thread.author_id)
+                for p in data_proto.subpost_list
+            ]
+            return Comments(objs, page, forum, thread, post)
+
+        objs = [Comment.from_proto(p, users) for p in data_proto.subpost_list]
         for comment in objs:
             comment.fid = forum.fid
             comment.fname = forum.fname
@@ -828,3 +834,6 @@ class Comments(TbErrorExt, Containers[Comment]):
     @property
     def has_more(self) -> bool:
         return self.page.has_more
+
+    def _columns(self) -> list[str]:
+        return ["pid", "author_id", "reply_to_id", "text", "agree", "disagree", "create_time", "is_thread_author"]
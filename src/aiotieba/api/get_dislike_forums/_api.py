@@ -47,5 +47,5 @@ async def request_http(http_core: HttpCore, pn: int, rn: int) -> DislikeForums:
 async def request_ws(ws_core: WsCore, pn: int, rn: int) -> DislikeForums:
     data = pack_proto(ws_core.account, pn, rn)
 
-    response = await ws_core.send(data, CMD)
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
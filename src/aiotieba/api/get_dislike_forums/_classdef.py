@@ -3,10 +3,10 @@ from __future__ import annotations
 import dataclasses as dcs
 
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage
+from .._classdef import Containers, TypeMessage, slots_dataclass
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_dislikef:
     """
     页信息
@@ -31,7 +31,7 @@ class Page_dislikef:
         return Page_dislikef(current_page, has_more, has_prev)
 
 
-@dcs.dataclass
+@slots_dataclass
 class DislikeForum:
     """
     吧广场贴吧信息
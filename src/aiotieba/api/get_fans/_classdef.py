@@ -5,13 +5,13 @@ from functools import cached_property
 from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class Fan:
     """
     用户信息
@@ -72,7 +72,7 @@ class Fan:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_fan:
     """
     页信息
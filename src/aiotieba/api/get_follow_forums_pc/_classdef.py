@@ -4,13 +4,13 @@ import dataclasses as dcs
 from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class PcFollowForum:
     """
     关注吧信息
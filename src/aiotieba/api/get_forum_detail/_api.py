@@ -17,7 +17,7 @@ def pack_proto(fid: int) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> Forum_detail:
+def parse_body(body: bytes | memoryview) -> Forum_detail:
     res_proto = GetForumDetailResIdl_pb2.GetForumDetailResIdl()
     res_proto.ParseFromString(body)
 
@@ -32,18 +32,23 @@ def parse_body(body: bytes) -> Forum_detail:
 
 async def request_http(http_core: HttpCore, fid: int) -> Forum_detail:
     data = pack_proto(fid)
+    return await http_core.net_core.fetch((CMD, data), _request_http, http_core, data)
 
+
+async def _request_http(http_core: HttpCore, data: bytes) -> Forum_detail:
     request = http_core.pack_proto_request(
         yarl.URL.build(scheme="http", host=APP_BASE_HOST, path="/c/f/forum/getforumdetail", query_string=f"cmd={CMD}"),
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=4 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(request, parse_body, read_bufsize=4 * 1024)
 
 
 async def request_ws(ws_core: WsCore, fid: int) -> Forum_detail:
     data = pack_proto(fid)
+    return await ws_core.net_core.fetch((CMD, data), _request_ws, ws_core, data)
+
 
-    response = await ws_core.send(data, CMD)
+async def _request_ws(ws_core: WsCore, data: bytes) -> Forum_detail:
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
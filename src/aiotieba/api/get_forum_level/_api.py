@@ -45,5 +45,5 @@ async def request_http(http_core: HttpCore, forum_id: int) -> LevelInfo:
 async def request_ws(ws_core: WsCore, forum_id: int) -> LevelInfo:
     data = pack_proto(ws_core.account, forum_id)
 
-    response = await ws_core.send(data, CMD)
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
@@ -41,5 +41,5 @@ async def request(ws_core: WsCore, group_ids: list[int], get_type: int) -> WsMsg
     msg_ids = [ws_core.mid_manager.get_msg_id(gid) for gid in group_ids]
     data = pack_proto(ws_core.account, group_ids, msg_ids, get_type)
 
-    resp = await ws_core.send(data, CMD)
+    resp = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await resp.read())
@@ -3,10 +3,10 @@ from __future__ import annotations
 import dataclasses as dcs
 
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage
+from .._classdef import Containers, TypeMessage, slots_dataclass
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_ws:
     """
     用户信息
@@ -49,7 +49,7 @@ class UserInfo_ws:
         return str(self)
 
 
-@dcs.dataclass
+@slots_dataclass
 class WsMessage:
     """
     websocket消息
@@ -78,7 +78,7 @@ class WsMessage:
         return WsMessage(msg_id, msg_type, text, user, create_time)
 
 
-@dcs.dataclass
+@slots_dataclass
 class WsMsgGroup:
     """
     websocket消息组
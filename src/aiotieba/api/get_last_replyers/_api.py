@@ -51,5 +51,5 @@ async def request_http(http_core: HttpCore, fname: str, pn: int, rn: int, sort:
 async def request_ws(ws_core: WsCore, fname: str, pn: int, rn: int, sort: int, is_good: bool) -> Threads_lp:
     data = pack_proto(fname, pn, rn, sort, is_good)
 
-    response = await ws_core.send(data, CMD)
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
@@ -4,10 +4,10 @@ import dataclasses as dcs
 from functools import cached_property
 
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage
+from .._classdef import Containers, TypeMessage, slots_dataclass
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_lp:
     """
     页信息
@@ -43,7 +43,7 @@ class Page_lp:
         return Page_lp(page_size, current_page, total_page, total_count, has_more, has_prev)
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_lp:
     """
     用户信息
@@ -104,7 +104,7 @@ class UserInfo_lp:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class LastReplyer:
     """
     最后回复者的用户信息
@@ -155,7 +155,7 @@ class LastReplyer:
         return self.user_name or str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Thread_lp:
     """
     主题帖信息
@@ -222,7 +222,7 @@ class Thread_lp:
         return self.user.user_id
 
 
-@dcs.dataclass
+@slots_dataclass
 class Forum_lp:
     """
     吧信息
@@ -4,13 +4,13 @@ import dataclasses as dcs
 from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     import bs4
 
 
-@dcs.dataclass
+@slots_dataclass
 class MemberUser:
     """
     最新关注用户信息
@@ -35,7 +35,7 @@ class MemberUser:
         return MemberUser(user_name, portrait, level)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_member:
     """
     页信息
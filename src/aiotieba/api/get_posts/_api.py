@@ -1,3 +1,5 @@
+import functools
+
 import yarl
 
 from ...const import APP_BASE_HOST, STABLE_VERSION
@@ -37,7 +39,7 @@ def pack_proto(
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> Posts:
+def parse_body(body: bytes | memoryview, lazy: bool = False) -> Posts:
     res_proto = PbPageResIdl_pb2.PbPageResIdl()
     res_proto.ParseFromString(body)
 
@@ -45,7 +47,7 @@ def parse_body(body: bytes) -> Posts:
         raise TiebaServerError(code, res_proto.error.errmsg)
 
     data_proto = res_proto.data
-    posts = Posts.from_proto(data_proto)
+    posts = Posts.from_proto(data_proto, lazy)
 
     return posts
 
@@ -60,6 +62,7 @@ async def request_http(
     with_comments: bool,
     comment_sort_by_agree: bool,
     comment_rn: int,
+    lazy: bool = False,
 ) -> Posts:
     data = pack_proto(
         http_core.account,
@@ -72,14 +75,18 @@ async def request_http(
         comment_sort_by_agree,
         comment_rn,
     )
+    return await http_core.net_core.fetch((CMD, data, lazy), _request_http, http_core, data, lazy)
+
 
+async def _request_http(http_core: HttpCore, data: bytes, lazy: bool) -> Posts:
     request = http_core.pack_proto_request(
         yarl.URL.build(scheme="https", host=APP_BASE_HOST, path="/c/f/pb/page", query_string=f"cmd={CMD}"),
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=128 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(
+        request, functools.partial(parse_body, lazy=lazy), read_bufsize=128 * 1024
+    )
 
 
 async def request_ws(
@@ -92,6 +99,7 @@ async def request_ws(
     with_comments: bool,
     comment_sort_by_agree: bool,
     comment_rn: int,
+    lazy: bool = False,
 ) -> Posts:
     data = pack_proto(
         ws_core.account,
@@ -104,6 +112,9 @@ async def request_ws(
         comment_sort_by_agree,
         comment_rn,
     )
+    return await ws_core.net_core.fetch((CMD, data, lazy), _request_ws, ws_core, data, lazy)
+
 
-    response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+async def _request_ws(ws_core: WsCore, data: bytes, lazy: bool) -> Posts:
+    response = await ws_core.send(data, CMD, idempotent=True)
+    return await ws_core.net_core.parse(functools.partial(parse_body, lazy=lazy), await response.read())
@@ -7,19 +7,20 @@ from ...enums import Gender, PrivLike, PrivReply, ThreadType
 from ...exception import TbErrorExt
 from ...helper import deprecated
 from ...logging import get_logger as LOG
-from .._classdef import Containers, TypeMessage, VoteInfo
+from .._classdef import Containers, TypeMessage, UserTable, VoteInfo, slots_dataclass
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
+    FragDecoder,
     FragEmoji,
     FragLink,
     FragText,
     FragTiebaPlus,
-    FragUnknown,
     FragVideo,
     FragVoice,
     TypeFragment,
     TypeFragText,
+    join_proto_text,
 )
 
 FragText_p = FragText_pt = FragText_pc = FragText
@@ -31,7 +32,7 @@ FragVideo_pt = FragVideo
 FragVoice_p = FragVoice_pt = FragVoice_pc = FragVoice
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage_p:
     """
     图像碎片
@@ -73,7 +74,7 @@ class FragImage_p:
         return FragImage_p(src, big_src, origin_src, origin_size, show_width, show_height, hash_)
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragVideo_p:
     """
     视频碎片
@@ -108,7 +109,22 @@ class FragVideo_p:
         return bool(self.width)
 
 
-@dcs.dataclass
+# 40:梗百科 34:过时的贴吧plus 52:投票
+_FRAG_DECODER_P = FragDecoder.from_frags(
+    FragText_p,
+    emoji=FragEmoji_p,
+    image=FragImage_p,
+    at=FragAt_p,
+    link=FragLink_p,
+    tiebaplus=FragTiebaPlus_p,
+    voice=FragVoice_p,
+    video=FragVideo_p,
+    text_types=(0, 9, 18, 27, 40),
+    skip_types=(34, 52),
+)
+
+
+@slots_dataclass
 class Contents_p(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -139,70 +155,7 @@ class Contents_p(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_p:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        imgs = []
-        ats = []
-        links = []
-        tiebapluses = []
-        video = FragVideo_p()
-        voice = FragVoice_p()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条 40梗百科
-                if _type in [0, 9, 18, 27, 40]:
-                    frag = FragText_p.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_p.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                # 20:tid=5470214675
-                elif _type in [3, 20]:
-                    frag = FragImage_p.from_proto(proto)
-                    imgs.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_p.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_p.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    frag = FragVoice_p.from_proto(proto)
-                    nonlocal voice
-                    voice = frag
-                    yield frag
-                elif _type == 5:  # video
-                    frag = FragVideo_p.from_proto(proto)
-                    nonlocal video
-                    video = frag
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_p.from_proto(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus / vote
-                elif _type in [34, 52]:
-                    continue
-                else:
-                    yield FragUnknown.from_proto(proto)
-
-        objs = list(_frags())
-
-        return Contents_p(objs, texts, emojis, imgs, ats, links, tiebapluses, video, voice)
+        return Contents_p(**_FRAG_DECODER_P.decode(data_proto.content))
 
     @cached_property
     def text(self) -> str:
@@ -210,7 +163,17 @@ class Contents_p(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+_FRAG_DECODER_PC = FragDecoder.from_frags(
+    FragText_pc,
+    emoji=FragEmoji_pc,
+    at=FragAt_pc,
+    link=FragLink_pc,
+    tiebaplus=FragTiebaPlus_pc,
+    voice=FragVoice_pc,
+)
+
+
+@slots_dataclass
 class Contents_pc(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -237,58 +200,7 @@ class Contents_pc(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_pc:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        ats = []
-        links = []
-        tiebapluses = []
-        voice = FragVoice_pc()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_pc.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_pc.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_pc.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_pc.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    frag = FragVoice_pc.from_proto(proto)
-                    nonlocal voice
-                    voice = frag
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_pc.from_proto(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    yield FragUnknown.from_proto(proto)
-
-        objs = list(_frags())
-
-        return Contents_pc(objs, texts, emojis, ats, links, tiebapluses, voice)
+        return Contents_pc(**_FRAG_DECODER_PC.decode(data_proto.content))
 
     @cached_property
     def text(self) -> str:
@@ -296,7 +208,7 @@ class Contents_pc(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_p:
     """
     用户信息
@@ -406,7 +318,7 @@ class UserInfo_p:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Comment_p:
     """
     楼中楼信息
@@ -492,7 +404,7 @@ class Comment_p:
         return self.contents.text
 
 
-@dcs.dataclass
+@slots_dataclass
 class Post:
     """
     楼层信息
@@ -585,7 +497,107 @@ class Post:
         return text
 
 
-@dcs.dataclass
+class LazyPost(Post):
+    """
+    惰性解析的楼层信息
+
+    仅持有底层protobuf消息 各属性在首次访问时才被构造
+    公开属性与Post一致
+
+    Note:
+        该对象会一直引用整个响应的protobuf消息
+    """
+
+    def __init__(
+        self,
+        data_proto: TypeMessage,
+        users: UserTable[UserInfo_p],
+        fid: int,
+        fname: str,
+        tid: int,
+        thread_author_id: int,
+    ) -> None:
+        self._proto = data_proto
+        self._users = users
+        self._thread_author_id = thread_author_id
+        self.fid = fid
+        self.fname = fname
+        self.tid = tid
+
+    def __reduce__(self) -> tuple:
+        # 序列化时转换为普通的Post 从而不必携带protobuf消息
+        return Post, tuple(getattr(self, field.name) for field in dcs.fields(Post))
+
+    @cached_property
+    def contents(self) -> Contents_p:
+        return Contents_p.from_proto(self._proto)
+
+    @cached_property
+    def sign(self) -> str:
+        return "".join(p.text for p in self._proto.signature.content if p.type == 0)
+
+    @cached_property
+    def comments(self) -> list[Comment_p]:
+        comments = [Comment_p.from_proto(p) for p in self._proto.sub_post_list.sub_post_list]
+        for comment in comments:
+            comment.fid = self.fid
+            comment.fname = self.fname
+            comment.tid = self.tid
+            comment.ppid = self.pid
+            comment.floor = self.floor
+            comment.user = self._users[comment.author_id]
+            comment.is_thread_author = self._thread_author_id == comment.author_id
+        return comments
+
+    @cached_property
+    def is_aimeme(self) -> bool:
+        return bool(self._proto.sprite_meme_info.meme_id)
+
+    @cached_property
+    def pid(self) -> int:
+        return self._proto.id
+
+    @cached_property
+    def user(self) -> UserInfo_p:
+        return self._users[self.author_id]
+
+    @cached_property
+    def author_id(self) -> int:
+        return self._proto.author_id
+
+    @cached_property
+    def floor(self) -> int:
+        return self._proto.floor
+
+    @cached_property
+    def reply_num(self) -> int:
+        return self._proto.sub_post_number
+
+    @cached_property
+    def agree(self) -> int:
+        return self._proto.agree.agree_num
+
+    @cached_property
+    def disagree(self) -> int:
+        return self._proto.agree.disagree_num
+
+    @cached_property
+    def create_time(self) -> int:
+        return self._proto.time
+
+    @cached_property
+    def is_thread_author(self) -> bool:
+        return self._thread_author_id == self.author_id
+
+    @cached_property
+    def text(self) -> str:
+        text = join_proto_text(self._proto.content, _FRAG_DECODER_P.text_types)
+        if self.sign:
+            text = f"{text}\n{self.sign}"
+        return text
+
+
+@slots_dataclass
 class Page_p:
     """
     页信息
@@ -619,7 +631,7 @@ class Page_p:
         return Page_p(page_size, current_page, total_page, total_count, has_more, has_prev)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Forum_p:
     """
     吧信息
@@ -655,7 +667,7 @@ class Forum_p:
         return Forum_p(fid, fname, category, subcategory, member_num, post_num)
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage_pt:
     """
     图像碎片
@@ -693,7 +705,17 @@ class FragImage_pt:
         return FragImage_pt(src, big_src, origin_src, show_width, show_height, hash_)
 
 
-@dcs.dataclass
+# 图像 视频与音频由单独的字段给出
+_FRAG_DECODER_PT = FragDecoder.from_frags(
+    FragText_pt,
+    emoji=FragEmoji_pt,
+    at=FragAt_pt,
+    link=FragLink_pt,
+    tiebaplus=FragTiebaPlus_pt,
+)
+
+
+@slots_dataclass
 class Contents_pt(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -724,53 +746,11 @@ class Contents_pt(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_pt:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
+        frags = _FRAG_DECODER_PT.decode(data_proto.content)
+        objs = frags["objs"]
         imgs = [FragImage_pt.from_proto(p) for p in data_proto.media]
-        ats = []
-        links = []
-        tiebapluses = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_pt.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_pt.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_pt.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_pt.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_pt.from_proto(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    yield FragUnknown.from_proto(proto)
-
-        objs = list(_frags())
-
-        if ats:
+
+        if ats := frags["ats"]:
             del ats[0]
             del objs[0]
         objs += imgs
@@ -787,7 +767,7 @@ class Contents_pt(Containers[TypeFragment]):
         else:
             voice = FragVoice_pt()
 
-        return Contents_pt(objs, texts, emojis, imgs, ats, links, tiebapluses, video, voice)
+        return Contents_pt(**frags, imgs=imgs, video=video, voice=voice)
 
     @cached_property
     def text(self) -> str:
@@ -795,7 +775,7 @@ class Contents_pt(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_pt:
     """
     用户信息
@@ -901,7 +881,7 @@ class UserInfo_pt:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class ShareThread_pt:
     """
     被分享的主题帖信息
@@ -955,7 +935,7 @@ class ShareThread_pt:
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class Thread_p:
     """
     主题帖信息
@@ -1102,7 +1082,7 @@ class Posts(TbErrorExt, Containers[Post]):
     thread: Thread_p = dcs.field(default_factory=Thread_p)
 
     @staticmethod
-    def from_proto(data_proto: TypeMessage) -> Posts:
+    def from_proto(data_proto: TypeMessage, lazy: bool = False) -> Posts:
         page = Page_p.from_proto(data_proto.page)
         forum = Forum_p.from_proto(data_proto.forum)
         thread = Thread_p.from_proto(data_proto)
@@ -1110,8 +1090,18 @@ class Posts(TbErrorExt, Containers[Post]):
         thread.fid = forum.fid
         thread.fname = forum.fname
 
+        # 同一用户的所有楼层与楼中楼共享一个用户信息对象
+        users = UserTable(UserInfo_p.from_proto, data_proto.user_list)
+
+        if lazy:
+            objs = [
+                LazyPost(p, users, forum.fid, forum.fname, thread.tid, thread.author_id)
+                for p in data_proto.post_list
+                if not p.chat_content.bot_uk
+            ]
+            return Posts(objs, page, forum, thread)
+
         objs = [Post.from_proto(p) for p in data_proto.post_list if not p.chat_content.bot_uk]
-        users = {p.id: UserInfo_p.from_proto(p) for p in data_proto.user_list}
         for post in objs:
             post.fid = forum.fid
             post.fname = forum.fname
@@ -1132,3 +1122,16 @@ class Posts(TbErrorExt, Containers[Post]):
     @property
     def has_more(self) -> bool:
         return self.page.has_more
+
+    def _columns(self) -> list[str]:
+        return [
+            "pid",
+            "floor",
+            "author_id",
+            "text",
+            "reply_num",
+            "agree",
+            "disagree",
+            "create_time",
+            "is_thread_author",
+        ]
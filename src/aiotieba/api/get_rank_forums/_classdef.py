@@ -4,13 +4,13 @@ import dataclasses as dcs
 from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     import bs4
 
 
-@dcs.dataclass
+@slots_dataclass
 class RankForum:
     """
     吧签到排名
@@ -46,7 +46,7 @@ class RankForum:
         return RankForum(fname, sign_num, member_num, has_bawu)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_rankforum:
     """
     页信息
@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
 from ...helper import parse_json
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
@@ -13,7 +13,7 @@ if TYPE_CHECKING:
     import bs4
 
 
-@dcs.dataclass
+@slots_dataclass
 class RankUser:
     """
     等级排行榜用户信息
@@ -43,7 +43,7 @@ class RankUser:
         return RankUser(user_name, level, exp, is_vip)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_rank:
     """
     页信息
@@ -5,14 +5,14 @@ from functools import cached_property
 from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
-from .._classdef.contents import _IMAGEHASH_EXP, FragUnknown, TypeFragment, TypeFragText
+from .._classdef import Containers, slots_dataclass
+from .._classdef.contents import _IMAGEHASH_EXP, FragDecoder, TypeFragment, TypeFragText
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragText_ri:
     """
     纯文本碎片
@@ -29,7 +29,7 @@ class FragText_ri:
         return FragText_ri(text)
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage_ri:
     """
     图像碎片
@@ -57,7 +57,11 @@ class FragImage_ri:
         return FragImage_ri(src, show_width, show_height, hash_)
 
 
-@dcs.dataclass
+# 1纯文本 3图像由all_pics字段给出
+_FRAG_DECODER_RI = FragDecoder({1: (FragText_ri.from_json, ("texts",), None, True), 3: None}, from_json=True)
+
+
+@slots_dataclass
 class Contents_ri(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -76,28 +80,11 @@ class Contents_ri(Containers[TypeFragment]):
 
     @staticmethod
     def from_json(data_map: Mapping) -> Contents_ri:
-        content_maps = data_map["content_detail"]
-
-        texts = []
+        frags = _FRAG_DECODER_RI.decode(data_map["content_detail"])
         imgs = [FragImage_ri.from_json(m) for m in data_map["all_pics"]]
+        frags["objs"] += imgs
 
-        def _frags():
-            for cmap in content_maps:
-                _type = cmap["type"]
-                # 1纯文本
-                if _type == 1:
-                    frag = FragText_ri.from_json(cmap)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 3:
-                    continue
-                else:
-                    yield FragUnknown.from_proto(cmap)
-
-        objs = list(_frags())
-        objs += imgs
-
-        return Contents_ri(objs, texts, imgs)
+        return Contents_ri(**frags, imgs=imgs)
 
     @cached_property
     def text(self) -> str:
@@ -105,7 +92,7 @@ class Contents_ri(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_ri:
     """
     用户信息
@@ -5,13 +5,13 @@ from functools import cached_property
 from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_rec:
     """
     用户信息
@@ -64,7 +64,7 @@ class UserInfo_rec:
         return self.user_name or f"{self.nick_name_new}/{self.portrait}"
 
 
-@dcs.dataclass
+@slots_dataclass
 class Recover:
     """
     待恢复帖子信息
@@ -110,7 +110,7 @@ class Recover:
         return Recover(text, tid, pid, user, op_show_name, op_time, is_floor, is_hide)
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_recover:
     """
     页信息
@@ -46,5 +46,5 @@ async def request_http(http_core: HttpCore, pn: int) -> Replys:
 async def request_ws(ws_core: WsCore, pn: int) -> Replys:
     data = pack_proto(ws_core.account, pn)
 
-    response = await ws_core.send(data, CMD)
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
@@ -5,10 +5,10 @@ from functools import cached_property
 
 from ...enums import PrivLike, PrivReply
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage
+from .._classdef import Containers, TypeMessage, slots_dataclass
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_reply:
     """
     用户信息
@@ -77,7 +77,7 @@ class UserInfo_reply:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_reply_p:
     """
     用户信息
@@ -128,7 +128,7 @@ class UserInfo_reply_p:
         return self.user_name or f"{self.nick_name_new}/{self.user_id}"
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_reply_t:
     """
     用户信息
@@ -179,7 +179,7 @@ class UserInfo_reply_t:
         return str(self.user_id) if not self.portrait else f"{self.nick_name_new}/{self.portrait}"
 
 
-@dcs.dataclass
+@slots_dataclass
 class Reply:
     """
     回复信息
@@ -237,7 +237,7 @@ class Reply:
         return self.user.user_id
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_reply:
     """
     页信息
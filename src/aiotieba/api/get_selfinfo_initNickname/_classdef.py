@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-import dataclasses as dcs
 from functools import cached_property
 from typing import TYPE_CHECKING
 
+from .._classdef import slots_dataclass
+
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_selfinit:
     """
     用户信息
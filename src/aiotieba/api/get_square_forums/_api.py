@@ -48,5 +48,5 @@ async def request_http(http_core: HttpCore, cname: str, pn: int, rn: int) -> Squ
 async def request_ws(ws_core: WsCore, cname: str, pn: int, rn: int) -> SquareForums:
     data = pack_proto(ws_core.account, cname, pn, rn)
 
-    response = await ws_core.send(data, CMD)
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
@@ -3,10 +3,10 @@ from __future__ import annotations
 import dataclasses as dcs
 
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage
+from .._classdef import Containers, TypeMessage, slots_dataclass
 
 
-@dcs.dataclass
+@slots_dataclass
 class SquareForum:
     """
     吧广场贴吧信息
@@ -45,7 +45,7 @@ class SquareForum:
         return self.fid
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_square:
     """
     页信息
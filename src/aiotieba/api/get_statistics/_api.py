@@ -24,7 +24,12 @@ async def request(http_core: HttpCore, fid: int) -> Statistics:
         ("_client_version", LATEST_VERSION),
         ("forum_id", fid),
     ]
+    return await http_core.net_core.fetch(
+        ("/c/f/forum/getforumdata", http_core.account.BDUSS, fid), _request, http_core, data
+    )
+
 
+async def _request(http_core: HttpCore, data: list[tuple[str, str]]) -> Statistics:
     request = http_core.pack_form_request(
         yarl.URL.build(scheme="https", host=APP_BASE_HOST, path="/c/f/forum/getforumdata"), data
     )
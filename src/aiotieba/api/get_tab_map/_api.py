@@ -18,7 +18,7 @@ def pack_proto(account: Account, fname: str) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> TabMap:
+def parse_body(body: bytes | memoryview) -> TabMap:
     res_proto = SearchPostForumResIdl_pb2.SearchPostForumResIdl()
     res_proto.ParseFromString(body)
 
@@ -33,7 +33,10 @@ def parse_body(body: bytes) -> TabMap:
 
 async def request_http(http_core: HttpCore, fname: str) -> TabMap:
     data = pack_proto(http_core.account, fname)
+    return await http_core.net_core.fetch((CMD, data), _request_http, http_core, data)
 
+
+async def _request_http(http_core: HttpCore, data: bytes) -> TabMap:
     request = http_core.pack_proto_request(
         yarl.URL.build(
             scheme="https", host=APP_BASE_HOST, path="/c/f/forum/searchPostForum", query_string=f"cmd={CMD}"
@@ -41,12 +44,14 @@ async def request_http(http_core: HttpCore, fname: str) -> TabMap:
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=4 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(request, parse_body, read_bufsize=4 * 1024)
 
 
 async def request_ws(ws_core: WsCore, fname: str) -> TabMap:
     data = pack_proto(ws_core.account, fname)
+    return await ws_core.net_core.fetch((CMD, data), _request_ws, ws_core, data)
+
 
-    response = await ws_core.send(data, CMD)
+async def _request_ws(ws_core: WsCore, data: bytes) -> TabMap:
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
@@ -1,2 +1,2 @@
 from ._api import CMD, pack_proto, parse_body, request_http, request_ws
-from ._classdef import ShareThread, Thread, Threads, UserInfo_t
+from ._classdef import LazyThread, ShareThread, Thread, Threads, UserInfo_t
@@ -1,3 +1,5 @@
+import functools
+
 import yarl
 
 from ...const import APP_BASE_HOST
@@ -23,7 +25,7 @@ def pack_proto(fname: str, pn: int, rn: int, sort: int, is_good: bool, version:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> Threads:
+def parse_body(body: bytes | memoryview, lazy: bool = False) -> Threads:
     res_proto = FrsPageResIdl_pb2.FrsPageResIdl()
     res_proto.ParseFromString(body)
 
@@ -31,27 +33,36 @@ def parse_body(body: bytes) -> Threads:
         raise TiebaServerError(code, res_proto.error.errmsg)
 
     data_proto = res_proto.data
-    threads = Threads.from_proto(data_proto)
+    threads = Threads.from_proto(data_proto, lazy)
 
     return threads
 
 
 async def request_http(
-    http_core: HttpCore, fname: str, pn: int, rn: int, sort: int, is_good: bool, version: str
+    http_core: HttpCore, fname: str, pn: int, rn: int, sort: int, is_good: bool, version: str, lazy: bool = False
 ) -> Threads:
     data = pack_proto(fname, pn, rn, sort, is_good, version)
+    return await http_core.net_core.fetch((CMD, data, lazy), _request_http, http_core, data, lazy)
+
 
+async def _request_http(http_core: HttpCore, data: bytes, lazy: bool) -> Threads:
     request = http_core.pack_proto_request(
         yarl.URL.build(scheme="http", host=APP_BASE_HOST, path="/c/f/frs/page", query_string=f"cmd={CMD}"),
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=256 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(
+        request, functools.partial(parse_body, lazy=lazy), read_bufsize=256 * 1024
+    )
 
 
-async def request_ws(ws_core: WsCore, fname: str, pn: int, rn: int, sort: int, is_good: bool, version: str) -> Threads:
+async def request_ws(
+    ws_core: WsCore, fname: str, pn: int, rn: int, sort: int, is_good: bool, version: str, lazy: bool = False
+) -> Threads:
     data = pack_proto(fname, pn, rn, sort, is_good, version)
+    return await ws_core.net_core.fetch((CMD, data, lazy), _request_ws, ws_core, data, lazy)
+
 
-    response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+async def _request_ws(ws_core: WsCore, data: bytes, lazy: bool) -> Threads:
+    response = await ws_core.send(data, CMD, idempotent=True)
+    return await ws_core.net_core.parse(functools.partial(parse_body, lazy=lazy), await response.read())
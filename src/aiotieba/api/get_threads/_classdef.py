@@ -7,10 +7,11 @@ from ...enums import Gender, PrivLike, PrivReply, ThreadType
 from ...exception import TbErrorExt
 from ...helper import deprecated
 from ...logging import get_logger as LOG
-from .._classdef import Containers, TypeMessage, VoteInfo
+from .._classdef import Containers, TypeMessage, UserTable, VoteInfo, slots_dataclass
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
+    FragDecoder,
     FragEmoji,
     FragImage,
     FragLink,
@@ -21,6 +22,7 @@ from .._classdef.contents import (
     FragVoice,
     TypeFragment,
     TypeFragText,
+    join_proto_text,
 )
 
 FragText_t = FragText_st = FragText
@@ -33,7 +35,7 @@ FragVideo_t = FragVideo_st = FragVideo
 FragVoice_t = FragVoice_st = FragVoice
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage_feed:
     """
     图像碎片
@@ -67,7 +69,7 @@ class FragImage_feed:
         return FragImage_feed(src, big_src, origin_src, width, height, hash_)
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragEmoji_feed:
     """
     表情碎片
@@ -87,7 +89,19 @@ class FragEmoji_feed:
         return FragEmoji_feed(id_, desc)
 
 
-@dcs.dataclass
+# voice与video由单独的字段给出
+_FRAG_DECODER_T = FragDecoder.from_frags(
+    FragText_t,
+    emoji=FragEmoji_t,
+    image=FragImage_t,
+    at=FragAt_t,
+    link=FragLink_t,
+    tiebaplus=FragTiebaPlus_t,
+    skip_types=(5, 10, 34),
+)
+
+
+@slots_dataclass
 class Contents_t(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -118,60 +132,8 @@ class Contents_t(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_t:
-        content_protos = data_proto.first_post_content
-
-        texts = []
-        emojis = []
-        imgs = []
-        ats = []
-        links = []
-        tiebapluses = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_t.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_t.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                # 20:tid=5470214675
-                elif _type in [3, 20]:
-                    frag = FragImage_t.from_proto(proto)
-                    imgs.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_t.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_t.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    continue
-                elif _type == 5:  # video
-                    continue
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_t.from_proto(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    yield FragUnknown.from_proto(frag)
-
-        objs = list(_frags())
+        frags = _FRAG_DECODER_T.decode(data_proto.first_post_content)
+        objs = frags["objs"]
 
         if data_proto.video_info.video_width:
             video = FragVideo_t.from_proto(data_proto.video_info)
@@ -185,7 +147,7 @@ class Contents_t(Containers[TypeFragment]):
         else:
             voice = FragVoice_t()
 
-        return Contents_t(objs, texts, emojis, imgs, ats, links, tiebapluses, video, voice)
+        return Contents_t(**frags, video=video, voice=voice)
 
     @staticmethod
     def from_feed(data_proto: TypeMessage) -> Contents_t:
@@ -231,7 +193,7 @@ class Contents_t(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_t:
     """
     页信息
@@ -267,7 +229,7 @@ class Page_t:
         return Page_t(page_size, current_page, total_page, total_count, has_more, has_prev)
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_t:
     """
     用户信息
@@ -373,7 +335,7 @@ class UserInfo_t:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage_st:
     """
     图像碎片
@@ -411,7 +373,18 @@ class FragImage_st:
         return FragImage_st(src, big_src, origin_src, show_width, show_height, hash_)
 
 
-@dcs.dataclass
+# 图像由media字段给出
+_FRAG_DECODER_ST = FragDecoder.from_frags(
+    FragText_st,
+    emoji=FragEmoji_st,
+    at=FragAt_st,
+    link=FragLink_st,
+    tiebaplus=FragTiebaPlus_st,
+    skip_types=(5, 34),
+)
+
+
+@slots_dataclass
 class Contents_st(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -442,55 +415,11 @@ class Contents_st(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_st:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
+        frags = _FRAG_DECODER_ST.decode(data_proto.content)
+        objs = frags["objs"]
         imgs = [FragImage_st.from_proto(p) for p in data_proto.media]
-        ats = []
-        links = []
-        tiebapluses = []
 
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_st.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_st.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_st.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_st.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 5:  # video
-                    continue
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_st.from_proto(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    yield FragUnknown.from_proto(frag)
-
-        objs = list(_frags())
-
-        if ats:
+        if ats := frags["ats"]:
             del ats[0]
             del objs[0]
         objs += imgs
@@ -507,7 +436,7 @@ class Contents_st(Containers[TypeFragment]):
         else:
             voice = FragVoice_st()
 
-        return Contents_st(objs, texts, emojis, imgs, ats, links, tiebapluses, video, voice)
+        return Contents_st(**frags, imgs=imgs, video=video, voice=voice)
 
     @cached_property
     def text(self) -> str:
@@ -515,7 +444,7 @@ class Contents_st(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class ShareThread:
     """
     被分享的主题帖信息
@@ -574,7 +503,7 @@ class ShareThread:
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class Thread:
     """
     主题帖信息
@@ -784,7 +713,129 @@ class Thread:
         return self.type == ThreadType.HELP
 
 
-@dcs.dataclass
+class LazyThread(Thread):
+    """
+    惰性解析的主题帖信息
+
+    仅持有底层protobuf消息 各属性在首次访问时才被构造
+    公开属性与Thread一致
+
+    Note:
+        该对象会一直引用整个响应的protobuf消息
+    """
+
+    def __init__(self, data_proto: TypeMessage, users: UserTable[UserInfo_t], fid: int, fname: str) -> None:
+        self._proto = data_proto
+        self._users = users
+        self.fid = fid
+        self.fname = fname
+
+    def __reduce__(self) -> tuple:
+        # 序列化时转换为普通的Thread 从而不必携带protobuf消息
+        return Thread, tuple(getattr(self, field.name) for field in dcs.fields(Thread))
+
+    @cached_property
+    def contents(self) -> Contents_t:
+        return Contents_t.from_proto(self._proto)
+
+    @cached_property
+    def title(self) -> str:
+        return self._proto.title
+
+    @cached_property
+    def tid(self) -> int:
+        return self._proto.id
+
+    @cached_property
+    def pid(self) -> int:
+        return self._proto.first_post_id
+
+    @cached_property
+    def user(self) -> UserInfo_t:
+        return self._users[self.author_id]
+
+    @cached_property
+    def author_id(self) -> int:
+        return self._proto.author_id
+
+    @cached_property
+    def type(self) -> ThreadType:
+        type_ = ThreadType(self._proto.thread_type)
+        if type_ == ThreadType.UNKNOWN:
+            LOG().debug("Unknown thread type. tid=%d, type=%s", self.tid, self._proto.thread_type)
+        return type_
+
+    @cached_property
+    def tab_id(self) -> int:
+        return self._proto.tab_id
+
+    @cached_property
+    def is_good(self) -> bool:
+        return bool(self._proto.is_good)
+
+    @cached_property
+    def is_top(self) -> bool:
+        return bool(self._proto.is_top)
+
+    @cached_property
+    def is_share(self) -> bool:
+        return bool(self._proto.is_share_thread) and bool(self._proto.origin_thread_info.pid)
+
+    @cached_property
+    def is_hide(self) -> bool:
+        return bool(self._proto.is_frs_mask)
+
+    @cached_property
+    def is_livepost(self) -> bool:
+        return bool(self._proto.is_livepost)
+
+    @cached_property
+    def vote_info(self) -> VoteInfo:
+        return VoteInfo.from_proto(self._proto.poll_info)
+
+    @cached_property
+    def share_origin(self) -> ShareThread:
+        if self.is_share:
+            return ShareThread.from_proto(self._proto.origin_thread_info)
+        return ShareThread()
+
+    @cached_property
+    def view_num(self) -> int:
+        return self._proto.view_num
+
+    @cached_property
+    def reply_num(self) -> int:
+        return self._proto.reply_num
+
+    @cached_property
+    def share_num(self) -> int:
+        return self._proto.share_num
+
+    @cached_property
+    def agree(self) -> int:
+        return self._proto.agree.agree_num
+
+    @cached_property
+    def disagree(self) -> int:
+        return self._proto.agree.disagree_num
+
+    @cached_property
+    def create_time(self) -> int:
+        return self._proto.create_time
+
+    @cached_property
+    def last_time(self) -> int:
+        return self._proto.last_time_int
+
+    @cached_property
+    def text(self) -> str:
+        text = join_proto_text(self._proto.first_post_content, _FRAG_DECODER_T.text_types)
+        if self.title:
+            text = f"{self.title}\n{text}"
+        return text
+
+
+@slots_dataclass
 class Forum_t:
     """
     吧信息
@@ -853,13 +904,19 @@ class Threads(TbErrorExt, Containers[Thread]):
     tab_map: dict[str, int] = dcs.field(default_factory=dict)
 
     @staticmethod
-    def from_proto(data_proto: TypeMessage) -> Threads:
+    def from_proto(data_proto: TypeMessage, lazy: bool = False) -> Threads:
         page = Page_t.from_proto(data_proto.page)
         forum = Forum_t.from_proto(data_proto)
         tab_map = {p.tab_name: p.tab_id for p in data_proto.nav_tab_info.tab}
 
+        # 同一作者的所有主题帖共享一个用户信息对象
+        users = UserTable(UserInfo_t.from_proto, data_proto.user_list)
+
+        if lazy:
+            objs = [LazyThread(p, users, forum.fid, forum.fname) for p in data_proto.thread_list]
+            return Threads(objs, page, forum, tab_map)
+
         objs = [Thread.from_proto(p) for p in data_proto.thread_list]
-        users = {p.id: UserInfo_t.from_proto(p) for p in data_proto.user_list}
         for thread in objs:
             thread.fname = forum.fname
             thread.fid = forum.fid
@@ -884,3 +941,19 @@ class Threads(TbErrorExt, Containers[Thread]):
     @property
     def has_more(self) -> bool:
         return self.page.has_more
+
+    def _columns(self) -> list[str]:
+        return [
+            "tid",
+            "pid",
+            "author_id",
+            "title",
+            "text",
+            "view_num",
+            "reply_num",
+            "share_num",
+            "agree",
+            "disagree",
+            "create_time",
+            "last_time",
+        ]
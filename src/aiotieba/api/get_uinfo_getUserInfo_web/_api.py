@@ -20,7 +20,10 @@ def parse_body(body: bytes) -> UserInfo_guinfo_web:
 
 async def request(http_core: HttpCore, user_id: int) -> UserInfo_guinfo_web:
     params = [("chatUid", user_id)]
+    return await http_core.net_core.fetch(("/im/pcmsg/query/getUserInfo", user_id), _request, http_core, params)
 
+
+async def _request(http_core: HttpCore, params: list[tuple[str, int]]) -> UserInfo_guinfo_web:
     request = http_core.pack_web_get_request(
         yarl.URL.build(scheme="http", host=WEB_BASE_HOST, path="/im/pcmsg/query/getUserInfo"), params
     )
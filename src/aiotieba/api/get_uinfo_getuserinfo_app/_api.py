@@ -16,7 +16,7 @@ def pack_proto(user_id: int) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> UserInfo_guinfo_app:
+def parse_body(body: bytes | memoryview) -> UserInfo_guinfo_app:
     res_proto = GetUserInfoResIdl_pb2.GetUserInfoResIdl()
     res_proto.ParseFromString(body)
 
@@ -31,18 +31,23 @@ def parse_body(body: bytes) -> UserInfo_guinfo_app:
 
 async def request_http(http_core: HttpCore, user_id: int) -> UserInfo_guinfo_app:
     data = pack_proto(user_id)
+    return await http_core.net_core.fetch((CMD, data), _request_http, http_core, data)
 
+
+async def _request_http(http_core: HttpCore, data: bytes) -> UserInfo_guinfo_app:
     request = http_core.pack_proto_request(
         yarl.URL.build(scheme="http", host=APP_BASE_HOST, path="/c/u/user/getuserinfo", query_string=f"cmd={CMD}"),
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(request, parse_body, read_bufsize=1024)
 
 
 async def request_ws(ws_core: WsCore, user_id: int) -> UserInfo_guinfo_app:
     data = pack_proto(user_id)
+    return await ws_core.net_core.fetch((CMD, data), _request_ws, ws_core, data)
+
 
-    response = await ws_core.send(data, CMD)
+async def _request_ws(ws_core: WsCore, data: bytes) -> UserInfo_guinfo_app:
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
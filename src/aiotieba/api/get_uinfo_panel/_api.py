@@ -23,7 +23,10 @@ async def request(http_core: HttpCore, name_or_portrait: str) -> UserInfo_panel:
         params = [("id", name_or_portrait)]
     else:
         params = [("un", name_or_portrait)]
+    return await http_core.net_core.fetch(("/home/get/panel", name_or_portrait), _request, http_core, params)
 
+
+async def _request(http_core: HttpCore, params: list[tuple[str, str]]) -> UserInfo_panel:
     request = http_core.pack_web_get_request(
         yarl.URL.build(scheme="http", host=WEB_BASE_HOST, path="/home/get/panel"), params
     )
@@ -25,7 +25,10 @@ async def request(http_core: HttpCore, user_name: str) -> UserInfo_json:
         ("un", user_name),
         ("ie", "utf-8"),
     ]
+    return await http_core.net_core.fetch(("/i/sys/user_json", user_name), _request, http_core, params)
 
+
+async def _request(http_core: HttpCore, params: list[tuple[str, str]]) -> UserInfo_json:
     request = http_core.pack_web_get_request(
         yarl.URL.build(scheme="http", host=WEB_BASE_HOST, path="/i/sys/user_json"), params
     )
@@ -8,14 +8,14 @@ from ...enums import ThreadType
 from ...exception import TbErrorExt
 from ...helper import deprecated
 from ...logging import get_logger as LOG
-from .._classdef import Containers, TypeMessage, VoteInfo
+from .._classdef import Containers, TypeMessage, VoteInfo, slots_dataclass
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
+    FragDecoder,
     FragEmoji,
     FragLink,
     FragText,
-    FragUnknown,
     FragVideo,
     FragVoice,
     TypeFragment,
@@ -34,7 +34,7 @@ FragVideo_ut = FragVideo
 FragVoice_ut = FragVoice
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragVoice_up:
     """
     音频碎片
@@ -63,7 +63,25 @@ class FragVoice_up:
         return bool(self.md5)
 
 
-@dcs.dataclass
+# 音频碎片不计入混合列表
+_FRAG_DECODER_UP = FragDecoder({
+    0: (FragText_up.from_proto, ("texts",), None, True),
+    4: (FragText_up.from_proto, ("texts",), None, True),
+    1: (FragLink_up.from_proto, ("links", "texts"), None, True),
+    10: (FragVoice_up.from_proto, (), "voice", False),
+})
+_FRAG_DECODER_UP_JSON = FragDecoder(
+    {
+        0: (FragText_up.from_json, ("texts",), None, True),
+        4: (FragText_up.from_json, ("texts",), None, True),
+        1: (FragLink_up.from_json, ("links", "texts"), None, True),
+        10: (FragVoice_up.from_json, (), "voice", False),
+    },
+    from_json=True,
+)
+
+
+@slots_dataclass
 class Contents_up(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -84,65 +102,11 @@ class Contents_up(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_up:
-        content_protos = data_proto.post_content
-
-        texts = []
-        links = []
-        voice = FragVoice_up()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                if _type in [0, 4]:
-                    frag = FragText_up.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_up.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    nonlocal voice
-                    voice = FragVoice_up.from_proto(proto)
-                    continue
-                else:
-                    yield FragUnknown.from_proto(frag)
-
-        objs = list(_frags())
-
-        return Contents_up(objs, texts, links, voice)
+        return Contents_up(**_FRAG_DECODER_UP.decode(data_proto.post_content))
 
     @staticmethod
     def from_json(data_map: Mapping) -> Contents_up:
-        content_maps = data_map["post_content"]
-
-        texts = []
-        links = []
-        voice = FragVoice_up()
-
-        def _frags():
-            for content_map in content_maps:
-                _type = int(content_map["type"])
-                if _type in [0, 4]:
-                    frag = FragText_up.from_json(content_map)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_up.from_json(content_map)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    nonlocal voice
-                    voice = FragVoice_up.from_json(content_map)
-                    continue
-                else:
-                    yield FragUnknown.from_json(content_map)
-
-        objs = list(_frags())
-
-        return Contents_up(objs, texts, links, voice)
+        return Contents_up(**_FRAG_DECODER_UP_JSON.decode(data_map["post_content"]))
 
     @cached_property
     def text(self) -> str:
@@ -150,7 +114,7 @@ class Contents_up(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_u:
     """
     用户信息
@@ -221,7 +185,7 @@ class UserInfo_u:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserPost:
     """
     用户历史回复信息
@@ -283,7 +247,7 @@ class UserPost:
         return self.user.user_id
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserPosts(Containers[UserPost]):
     """
     用户历史回复信息列表
@@ -350,7 +314,7 @@ class UserPostss(TbErrorExt, Containers[UserPosts]):
         return UserPostss(objs)
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage_ut:
     """
     图像碎片
@@ -388,7 +352,17 @@ class FragImage_ut:
         return FragImage_ut(src, big_src, origin_src, origin_size, width, height, hash_)
 
 
-@dcs.dataclass
+# 图像 视频与音频由单独的字段给出
+_FRAG_DECODER_UT = FragDecoder.from_frags(
+    FragText_ut,
+    emoji=FragEmoji_ut,
+    at=FragAt_ut,
+    link=FragLink_ut,
+    skip_types=(3, 20, 5, 10),
+)
+
+
+@slots_dataclass
 class Contents_ut(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -417,48 +391,9 @@ class Contents_ut(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_ut:
-        content_protos = data_proto.first_post_content
-
-        texts = []
-        emojis = []
+        frags = _FRAG_DECODER_UT.decode(data_proto.first_post_content)
+        objs = frags["objs"]
         imgs = [FragImage_ut.from_proto(p) for p in data_proto.media if p.type != 5]
-        ats = []
-        links = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_ut.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_ut.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                # img will be init elsewhere
-                elif _type in [3, 20]:
-                    continue
-                elif _type == 4:
-                    frag = FragAt_ut.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_ut.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 5:  # video
-                    continue
-                elif _type == 10:  # voice
-                    continue
-                else:
-                    yield FragUnknown.from_proto(frag)
-
-        objs = list(_frags())
         objs += imgs
 
         if data_proto.video_info.video_width:
@@ -473,7 +408,7 @@ class Contents_ut(Containers[TypeFragment]):
         else:
             voice = FragVoice_ut()
 
-        return Contents_ut(objs, texts, emojis, imgs, ats, links, video, voice)
+        return Contents_ut(**frags, imgs=imgs, video=video, voice=voice)
 
     @cached_property
     def text(self) -> str:
@@ -481,7 +416,7 @@ class Contents_ut(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserThread:
     """
     主题帖信息
@@ -42,11 +42,11 @@ async def request_http(http_core: HttpCore, user_id: int, pn: int, rn: int, vers
     )
 
     body = await http_core.net_core.send_request(request, read_bufsize=64 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.parse(parse_body, body)
 
 
 async def request_ws(ws_core: WsCore, user_id: int, pn: int, rn: int, version: str) -> UserPostss:
     data = pack_proto(ws_core.account, user_id, pn, rn, version)
 
-    response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+    response = await ws_core.send(data, CMD, idempotent=True)
+    return await ws_core.net_core.parse(parse_body, await response.read())
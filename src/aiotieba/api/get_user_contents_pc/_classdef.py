@@ -4,13 +4,13 @@ import dataclasses as dcs
 from functools import cached_property
 from typing import TYPE_CHECKING
 
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 from .._classdef.contents import (
     FragAt,
+    FragDecoder,
     FragEmoji,
     FragLink,
     FragText,
-    FragUnknown,
     FragVideo,
     FragVoice,
     TypeFragment,
@@ -29,7 +29,7 @@ FragVideo_ut = FragVideo
 FragVoice_ut = FragVoice
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragVoice_up:
     """
     音频碎片
@@ -52,7 +52,19 @@ class FragVoice_up:
         return bool(self.md5)
 
 
-@dcs.dataclass
+# 音频碎片不计入混合列表
+_FRAG_DECODER_PCUP = FragDecoder(
+    {
+        0: (FragText_up.from_json, ("texts",), None, True),
+        4: (FragText_up.from_json, ("texts",), None, True),
+        1: (FragLink_up.from_json, ("links", "texts"), None, True),
+        10: (FragVoice_up.from_json, (), "voice", False),
+    },
+    from_json=True,
+)
+
+
+@slots_dataclass
 class Contents_pcup(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -73,34 +85,7 @@ class Contents_pcup(Containers[TypeFragment]):
 
     @staticmethod
     def from_json(data_map: Mapping) -> Contents_pcup:
-        content_maps = data_map["content"]
-
-        texts = []
-        links = []
-        voice = FragVoice_up()
-
-        def _frags():
-            for content_map in content_maps:
-                _type = int(content_map["type"])
-                if _type in [0, 4]:
-                    frag = FragText_up.from_json(content_map)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_up.from_json(content_map)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    nonlocal voice
-                    voice = FragVoice_up.from_json(content_map)
-                    continue
-                else:
-                    yield FragUnknown.from_json(content_map)
-
-        objs = list(_frags())
-
-        return Contents_pcup(objs, texts, links, voice)
+        return Contents_pcup(**_FRAG_DECODER_PCUP.decode(data_map["content"]))
 
     @cached_property
     def text(self) -> str:
@@ -108,7 +93,7 @@ class Contents_pcup(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_pcu:
     """
     用户信息
@@ -169,7 +154,7 @@ class UserInfo_pcu:
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class PcUserPost:
     """
     用户历史回复信息
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import dataclasses as dcs
 from typing import TYPE_CHECKING
 
+from .._classdef import slots_dataclass
+
 if TYPE_CHECKING:
     from .._classdef import TypeMessage
 
 
-@dcs.dataclass
+@slots_dataclass
 class WsMsgGroupInfo:
     """
     websocket消息组的相关信息
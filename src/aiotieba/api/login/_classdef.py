@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import dataclasses as dcs
 from typing import TYPE_CHECKING
 
+from .._classdef import slots_dataclass
+
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class UserInfo_login:
     """
     用户信息
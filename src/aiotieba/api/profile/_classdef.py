@@ -5,14 +5,14 @@ from functools import cached_property
 
 from ...enums import Gender, PrivLike, PrivReply
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage, VoteInfo
+from .._classdef import Containers, TypeMessage, VoteInfo, slots_dataclass
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
+    FragDecoder,
     FragEmoji,
     FragLink,
     FragText,
-    FragUnknown,
     FragVideo,
     FragVoice,
     TypeFragment,
@@ -172,7 +172,7 @@ class UserInfo_pf(TbErrorExt):
             return str(self.user_id)
 
 
-@dcs.dataclass
+@slots_dataclass
 class FragImage_pf:
     """
     图像碎片
@@ -206,7 +206,17 @@ class FragImage_pf:
         return FragImage_pf(src, origin_src, origin_size, width, height, hash_)
 
 
-@dcs.dataclass
+# 图像 视频与音频由单独的字段给出
+_FRAG_DECODER_PF = FragDecoder.from_frags(
+    FragText_pf,
+    emoji=FragEmoji_pf,
+    at=FragAt_pf,
+    link=FragLink_pf,
+    skip_types=(3, 20, 5, 10),
+)
+
+
+@slots_dataclass
 class Contents_pf(Containers[TypeFragment]):
     """
     内容碎片列表
@@ -235,47 +245,9 @@ class Contents_pf(Containers[TypeFragment]):
 
     @staticmethod
     def from_proto(data_proto: TypeMessage) -> Contents_pf:
-        content_protos = data_proto.first_post_content
-
-        texts = []
-        emojis = []
+        frags = _FRAG_DECODER_PF.decode(data_proto.first_post_content)
+        objs = frags["objs"]
         imgs = [FragImage_pf.from_proto(p) for p in data_proto.media if p.type != 5]
-        ats = []
-        links = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_pf.from_proto(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_pf.from_proto(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type in [3, 20]:
-                    continue
-                elif _type == 4:
-                    frag = FragAt_pf.from_proto(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_pf.from_proto(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 5:  # video
-                    continue
-                elif _type == 10:  # voice
-                    continue
-                else:
-                    yield FragUnknown.from_proto(frag)
-
-        objs = list(_frags())
         objs += imgs
 
         if data_proto.video_info.video_width:
@@ -290,7 +262,7 @@ class Contents_pf(Containers[TypeFragment]):
         else:
             voice = FragVoice_pf()
 
-        return Contents_pf(objs, texts, emojis, imgs, ats, links, video, voice)
+        return Contents_pf(**frags, imgs=imgs, video=video, voice=voice)
 
     @cached_property
     def text(self) -> str:
@@ -298,7 +270,7 @@ class Contents_pf(Containers[TypeFragment]):
         return text
 
 
-@dcs.dataclass
+@slots_dataclass
 class Thread_pf:
     """
     主题帖信息
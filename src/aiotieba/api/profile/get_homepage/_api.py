@@ -47,5 +47,5 @@ async def request_http(http_core: HttpCore, user_id: int, pn: int) -> Homepage:
 async def request_ws(ws_core: WsCore, user_id: int, pn: int) -> Homepage:
     data = pack_proto(user_id, pn)
 
-    response = await ws_core.send(data, CMD)
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
@@ -29,7 +29,7 @@ def pack_proto(uid_or_portrait: str | int) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> UserInfo_pf:
+def parse_body(body: bytes | memoryview) -> UserInfo_pf:
     res_proto = ProfileResIdl_pb2.ProfileResIdl()
     res_proto.ParseFromString(body)
 
@@ -44,18 +44,23 @@ def parse_body(body: bytes) -> UserInfo_pf:
 
 async def request_http(http_core: HttpCore, uid_or_portrait: str | int) -> UserInfo_pf:
     data = pack_proto(uid_or_portrait)
+    return await http_core.net_core.fetch((CMD, data), _request_http, http_core, data)
 
+
+async def _request_http(http_core: HttpCore, data: bytes) -> UserInfo_pf:
     request = http_core.pack_proto_request(
         yarl.URL.build(scheme="http", host=APP_BASE_HOST, path="/c/u/user/profile", query_string=f"cmd={CMD}"),
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=8 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(request, parse_body, read_bufsize=8 * 1024)
 
 
 async def request_ws(ws_core: WsCore, uid_or_portrait: str | int) -> UserInfo_pf:
     data = pack_proto(uid_or_portrait)
+    return await ws_core.net_core.fetch((CMD, data), _request_ws, ws_core, data)
+
 
-    response = await ws_core.send(data, CMD)
+async def _request_ws(ws_core: WsCore, data: bytes) -> UserInfo_pf:
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
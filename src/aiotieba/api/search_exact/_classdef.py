@@ -4,13 +4,13 @@ import dataclasses as dcs
 from typing import TYPE_CHECKING
 
 from ...exception import TbErrorExt
-from .._classdef import Containers
+from .._classdef import Containers, slots_dataclass
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 
-@dcs.dataclass
+@slots_dataclass
 class ExactSearch:
     """
     搜索结果
@@ -58,7 +58,7 @@ class ExactSearch:
         return self.pid
 
 
-@dcs.dataclass
+@slots_dataclass
 class Page_exsch:
     """
     页信息
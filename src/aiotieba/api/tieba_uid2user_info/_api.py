@@ -17,7 +17,7 @@ def pack_proto(tieba_uid: int) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> UserInfo_TUid:
+def parse_body(body: bytes | memoryview) -> UserInfo_TUid:
     res_proto = GetUserByTiebaUidResIdl_pb2.GetUserByTiebaUidResIdl()
     res_proto.ParseFromString(body)
 
@@ -32,7 +32,10 @@ def parse_body(body: bytes) -> UserInfo_TUid:
 
 async def request_http(http_core: HttpCore, tieba_uid: int) -> UserInfo_TUid:
     data = pack_proto(tieba_uid)
+    return await http_core.net_core.fetch((CMD, data), _request_http, http_core, data)
 
+
+async def _request_http(http_core: HttpCore, data: bytes) -> UserInfo_TUid:
     request = http_core.pack_proto_request(
         yarl.URL.build(
             scheme="http",
@@ -43,12 +46,14 @@ async def request_http(http_core: HttpCore, tieba_uid: int) -> UserInfo_TUid:
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=1024)
-    return parse_body(body)
+    return await http_core.net_core.send_and_parse(request, parse_body, read_bufsize=1024)
 
 
 async def request_ws(ws_core: WsCore, tieba_uid: int) -> UserInfo_TUid:
     data = pack_proto(tieba_uid)
+    return await ws_core.net_core.fetch((CMD, data), _request_ws, ws_core, data)
+
 
-    response = await ws_core.send(data, CMD)
+async def _request_ws(ws_core: WsCore, data: bytes) -> UserInfo_TUid:
+    response = await ws_core.send(data, CMD, idempotent=True)
     return parse_body(await response.read())
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import socket
 from typing import TYPE_CHECKING, Literal
 
-import aiohttp
 import yarl
 
 from .api import (
@@ -101,9 +100,9 @@ from .api import (
     ungood,
 )
 from .api._classdef import UserInfo
-from .config import ProxyConfig, TimeoutConfig
+from .config import ParseConfig, ProxyConfig, ReconnectConfig, RetryConfig, TimeoutConfig
 from .const import LATEST_VERSION, STABLE_VERSION
-from .core import Account, BLCPCore, HttpCore, NetCore, WsCore
+from .core import Account, BLCPCore, ConnectionPool, HttpCore, NetCore, RateScheduler, SingleFlight, WsCore, priority
 from .enums import (
     BawuPermType,
     BawuSearchType,
@@ -113,20 +112,40 @@ from .enums import (
     GroupType,
     PostSortType,
     RankForumType,
+    ReqPriority,
     ReqUInfo,
     SearchType,
     ThreadSortType,
     WsStatus,
 )
-from .exception import BoolResponse, IntResponse, StrResponse
+from .exception import BoolResponse, IntResponse, StrResponse, TbErrorExt
 from .helper import deprecated
-from .helper.cache import ForumInfoCache
+from .helper.cache import ForumInfoCache, ResponseCache, UserIdentityCache
+from .helper.pagination import iter_pages
 from .helper.utils import handle_exception, is_portrait, is_user_name
 from .logging import get_logger as LOG
 
 if TYPE_CHECKING:
-    import asyncio
     import datetime
+    from collections.abc import AsyncGenerator, Iterable
+
+_DEFAULT_FORUM_CACHE = ForumInfoCache()
+_DEFAULT_ID_CACHE = UserIdentityCache()
+
+# 可由身份缓存提供的用户信息字段
+_IDENT_FIELDS = (
+    (ReqUInfo.USER_ID, "user_id"),
+    (ReqUInfo.PORTRAIT, "portrait"),
+    (ReqUInfo.USER_NAME, "user_name"),
+    (ReqUInfo.TIEBA_UID, "tieba_uid"),
+)
+
+
+class _UserInfoWithErr(UserInfo, TbErrorExt):
+    """
+    可携带err的UserInfo
+    UserInfo不含__dict__ 故以该子类作为handle_exception的空构造工厂
+    """
 
 
 def _try_websocket(func):
@@ -150,6 +169,16 @@ def _force_websocket(func):
     return awrapper
 
 
+def _high_priority(func):
+    async def awrapper(self: Client, *args, **kwargs):
+        with priority(ReqPriority.HIGH):
+            return await func(self, *args, **kwargs)
+
+    awrapper.__name__ = func.__name__
+
+    return awrapper
+
+
 class Client:
     """
     贴吧客户端
@@ -161,6 +190,18 @@ class Client:
         try_ws (bool, optional): 尝试使用websocket接口. Defaults to False.
         proxy (bool | ProxyConfig, optional): True则使用环境变量代理 False则禁用代理 输入ProxyConfig实例以手动配置代理. Defaults to False.
         timeout (TimeoutConfig, optional): 超时配置. Defaults to None.
+        pool (ConnectionPool, optional): 共享的连接池 为None则创建一个独占的连接池. Defaults to None.
+        coalesce (bool, optional): 合并完全相同的并发只读请求. Defaults to False.
+        cache (ResponseCache, optional): 只读请求的响应缓存 可在多个Client间共享. Defaults to None.
+        scheduler (RateScheduler, optional): 按账号与接口限速的请求调度器 可在多个Client间共享. Defaults to None.
+        retry (RetryConfig, optional): 只读请求的重试与对冲配置 为None则不重试. Defaults to None.
+        parse (ParseConfig, optional): 响应解析配置 可将大响应交由线程池或进程池解析. Defaults to None.
+        reconnect (ReconnectConfig, optional): websocket断线重连配置. Defaults to None.
+        forum_cache (ForumInfoCache, optional): 贴吧名与fid的双向缓存 为None则使用进程内共享的默认缓存. Defaults to None.
+        id_cache (UserIdentityCache, optional): user_id / portrait / user_name / tieba_uid的映射缓存 为None则使用进程内共享的默认缓存. Defaults to None.
+
+    Note:
+        启用scheduler时 吧务操作等写请求以ReqPriority.HIGH优先级调度 可通过`aiotieba.priority`调整其他请求的优先级
     """
 
     __slots__ = [
@@ -168,7 +209,16 @@ class Client:
         "_timeout",
         "_proxy",
         "_try_ws",
-        "_connector",
+        "_pool",
+        "_own_pool",
+        "_coalesce",
+        "_cache",
+        "_scheduler",
+        "_retry",
+        "_parse",
+        "_reconnect",
+        "_forum_cache",
+        "_id_cache",
         "_http_core",
         "_ws_core",
         "_user",
@@ -184,6 +234,15 @@ class Client:
         try_ws: bool = False,
         proxy: bool | ProxyConfig = False,
         timeout: TimeoutConfig | None = None,
+        pool: ConnectionPool | None = None,
+        coalesce: bool = False,
+        cache: ResponseCache | None = None,
+        scheduler: RateScheduler | None = None,
+        retry: RetryConfig | None = None,
+        parse: ParseConfig | None = None,
+        reconnect: ReconnectConfig | None = None,
+        forum_cache: ForumInfoCache | None = None,
+        id_cache: UserIdentityCache | None = None,
     ) -> None:
         if not isinstance(account, Account):
             account = Account(BDUSS, STOKEN)
@@ -201,28 +260,59 @@ class Client:
 
         self._try_ws = try_ws
 
+        self._own_pool = not isinstance(pool, ConnectionPool)
+        if self._own_pool:
+            pool = ConnectionPool(self._proxy, self._timeout, prewarm_num=0)
+        self._pool = pool
+
+        self._coalesce = coalesce
+        self._cache = cache
+        self._scheduler = scheduler
+        self._retry = retry
+
+        if not isinstance(parse, ParseConfig):
+            parse = ParseConfig()
+        self._parse = parse
+
+        if not isinstance(reconnect, ReconnectConfig):
+            reconnect = ReconnectConfig()
+        self._reconnect = reconnect
+
+        if forum_cache is None:
+            forum_cache = _DEFAULT_FORUM_CACHE
+        self._forum_cache = forum_cache
+
+        if id_cache is None:
+            id_cache = _DEFAULT_ID_CACHE
+        self._id_cache = id_cache
+
         self._user = UserInfo()
 
     async def __aenter__(self) -> Client:
-        connector = aiohttp.TCPConnector(
-            ttl_dns_cache=self._timeout.dns_ttl,
-            family=socket.AF_INET,
-            keepalive_timeout=self._timeout.http_keepalive,
-            limit=0,
-            ssl=False,
+        await self._pool.open()
+
+        single_flight = SingleFlight() if self._coalesce else None
+        net_core = NetCore(
+            self._pool.connector,
+            self._proxy,
+            self._timeout,
+            single_flight,
+            self._cache,
+            self._scheduler,
+            self._account,
+            self._retry,
+            self._parse,
         )
-        self._connector = connector
-
-        net_core = NetCore(connector, self._proxy, self._timeout)
         self._http_core = HttpCore(self._account, net_core)
-        self._ws_core = WsCore(self._account, net_core)
+        self._ws_core = WsCore(self._account, net_core, self._reconnect, self.__upload_sec_key)
         self._blcp_core = BLCPCore(account=self._account, net_core=net_core, user=self._user)
 
         return self
 
     async def __aexit__(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
         await self._ws_core.close()
-        await self._connector.close()
+        if self._own_pool:
+            await self._pool.close()
 
     def __hash__(self) -> int:
         return hash(self.account)
@@ -238,6 +328,7 @@ class Client:
     def account(self, new_account: Account) -> None:
         self._http_core.set_account(new_account)
         self._ws_core.set_account(new_account)
+        self._http_core.net_core.sched_key = new_account
 
     @handle_exception(BoolResponse)
     async def init_websocket(self) -> BoolResponse:
@@ -268,7 +359,9 @@ class Client:
         for group in groups:
             if group.group_type == GroupType.PRIVATE_MSG:
                 mid_manager.priv_gid = group.group_id
-        mid_manager.gid2mid |= {g.group_id: MsgIDPair(g.last_msg_id, g.last_msg_id) for g in groups}
+        # 重连时保留本地已记录的msg_id 以免遗漏断线期间的消息
+        for group in groups:
+            mid_manager.gid2mid.setdefault(group.group_id, MsgIDPair(group.last_msg_id, group.last_msg_id))
 
         self._ws_core._status = WsStatus.OPEN
 
@@ -277,7 +370,7 @@ class Client:
             return
         await self.__login()
 
-    @handle_exception(UserInfo)
+    @handle_exception(_UserInfoWithErr)
     async def get_self_info(self, require: ReqUInfo = ReqUInfo.ALL) -> UserInfo:
         """
         获取本账号信息
@@ -329,7 +422,7 @@ class Client:
         z_id = await init_z_id.request(self._http_core)
         self.account.z_id = z_id
 
-    @handle_exception(get_forum.Forum)
+    @handle_exception(lambda: get_forum.Forum())
     async def get_forum(self, fname_or_fid: str | int) -> get_forum.Forum:
         """
         通过forum_id获取贴吧信息
@@ -346,7 +439,7 @@ class Client:
 
         return await get_forum.request(self._http_core, fname)
 
-    @handle_exception(get_forum_detail.Forum_detail)
+    @handle_exception(lambda: get_forum_detail.Forum_detail())
     @_try_websocket
     async def get_forum_detail(self, fname_or_fid: str | int) -> get_forum_detail.Forum_detail:
         """
@@ -367,11 +460,12 @@ class Client:
         return await get_forum_detail.request_http(self._http_core, fid)
 
     async def __get_fid(self, fname: str) -> int:
-        if fid := ForumInfoCache.get_fid(fname):
+        if fid := self._forum_cache.get_fid(fname):
             return fid
 
         fid = await get_fid.request(self._http_core, fname)
-        ForumInfoCache.add_forum(fname, fid)
+        if fid:
+            self._forum_cache.add_forum(fname, fid)
 
         return fid
 
@@ -391,14 +485,14 @@ class Client:
         return IntResponse(fid)
 
     async def __get_fname(self, fid: int) -> str:
-        if fname := ForumInfoCache.get_fname(fid):
+        if fname := self._forum_cache.get_fname(fid):
             return fname
 
         fdetail = await self.get_forum_detail(fid)
         fname = fdetail.fname
 
         if fname:
-            ForumInfoCache.add_forum(fname, fid)
+            self._forum_cache.add_forum(fname, fid)
 
         return fname
 
@@ -417,7 +511,11 @@ class Client:
         fname = await self.__get_fname(fid)
         return StrResponse(fname)
 
-    @handle_exception(get_threads.Threads)
+    def __learn_users(self, objs: Iterable) -> None:
+        for obj in objs:
+            self._id_cache.add(obj.user)
+
+    @handle_exception(lambda: get_threads.Threads())
     @_try_websocket
     async def get_threads(
         self,
@@ -428,6 +526,7 @@ class Client:
         rn: int = 30,
         sort: ThreadSortType = ThreadSortType.REPLY,
         is_good: bool = False,
+        lazy: bool = False,
     ) -> get_threads.Threads:
         """
         获取首页帖子
@@ -438,6 +537,7 @@ class Client:
             rn (int, optional): 请求的条目数. Defaults to 30. Max to 100.
             sort (ThreadSortType, optional): HOT热门排序 REPLY按回复时间 CREATE按发布时间 FOLLOW关注的人. Defaults to ThreadSortType.REPLY.
             is_good (bool, optional): True则获取精品区帖子 False则获取普通区帖子. Defaults to False.
+            lazy (bool, optional): True则返回的帖子仅在访问属性时才从protobuf中解析. Defaults to False.
 
         Returns:
             Threads: 帖子列表
@@ -446,11 +546,55 @@ class Client:
         fname = fname_or_fid if isinstance(fname_or_fid, str) else await self.__get_fname(fname_or_fid)
 
         if self._ws_core.status == WsStatus.OPEN:
-            return await get_threads.request_ws(self._ws_core, fname, pn, rn, sort, is_good, STABLE_VERSION)
+            threads = await get_threads.request_ws(self._ws_core, fname, pn, rn, sort, is_good, STABLE_VERSION, lazy)
+        else:
+            threads = await get_threads.request_http(
+                self._http_core, fname, pn, rn, sort, is_good, STABLE_VERSION, lazy
+            )
+
+        if not lazy:
+            self.__learn_users(threads)
+
+        return threads
+
+    def iter_threads(
+        self,
+        fname_or_fid: str | int,
+        /,
+        start_pn: int = 1,
+        *,
+        rn: int = 30,
+        sort: ThreadSortType = ThreadSortType.REPLY,
+        is_good: bool = False,
+        lazy: bool = False,
+        prefetch: int = 2,
+    ) -> AsyncGenerator[get_threads.Threads, None]:
+        """
+        逐页迭代首页帖子 并预取后继页
 
-        return await get_threads.request_http(self._http_core, fname, pn, rn, sort, is_good, STABLE_VERSION)
+        Args:
+            fname_or_fid (str | int): 贴吧名或fid 优先贴吧名
+            start_pn (int, optional): 起始页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 30. Max to 100.
+            sort (ThreadSortType, optional): HOT热门排序 REPLY按回复时间 CREATE按发布时间 FOLLOW关注的人. Defaults to ThreadSortType.REPLY.
+            is_good (bool, optional): True则获取精品区帖子 False则获取普通区帖子. Defaults to False.
+            lazy (bool, optional): True则返回的帖子仅在访问属性时才从protobuf中解析. Defaults to False.
+            prefetch (int, optional): 消费当前页时至多预取的后继页数 0则逐页请求. Defaults to 2.
+
+        Yields:
+            Threads: 各页的帖子列表
 
-    @handle_exception(get_posts.Posts)
+        Note:
+            出错页会被产出 随后迭代停止
+        """
+
+        return iter_pages(
+            lambda pn: self.get_threads(fname_or_fid, pn, rn=rn, sort=sort, is_good=is_good, lazy=lazy),
+            start_pn,
+            prefetch=prefetch,
+        )
+
+    @handle_exception(lambda: get_posts.Posts())
     @_try_websocket
     async def get_posts(
         self,
@@ -464,6 +608,7 @@ class Client:
         with_comments: bool = False,
         comment_sort_by_agree: bool = True,
         comment_rn: int = 4,
+        lazy: bool = False,
     ) -> get_posts.Posts:
         """
         获取主题帖内回复
@@ -477,24 +622,104 @@ class Client:
             with_comments (bool, optional): True则同时请求高赞楼中楼 False则返回的Post.comments字段为空. Defaults to False.
             comment_sort_by_agree (bool, optional): True则楼中楼按点赞数顺序 False则楼中楼按时间顺序. Defaults to True.
             comment_rn (int, optional): 请求的楼中楼数量. Defaults to 4. Max to 50.
+            lazy (bool, optional): True则返回的回复仅在访问属性时才从protobuf中解析. Defaults to False.
 
         Returns:
             Posts: 回复列表
         """
 
         if self._ws_core.status == WsStatus.OPEN:
-            return await get_posts.request_ws(
-                self._ws_core, tid, pn, rn, sort, only_thread_author, with_comments, comment_sort_by_agree, comment_rn
+            posts = await get_posts.request_ws(
+                self._ws_core,
+                tid,
+                pn,
+                rn,
+                sort,
+                only_thread_author,
+                with_comments,
+                comment_sort_by_agree,
+                comment_rn,
+                lazy,
+            )
+
+        else:
+            posts = await get_posts.request_http(
+                self._http_core,
+                tid,
+                pn,
+                rn,
+                sort,
+                only_thread_author,
+                with_comments,
+                comment_sort_by_agree,
+                comment_rn,
+                lazy,
             )
 
-        return await get_posts.request_http(
-            self._http_core, tid, pn, rn, sort, only_thread_author, with_comments, comment_sort_by_agree, comment_rn
+        if not lazy:
+            self.__learn_users(posts)
+            for post in posts:
+                self.__learn_users(post.comments)
+
+        return posts
+
+    def iter_posts(
+        self,
+        tid: int,
+        /,
+        start_pn: int = 1,
+        *,
+        rn: int = 30,
+        sort: PostSortType = PostSortType.ASC,
+        only_thread_author: bool = False,
+        with_comments: bool = False,
+        comment_sort_by_agree: bool = True,
+        comment_rn: int = 4,
+        lazy: bool = False,
+        prefetch: int = 2,
+    ) -> AsyncGenerator[get_posts.Posts, None]:
+        """
+        逐页迭代主题帖内回复 并预取后继页
+
+        Args:
+            tid (int): 所在主题帖tid
+            start_pn (int, optional): 起始页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 30.
+            sort (PostSortType, optional): ASC时间顺序 DESC时间倒序 HOT热门序. Defaults to PostSortType.ASC.
+            only_thread_author (bool, optional): True则只看楼主 False则请求全部. Defaults to False.
+            with_comments (bool, optional): True则同时请求高赞楼中楼 False则返回的Post.comments字段为空. Defaults to False.
+            comment_sort_by_agree (bool, optional): True则楼中楼按点赞数顺序 False则楼中楼按时间顺序. Defaults to True.
+            comment_rn (int, optional): 请求的楼中楼数量. Defaults to 4. Max to 50.
+            lazy (bool, optional): True则返回的回复仅在访问属性时才从protobuf中解析. Defaults to False.
+            prefetch (int, optional): 消费当前页时至多预取的后继页数 0则逐页请求. Defaults to 2.
+
+        Yields:
+            Posts: 各页的回复列表
+
+        Note:
+            出错页会被产出 随后迭代停止
+        """
+
+        return iter_pages(
+            lambda pn: self.get_posts(
+                tid,
+                pn,
+                rn=rn,
+                sort=sort,
+                only_thread_author=only_thread_author,
+                with_comments=with_comments,
+                comment_sort_by_agree=comment_sort_by_agree,
+                comment_rn=comment_rn,
+                lazy=lazy,
+            ),
+            start_pn,
+            prefetch=prefetch,
         )
 
-    @handle_exception(get_comments.Comments)
+    @handle_exception(lambda: get_comments.Comments())
     @_try_websocket
     async def get_comments(
-        self, tid: int, pid: int, /, pn: int = 1, *, is_comment: bool = False
+        self, tid: int, pid: int, /, pn: int = 1, *, is_comment: bool = False, lazy: bool = False
     ) -> get_comments.Comments:
         """
         获取楼中楼回复
@@ -504,17 +729,58 @@ class Client:
             pid (int): 所在楼层的pid或楼中楼的pid
             pn (int, optional): 页码. Defaults to 1.
             is_comment (bool, optional): pid是否指向楼中楼 若指向楼中楼则获取其附近的楼中楼列表. Defaults to False.
+            lazy (bool, optional): True则返回的楼中楼仅在访问属性时才从protobuf中解析. Defaults to False.
 
         Returns:
             Comments: 楼中楼列表
         """
 
         if self._ws_core.status == WsStatus.OPEN:
-            return await get_comments.request_ws(self._ws_core, tid, pid, pn, is_comment)
+            comments = await get_comments.request_ws(self._ws_core, tid, pid, pn, is_comment, lazy)
+        else:
+            comments = await get_comments.request_http(self._http_core, tid, pid, pn, is_comment, lazy)
+
+        if not lazy:
+            self.__learn_users(comments)
+
+        return comments
+
+    def iter_comments(
+        self,
+        tid: int,
+        pid: int,
+        /,
+        start_pn: int = 1,
+        *,
+        is_comment: bool = False,
+        lazy: bool = False,
+        prefetch: int = 2,
+    ) -> AsyncGenerator[get_comments.Comments, None]:
+        """
+        逐页迭代楼中楼回复 并预取后继页
+
+        Args:
+            tid (int): 所在主题帖tid
+            pid (int): 所在楼层的pid或楼中楼的pid
+            start_pn (int, optional): 起始页码. Defaults to 1.
+            is_comment (bool, optional): pid是否指向楼中楼 若指向楼中楼则获取其附近的楼中楼列表. Defaults to False.
+            lazy (bool, optional): True则返回的楼中楼仅在访问属性时才从protobuf中解析. Defaults to False.
+            prefetch (int, optional): 消费当前页时至多预取的后继页数 0则逐页请求. Defaults to 2.
+
+        Yields:
+            Comments: 各页的楼中楼列表
 
-        return await get_comments.request_http(self._http_core, tid, pid, pn, is_comment)
+        Note:
+            出错页会被产出 随后迭代停止
+        """
 
-    @handle_exception(get_last_replyers.Threads_lp)
+        return iter_pages(
+            lambda pn: self.get_comments(tid, pid, pn, is_comment=is_comment, lazy=lazy),
+            start_pn,
+            prefetch=prefetch,
+        )
+
+    @handle_exception(lambda: get_last_replyers.Threads_lp())
     @_try_websocket
     async def get_last_replyers(
         self,
@@ -550,7 +816,7 @@ class Client:
 
         return await get_last_replyers.request_http(self._http_core, fname, pn, rn, sort, is_good)
 
-    @handle_exception(search_exact.ExactSearches)
+    @handle_exception(lambda: search_exact.ExactSearches())
     async def search_exact(
         self,
         fname_or_fid: str | int,
@@ -581,7 +847,7 @@ class Client:
 
         return await search_exact.request(self._http_core, fname, query, pn, rn, search_type, only_thread)
 
-    @handle_exception(profile.UserInfo_pf)
+    @handle_exception(lambda: profile.UserInfo_pf())
     @_try_websocket
     async def _get_uinfo_profile(self, uid_or_portrait: str | int) -> profile.UserInfo_pf:
         """
@@ -599,7 +865,7 @@ class Client:
 
         return await profile.get_uinfo_profile.request_http(self._http_core, uid_or_portrait)
 
-    @handle_exception(get_uinfo_getuserinfo_app.UserInfo_guinfo_app)
+    @handle_exception(lambda: get_uinfo_getuserinfo_app.UserInfo_guinfo_app())
     @_try_websocket
     async def _get_uinfo_getuserinfo(self, user_id: int) -> get_uinfo_getuserinfo_app.UserInfo_guinfo_app:
         """
@@ -623,7 +889,7 @@ class Client:
 
         return user
 
-    @handle_exception(get_uinfo_getUserInfo_web.UserInfo_guinfo_web)
+    @handle_exception(lambda: get_uinfo_getUserInfo_web.UserInfo_guinfo_web())
     async def _get_uinfo_getUserInfo(self, user_id: int) -> get_uinfo_getUserInfo_web.UserInfo_guinfo_web:
         """
         接口 http://tieba.baidu.com/im/pcmsg/query/getUserInfo
@@ -643,7 +909,7 @@ class Client:
 
         return user
 
-    @handle_exception(get_uinfo_user_json.UserInfo_json)
+    @handle_exception(lambda: get_uinfo_user_json.UserInfo_json())
     async def _get_uinfo_user_json(self, user_name: str) -> get_uinfo_user_json.UserInfo_json:
         """
         接口 http://tieba.baidu.com/i/sys/user_json
@@ -660,7 +926,7 @@ class Client:
 
         return user
 
-    @handle_exception(get_uinfo_panel.UserInfo_panel)
+    @handle_exception(lambda: get_uinfo_panel.UserInfo_panel())
     async def _get_uinfo_panel(self, name_or_portrait: str) -> get_uinfo_panel.UserInfo_panel:
         """
         接口 https://tieba.baidu.com/home/get/panel
@@ -689,12 +955,28 @@ class Client:
 
         Returns:
             UserInfo: 用户信息
+
+        Note:
+            仅需要user_id portrait user_name tieba_uid时优先查询身份缓存 命中时返回仅含这些字段的UserInfo
         """
 
         if not id_:
             LOG().warning("Null input")
-            return UserInfo()
+            return _UserInfoWithErr()
+
+        if (
+            not require & (ReqUInfo.NICK_NAME | ReqUInfo.OTHER)
+            and (ident := self._id_cache.get(id_)) is not None
+            and all(getattr(ident, name) for flag, name in _IDENT_FIELDS if require & flag)
+        ):
+            return _UserInfoWithErr(ident.user_id, ident.portrait, ident.user_name, tieba_uid=ident.tieba_uid)
+
+        user = await self.__get_user_info(id_, require)
+        self._id_cache.add(user)
 
+        return user
+
+    async def __get_user_info(self, id_: str | int, require: ReqUInfo) -> UserInfo:
         if isinstance(id_, int):
             if (require | ReqUInfo.BASIC) == ReqUInfo.BASIC:
                 # 仅有BASIC需求
@@ -718,7 +1000,56 @@ class Client:
                 user = await self._get_uinfo_user_json(id_)
                 return await self._get_uinfo_profile(user.portrait)
 
-    @handle_exception(tieba_uid2user_info.UserInfo_TUid)
+    async def get_user_infos(
+        self, ids: Iterable[str | int], /, require: ReqUInfo = ReqUInfo.ALL, *, concurrency: int = 16
+    ) -> AsyncGenerator[tuple[str | int, UserInfo, Exception | None], None]:
+        """
+        批量获取用户信息 按完成顺序产出
+
+        Args:
+            ids (Iterable[str | int]): 用户id user_id / portrait / user_name 的序列 重复与空的id将被忽略
+            require (ReqUInfo): 指示需要获取的字段
+            concurrency (int, optional): 同时进行的查询数上限. Defaults to 16.
+
+        Yields:
+            tuple[str | int, UserInfo, Exception | None]: 输入的id 用户信息 以及查询失败时捕获的异常
+
+        Note:
+            每个id与get_user_info一样按id类型与require选择开销最小的接口 并优先查询身份缓存\n
+            单个id查询失败不会中断整批查询\n
+            提前退出迭代时应调用aclose()以立即取消进行中的查询
+        """
+
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be positive. got {concurrency}")
+
+        pending = iter(dict.fromkeys(id_ for id_ in ids if id_))
+        running: dict[asyncio.Future[UserInfo], str | int] = {}
+
+        def launch() -> None:
+            while len(running) < concurrency and (id_ := next(pending, None)) is not None:
+                running[asyncio.ensure_future(self.get_user_info(id_, require))] = id_
+
+        try:
+            launch()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    id_ = running.pop(fut)
+                    try:
+                        user = fut.result()
+                        err = getattr(user, "err", None)
+                    except Exception as _err:
+                        user, err = UserInfo(), _err
+                    yield id_, user, err
+
+                launch()
+
+        finally:
+            for fut in running:
+                fut.cancel()
+
+    @handle_exception(lambda: tieba_uid2user_info.UserInfo_TUid())
     @_try_websocket
     async def tieba_uid2user_info(self, tieba_uid: int) -> tieba_uid2user_info.UserInfo_TUid:
         """
@@ -739,7 +1070,7 @@ class Client:
 
         return await tieba_uid2user_info.request_http(self._http_core, tieba_uid)
 
-    @handle_exception(profile.Homepage)
+    @handle_exception(lambda: profile.Homepage())
     @_try_websocket
     async def get_homepage(self, id_: str | int, /, pn: int = 1) -> profile.Homepage:
         """
@@ -764,7 +1095,7 @@ class Client:
 
         return await profile.get_homepage.request_http(self._http_core, user_id, pn)
 
-    @handle_exception(get_follows.Follows)
+    @handle_exception(lambda: get_follows.Follows())
     async def get_follows(self, id_: str | int | None = None, /, pn: int = 1) -> get_follows.Follows:
         """
         获取关注列表
@@ -789,7 +1120,28 @@ class Client:
 
         return await get_follows.request(self._http_core, user_id, pn)
 
-    @handle_exception(get_fans.Fans)
+    def iter_follows(
+        self, id_: str | int | None = None, /, start_pn: int = 1, *, prefetch: int = 2
+    ) -> AsyncGenerator[get_follows.Follows, None]:
+        """
+        逐页迭代关注列表 并预取后继页
+
+        Args:
+            id_ (str | int | None): 用户id user_id / user_name / portrait 优先user_id
+                默认为None即获取本账号信息. Defaults to None.
+            start_pn (int, optional): 起始页码. Defaults to 1.
+            prefetch (int, optional): 消费当前页时至多预取的后继页数 0则逐页请求. Defaults to 2.
+
+        Yields:
+            Follows: 各页的关注列表
+
+        Note:
+            出错页会被产出 随后迭代停止
+        """
+
+        return iter_pages(lambda pn: self.get_follows(id_, pn), start_pn, prefetch=prefetch)
+
+    @handle_exception(lambda: get_fans.Fans())
     async def get_fans(self, id_: str | int | None = None, /, pn: int = 1) -> get_fans.Fans:
         """
         获取粉丝列表
@@ -814,7 +1166,28 @@ class Client:
 
         return await get_fans.request(self._http_core, user_id, pn)
 
-    @handle_exception(get_blacklist.BlacklistUsers)
+    def iter_fans(
+        self, id_: str | int | None = None, /, start_pn: int = 1, *, prefetch: int = 2
+    ) -> AsyncGenerator[get_fans.Fans, None]:
+        """
+        逐页迭代粉丝列表 并预取后继页
+
+        Args:
+            id_ (str | int | None): 用户id user_id / user_name / portrait 优先user_id
+                默认为None即获取本账号信息. Defaults to None.
+            start_pn (int, optional): 起始页码. Defaults to 1.
+            prefetch (int, optional): 消费当前页时至多预取的后继页数 0则逐页请求. Defaults to 2.
+
+        Yields:
+            Fans: 各页的粉丝列表
+
+        Note:
+            出错页会被产出 随后迭代停止
+        """
+
+        return iter_pages(lambda pn: self.get_fans(id_, pn), start_pn, prefetch=prefetch)
+
+    @handle_exception(lambda: get_blacklist.BlacklistUsers())
     async def get_blacklist(self) -> get_blacklist.BlacklistUsers:
         """
         获取完整的新版用户黑名单列表
@@ -825,7 +1198,7 @@ class Client:
 
         return await get_blacklist.request(self._http_core)
 
-    @handle_exception(get_blacklist_old.BlacklistOldUsers)
+    @handle_exception(lambda: get_blacklist_old.BlacklistOldUsers())
     @_try_websocket
     async def get_blacklist_old(self, pn: int = 1, /, *, rn: int = 10) -> get_blacklist_old.BlacklistOldUsers:
         """
@@ -844,7 +1217,7 @@ class Client:
 
         return await get_blacklist_old.request_http(self._http_core, pn, rn)
 
-    @handle_exception(get_follow_forums.FollowForums)
+    @handle_exception(lambda: get_follow_forums.FollowForums())
     async def get_follow_forums(
         self, id_: str | int, /, pn: int = 1, *, rn: int = 50
     ) -> get_follow_forums.FollowForums:
@@ -868,7 +1241,7 @@ class Client:
 
         return await get_follow_forums.request(self._http_core, user_id, pn, rn)
 
-    @handle_exception(get_follow_forums_pc.PcFollowForums)
+    @handle_exception(lambda: get_follow_forums_pc.PcFollowForums())
     async def get_follow_forums_pc(
         self, id_: str | int, /, pn: int = 1, *, rn: int = 50
     ) -> get_follow_forums_pc.PcFollowForums:
@@ -892,7 +1265,7 @@ class Client:
 
         return await get_follow_forums_pc.request(self._http_core, portrait, pn, rn)
 
-    @handle_exception(get_user_forum_info.UserForumInfo)
+    @handle_exception(lambda: get_user_forum_info.UserForumInfo())
     async def get_user_forum_info(
         self, fname_or_fid: str | int, id_: str | int, /
     ) -> get_user_forum_info.UserForumInfo:
@@ -924,7 +1297,7 @@ class Client:
 
         return await get_user_forum_info.request(self._http_core, fid, portrait)
 
-    @handle_exception(get_self_follow_forums.SelfFollowForums)
+    @handle_exception(lambda: get_self_follow_forums.SelfFollowForums())
     async def get_self_follow_forums(self, pn: int = 1, *, rn: int = 200) -> get_self_follow_forums.SelfFollowForums:
         """
         获取本账号关注贴吧列表
@@ -942,7 +1315,7 @@ class Client:
 
         return await get_self_follow_forums.request(self._http_core, pn, rn)
 
-    @handle_exception(get_dislike_forums.DislikeForums)
+    @handle_exception(lambda: get_dislike_forums.DislikeForums())
     @_try_websocket
     async def get_dislike_forums(self, pn: int = 1, /, *, rn: int = 20) -> get_dislike_forums.DislikeForums:
         """
@@ -961,7 +1334,7 @@ class Client:
 
         return await get_dislike_forums.request_http(self._http_core, pn, rn)
 
-    @handle_exception(get_user_contents.UserPostss)
+    @handle_exception(lambda: get_user_contents.UserPostss())
     @_try_websocket
     async def get_self_posts(self, pn: int = 1, *, rn: int = 20):
         """
@@ -983,7 +1356,7 @@ class Client:
 
         return await get_user_contents.get_posts.request_http(self._http_core, user_id, pn, rn, LATEST_VERSION)
 
-    @handle_exception(get_user_contents_pc.PcUserPosts)
+    @handle_exception(lambda: get_user_contents_pc.PcUserPosts())
     async def get_user_posts_pc(self, id_: str | int, pn: int = 1, *, rn: int = 20) -> get_user_contents_pc.PcUserPosts:
         """
         获取用户发布的回复列表
@@ -1005,7 +1378,7 @@ class Client:
 
         return await get_user_contents_pc.get_posts.request(self._http_core, portrait, pn, rn)
 
-    @handle_exception(get_user_contents.UserPostss)
+    @handle_exception(lambda: get_user_contents.UserPostss())
     async def get_user_posts(self, id_: str | int, pn: int = 1, *, rn: int = 20) -> get_user_contents.UserPostss:
         """
         获取用户发布的回复列表
@@ -1032,7 +1405,7 @@ class Client:
 
         return await get_user_contents.get_posts.request_http(self._http_core, user_id, pn, rn, USER_POSTS_VERSION)
 
-    @handle_exception(get_user_contents.UserThreads)
+    @handle_exception(lambda: get_user_contents.UserThreads())
     @_try_websocket
     async def get_self_threads(self, pn: int = 1, *, public_only: bool = False) -> get_user_contents.UserThreads:
         """
@@ -1054,7 +1427,7 @@ class Client:
 
         return await get_user_contents.get_threads.request_http(self._http_core, user_id, pn, public_only)
 
-    @handle_exception(get_user_contents.UserThreads)
+    @handle_exception(lambda: get_user_contents.UserThreads())
     @_try_websocket
     async def get_user_threads(self, id_: str | int, pn: int = 1) -> get_user_contents.UserThreads:
         """
@@ -1079,7 +1452,7 @@ class Client:
 
         return await get_user_contents.get_threads.request_http(self._http_core, user_id, pn, False)
 
-    @handle_exception(get_replys.Replys)
+    @handle_exception(lambda: get_replys.Replys())
     @_try_websocket
     async def get_replys(self, pn: int = 1) -> get_replys.Replys:
         """
@@ -1097,7 +1470,7 @@ class Client:
 
         return await get_replys.request_http(self._http_core, pn)
 
-    @handle_exception(get_ats.Ats)
+    @handle_exception(lambda: get_ats.Ats())
     async def get_ats(self, pn: int = 1) -> get_ats.Ats:
         """
         获取@信息
@@ -1111,7 +1484,7 @@ class Client:
 
         return await get_ats.request(self._http_core, pn)
 
-    @handle_exception(get_images.ImageBytes)
+    @handle_exception(lambda: get_images.ImageBytes())
     async def get_image_bytes(self, img_url: str) -> get_images.ImageBytes:
         """
         从链接获取静态图像的原始字节流
@@ -1125,7 +1498,7 @@ class Client:
 
         return await get_images.request_bytes(self._http_core, yarl.URL(img_url))
 
-    @handle_exception(get_images.Image)
+    @handle_exception(lambda: get_images.Image())
     async def get_image(self, img_url: str) -> get_images.Image:
         """
         从链接获取静态图像
@@ -1139,7 +1512,7 @@ class Client:
 
         return await get_images.request(self._http_core, yarl.URL(img_url))
 
-    @handle_exception(get_images.Image)
+    @handle_exception(lambda: get_images.Image())
     async def hash2image(self, raw_hash: str, /, size: Literal["s", "m", "l"] = "s") -> get_images.Image:
         """
         通过百度图库hash获取静态图像
@@ -1168,7 +1541,7 @@ class Client:
 
         return await get_images.request(self._http_core, img_url)
 
-    @handle_exception(get_images.Image)
+    @handle_exception(lambda: get_images.Image())
     async def get_portrait(self, id_: str | int, /, size: Literal["s", "m", "l"] = "s") -> get_images.Image:
         """
         获取用户头像
@@ -1209,7 +1582,7 @@ class Client:
         user = await get_selfinfo_moindex.request(self._http_core)
         self._user |= user
 
-    @handle_exception(get_square_forums.SquareForums)
+    @handle_exception(lambda: get_square_forums.SquareForums())
     @_try_websocket
     async def get_square_forums(self, cname: str, /, pn: int = 1, *, rn: int = 20) -> get_square_forums.SquareForums:
         """
@@ -1229,7 +1602,7 @@ class Client:
 
         return await get_square_forums.request_http(self._http_core, cname, pn, rn)
 
-    @handle_exception(get_bawu_info.BawuInfo)
+    @handle_exception(lambda: get_bawu_info.BawuInfo())
     @_try_websocket
     async def get_bawu_info(self, fname_or_fid: str | int) -> get_bawu_info.BawuInfo:
         """
@@ -1250,6 +1623,7 @@ class Client:
         return await get_bawu_info.request_http(self._http_core, fid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def add_bawu(
         self, fname_or_fid: str | int, /, id_: str | int, *, bawu_type: BawuType = BawuType.MANAGER
     ) -> BoolResponse:
@@ -1278,6 +1652,7 @@ class Client:
         return await add_bawu.request(self._http_core, fid, user_name, bawu_type)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def del_bawu(
         self, fname_or_fid: str | int, /, id_: str | int, *, bawu_type: BawuType = BawuType.MANAGER
     ) -> BoolResponse:
@@ -1303,7 +1678,7 @@ class Client:
 
         return await del_bawu.request(self._http_core, fid, portrait, bawu_type)
 
-    @handle_exception(get_bawu_perm.BawuPerm)
+    @handle_exception(lambda: get_bawu_perm.BawuPerm())
     async def get_bawu_perm(self, fname_or_fid: str | int, /, id_: str | int) -> get_bawu_perm.BawuPerm:
         """
         获取指定吧务已分配的权限
@@ -1327,6 +1702,7 @@ class Client:
         return await get_bawu_perm.request(self._http_core, fid, portrait)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def set_bawu_perm(
         self, fname_or_fid: str | int, /, id_: str | int, *, perms: BawuPermType = BawuPermType.NULL
     ) -> BoolResponse:
@@ -1352,7 +1728,7 @@ class Client:
 
         return await set_bawu_perm.request(self._http_core, fid, portrait, perms)
 
-    @handle_exception(get_tab_map.TabMap)
+    @handle_exception(lambda: get_tab_map.TabMap())
     @_try_websocket
     async def get_tab_map(self, fname_or_fid: str | int) -> get_tab_map.TabMap:
         """
@@ -1372,7 +1748,7 @@ class Client:
 
         return await get_tab_map.request_http(self._http_core, fname)
 
-    @handle_exception(get_rank_users.RankUsers)
+    @handle_exception(lambda: get_rank_users.RankUsers())
     async def get_rank_users(self, fname_or_fid: str | int, /, pn: int = 1) -> get_rank_users.RankUsers:
         """
         获取pn页的等级排行榜用户列表
@@ -1389,7 +1765,7 @@ class Client:
 
         return await get_rank_users.request(self._http_core, fname, pn)
 
-    @handle_exception(get_member_users.MemberUsers)
+    @handle_exception(lambda: get_member_users.MemberUsers())
     async def get_member_users(self, fname_or_fid: str | int, /, pn: int = 1) -> get_member_users.MemberUsers:
         """
         获取pn页的最新关注用户列表
@@ -1409,7 +1785,7 @@ class Client:
 
         return await get_member_users.request(self._http_core, fname, pn)
 
-    @handle_exception(get_rank_forums.RankForums)
+    @handle_exception(lambda: get_rank_forums.RankForums())
     async def get_rank_forums(
         self, fname_or_fid: str | int, /, pn: int = 1, *, rank_type: RankForumType = RankForumType.WEEKLY
     ) -> get_rank_forums.RankForums:
@@ -1429,7 +1805,7 @@ class Client:
 
         return await get_rank_forums.request(self._http_core, fname, pn, rank_type)
 
-    @handle_exception(get_blocks.Blocks)
+    @handle_exception(lambda: get_blocks.Blocks())
     async def get_blocks(self, fname_or_fid: str | int, /, name: str = "", pn: int = 1) -> get_blocks.Blocks:
         """
         获取pn页的待解封用户列表
@@ -1447,7 +1823,7 @@ class Client:
 
         return await get_blocks.request(self._http_core, fid, name, pn)
 
-    @handle_exception(get_recovers.Recovers)
+    @handle_exception(lambda: get_recovers.Recovers())
     async def get_recovers(
         self, fname_or_fid: str | int, /, pn: int = 1, *, rn: int = 10, id_: str | int | None = None
     ) -> get_recovers.Recovers:
@@ -1474,7 +1850,36 @@ class Client:
 
         return await get_recovers.request(self._http_core, fid, user_id, pn, rn)
 
-    @handle_exception(get_bawu_userlogs.Userlogs)
+    def iter_recovers(
+        self,
+        fname_or_fid: str | int,
+        /,
+        start_pn: int = 1,
+        *,
+        rn: int = 10,
+        id_: str | int | None = None,
+        prefetch: int = 2,
+    ) -> AsyncGenerator[get_recovers.Recovers, None]:
+        """
+        逐页迭代待恢复帖子列表 并预取后继页
+
+        Args:
+            fname_or_fid (str | int): 目标贴吧的贴吧名或fid 优先fid
+            start_pn (int, optional): 起始页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 10. Max to 50.
+            id_ (str | int, optional): 用于查询的被删帖用户的id user_id / user_name / portrait 优先user_id. Defaults to None.
+            prefetch (int, optional): 消费当前页时至多预取的后继页数 0则逐页请求. Defaults to 2.
+
+        Yields:
+            Recovers: 各页的待恢复帖子列表
+
+        Note:
+            出错页会被产出 随后迭代停止
+        """
+
+        return iter_pages(lambda pn: self.get_recovers(fname_or_fid, pn, rn=rn, id_=id_), start_pn, prefetch=prefetch)
+
+    @handle_exception(lambda: get_bawu_userlogs.Userlogs())
     async def get_bawu_userlogs(
         self,
         fname_or_fid: str | int,
@@ -1512,7 +1917,7 @@ class Client:
             self._http_core, fname, pn, search_value, search_type, start_dt, end_dt, op_type
         )
 
-    @handle_exception(get_bawu_postlogs.Postlogs)
+    @handle_exception(lambda: get_bawu_postlogs.Postlogs())
     async def get_bawu_postlogs(
         self,
         fname_or_fid: str | int,
@@ -1550,7 +1955,55 @@ class Client:
             self._http_core, fname, pn, search_value, search_type, start_dt, end_dt, op_type
         )
 
-    @handle_exception(get_unblock_appeals.Appeals)
+    def iter_bawu_postlogs(
+        self,
+        fname_or_fid: str | int,
+        /,
+        start_pn: int = 1,
+        *,
+        search_value: str = "",
+        search_type: BawuSearchType = BawuSearchType.USER,
+        start_dt: datetime.datetime | None = None,
+        end_dt: datetime.datetime | None = None,
+        op_type: int = 0,
+        prefetch: int = 2,
+    ) -> AsyncGenerator[get_bawu_postlogs.Postlogs, None]:
+        """
+        逐页迭代吧务帖子管理日志表 并预取后继页
+
+        Args:
+            fname_or_fid (str | int): 目标贴吧名或fid 优先贴吧名
+            start_pn (int, optional): 起始页码. Defaults to 1.
+            search_value (str, optional): 搜索关键字. Defaults to ''.
+            search_type (BawuSearchType, optional): 搜索类型. Defaults to BawuSearchType.USER.
+            start_dt (datetime.datetime, optional): 搜索的起始时间(含). Defaults to None.
+            end_dt (datetime.datetime, optional): 搜索的结束时间(含). Defaults to None.
+            op_type (int, optional): 搜索操作类型. Defaults to 0.
+            prefetch (int, optional): 消费当前页时至多预取的后继页数 0则逐页请求. Defaults to 2.
+
+        Yields:
+            Postlogs: 各页的吧务帖子管理日志表
+
+        Note:
+            本接口需要STOKEN\n
+            出错页会被产出 随后迭代停止
+        """
+
+        return iter_pages(
+            lambda pn: self.get_bawu_postlogs(
+                fname_or_fid,
+                pn,
+                search_value=search_value,
+                search_type=search_type,
+                start_dt=start_dt,
+                end_dt=end_dt,
+                op_type=op_type,
+            ),
+            start_pn,
+            prefetch=prefetch,
+        )
+
+    @handle_exception(lambda: get_unblock_appeals.Appeals())
     async def get_unblock_appeals(
         self, fname_or_fid: str | int, /, pn: int = 1, *, rn: int = 5
     ) -> get_unblock_appeals.Appeals:
@@ -1571,7 +2024,7 @@ class Client:
 
         return await get_unblock_appeals.request(self._http_core, fid, pn, rn)
 
-    @handle_exception(get_bawu_blacklist.BawuBlacklistUsers)
+    @handle_exception(lambda: get_bawu_blacklist.BawuBlacklistUsers())
     async def get_bawu_blacklist(
         self, fname_or_fid: str | int, /, pn: int = 1
     ) -> get_bawu_blacklist.BawuBlacklistUsers:
@@ -1593,7 +2046,7 @@ class Client:
 
         return await get_bawu_blacklist.request(self._http_core, fname, pn)
 
-    @handle_exception(get_statistics.Statistics)
+    @handle_exception(lambda: get_statistics.Statistics())
     async def get_statistics(self, fname_or_fid: str | int) -> get_statistics.Statistics:
         """
         获取吧务后台中最近24天的统计数据
@@ -1609,7 +2062,7 @@ class Client:
 
         return await get_statistics.request(self._http_core, fid)
 
-    @handle_exception(get_recom_status.RecomStatus)
+    @handle_exception(lambda: get_recom_status.RecomStatus())
     async def get_recom_status(self, fname_or_fid: str | int) -> get_recom_status.RecomStatus:
         """
         获取大吧主推荐功能的月度配额状态
@@ -1626,6 +2079,7 @@ class Client:
         return await get_recom_status.request(self._http_core, fid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def block(
         self, fname_or_fid: str | int, /, id_: str | int, *, day: int = 1, reason: str = ""
     ) -> BoolResponse:
@@ -1655,6 +2109,7 @@ class Client:
         return await block.request(self._http_core, fid, portrait, day, reason)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def unblock(self, fname_or_fid: str | int, /, id_: str | int) -> BoolResponse:
         """
         解封用户
@@ -1680,6 +2135,7 @@ class Client:
         return await unblock.request(self._http_core, fid, user_id)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def add_bawu_blacklist(self, fname_or_fid: str | int, /, id_: str | int) -> BoolResponse:
         """
         添加贴吧黑名单
@@ -1705,6 +2161,7 @@ class Client:
         return await add_bawu_blacklist.request(self._http_core, fname, user_id)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def del_bawu_blacklist(self, fname_or_fid: str | int, /, id_: str | int) -> BoolResponse:
         """
         移出贴吧黑名单
@@ -1730,6 +2187,7 @@ class Client:
         return await del_bawu_blacklist.request(self._http_core, fname, user_id)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def hide_thread(self, fname_or_fid: str | int, /, tid: int) -> BoolResponse:
         """
         屏蔽主题帖
@@ -1748,6 +2206,7 @@ class Client:
         return await del_thread.request(self._http_core, fid, tid, is_hide=True)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def del_thread(self, fname_or_fid: str | int, /, tid: int) -> BoolResponse:
         """
         删除主题帖
@@ -1766,6 +2225,7 @@ class Client:
         return await del_thread.request(self._http_core, fid, tid, is_hide=False)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def del_threads(self, fname_or_fid: str | int, /, tids: list[int], *, block: bool = False) -> BoolResponse:
         """
         批量删除主题帖
@@ -1785,6 +2245,7 @@ class Client:
         return await del_threads.request(self._http_core, fid, tids, block)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def del_post(self, fname_or_fid: str | int, /, tid: int, pid: int) -> BoolResponse:
         """
         删除回复
@@ -1804,6 +2265,7 @@ class Client:
         return await del_post.request(self._http_core, fid, tid, pid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def del_posts(
         self, fname_or_fid: str | int, /, tid: int, pids: list[int], *, block: bool = False
     ) -> BoolResponse:
@@ -1826,6 +2288,7 @@ class Client:
         return await del_posts.request(self._http_core, fid, tid, pids, block)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def unhide_thread(self, fname_or_fid: str | int, /, tid: int) -> BoolResponse:
         """
         解除主题帖屏蔽
@@ -1844,6 +2307,7 @@ class Client:
         return await recover.request(self._http_core, fid, tid, 0, is_hide=True)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def recover_thread(self, fname_or_fid: str | int, /, tid: int) -> BoolResponse:
         """
         恢复主题帖
@@ -1862,6 +2326,7 @@ class Client:
         return await recover.request(self._http_core, fid, tid, 0, is_hide=False)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def recover_post(self, fname_or_fid: str | int, /, pid: int) -> BoolResponse:
         """
         恢复主题帖
@@ -1880,6 +2345,7 @@ class Client:
         return await recover.request(self._http_core, fid, 0, pid, is_hide=False)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def recover(
         self, fname_or_fid: str | int, /, tid: int = 0, pid: int = 0, *, is_hide: bool = False
     ) -> BoolResponse:
@@ -1902,6 +2368,7 @@ class Client:
         return await recover.request(self._http_core, fid, tid, pid, is_hide)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def good(self, fname_or_fid: str | int, /, tid: int, *, cname: str = "") -> BoolResponse:
         """
         加精主题帖
@@ -1929,6 +2396,7 @@ class Client:
         return await good.request(self._http_core, fname, fid, tid, cid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def ungood(self, fname_or_fid: str | int, /, tid: int) -> BoolResponse:
         """
         撤精主题帖
@@ -1985,6 +2453,7 @@ class Client:
         return IntResponse(cid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def top(self, fname_or_fid: str | int, /, tid: int, *, is_vip: bool = False) -> BoolResponse:
         """
         置顶主题帖
@@ -2010,6 +2479,7 @@ class Client:
         return await top.request(self._http_core, fname, fid, tid, is_vip, True)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def untop(self, fname_or_fid: str | int, /, tid: int, *, is_vip: bool = False) -> BoolResponse:
         """
         撤销置顶主题帖
@@ -2035,6 +2505,7 @@ class Client:
         return await top.request(self._http_core, fname, fid, tid, is_vip, False)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def move(self, fname_or_fid: str | int, /, tid: int, *, to_tab_id: int, from_tab_id: int = 0) -> BoolResponse:
         """
         将主题帖移动至另一分区
@@ -2055,6 +2526,7 @@ class Client:
         return await move.request(self._http_core, fid, tid, to_tab_id, from_tab_id)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def recommend(self, fname_or_fid: str | int, /, tid: int) -> BoolResponse:
         """
         大吧主首页推荐
@@ -2072,6 +2544,7 @@ class Client:
         return await recommend.request(self._http_core, fid, tid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def handle_unblock_appeals(
         self, fname_or_fid: str | int, /, appeal_ids: list[int], *, refuse: bool = True
     ) -> BoolResponse:
@@ -2093,6 +2566,7 @@ class Client:
         return await handle_unblock_appeals.request(self._http_core, fid, appeal_ids, refuse)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def agree(self, tid: int, pid: int = 0, is_comment: bool = False) -> BoolResponse:
         """
         点赞主题帖或回复
@@ -2115,6 +2589,7 @@ class Client:
         return await agree.request(self._http_core, tid, pid, is_comment, is_disagree=False, is_undo=False)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def unagree(self, tid: int, pid: int = 0, is_comment: bool = False) -> BoolResponse:
         """
         取消点赞主题帖或回复
@@ -2133,6 +2608,7 @@ class Client:
         return await agree.request(self._http_core, tid, pid, is_comment, is_disagree=False, is_undo=True)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def disagree(self, tid: int, pid: int = 0, is_comment: bool = False) -> BoolResponse:
         """
         点踩主题帖或回复
@@ -2151,6 +2627,7 @@ class Client:
         return await agree.request(self._http_core, tid, pid, is_comment, is_disagree=True, is_undo=False)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def undisagree(self, tid: int, pid: int = 0, is_comment: bool = False) -> BoolResponse:
         """
         取消点踩主题帖或回复
@@ -2169,6 +2646,7 @@ class Client:
         return await agree.request(self._http_core, tid, pid, is_comment, is_disagree=True, is_undo=True)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def follow_user(self, id_: str | int) -> BoolResponse:
         """
         关注用户
@@ -2191,6 +2669,7 @@ class Client:
         return await follow_user.request(self._http_core, portrait)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def unfollow_user(self, id_: str | int) -> BoolResponse:
         """
         取关用户
@@ -2213,6 +2692,7 @@ class Client:
         return await unfollow_user.request(self._http_core, portrait)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def remove_fan(self, id_: str | int) -> BoolResponse:
         """
         移除粉丝
@@ -2235,6 +2715,7 @@ class Client:
         return await remove_fan.request(self._http_core, user_id)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     @_try_websocket
     async def set_blacklist(self, id_: str | int, *, btype: BlacklistType = BlacklistType.ALL) -> BoolResponse:
         """
@@ -2260,6 +2741,7 @@ class Client:
         return await set_blacklist.request_http(self._http_core, user_id, btype)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def add_blacklist_old(self, id_: str | int) -> BoolResponse:
         """
         添加旧版用户黑名单
@@ -2280,6 +2762,7 @@ class Client:
         return await add_blacklist_old.request(self._http_core, user_id)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def del_blacklist_old(self, id_: str | int) -> BoolResponse:
         """
         移除旧版用户黑名单
@@ -2300,6 +2783,7 @@ class Client:
         return await del_blacklist_old.request(self._http_core, user_id)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def follow_forum(self, fname_or_fid: str | int) -> BoolResponse:
         """
         关注贴吧
@@ -2317,6 +2801,7 @@ class Client:
         return await follow_forum.request(self._http_core, fid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def unfollow_forum(self, fname_or_fid: str | int) -> BoolResponse:
         """
         取关贴吧
@@ -2334,6 +2819,7 @@ class Client:
         return await unfollow_forum.request(self._http_core, fid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def dislike_forum(self, fname_or_fid: str | int) -> BoolResponse:
         """
         屏蔽贴吧 使其不再出现在首页推荐列表中
@@ -2350,6 +2836,7 @@ class Client:
         return await dislike_forum.request(self._http_core, fid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def undislike_forum(self, fname_or_fid: str | int) -> BoolResponse:
         """
         解除贴吧的首页推荐屏蔽
@@ -2366,6 +2853,7 @@ class Client:
         return await undislike_forum.request(self._http_core, fid)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def set_thread_private(self, fname_or_fid: str | int, /, tid: int, pid: int) -> BoolResponse:
         """
         隐藏主题帖
@@ -2384,6 +2872,7 @@ class Client:
         return await set_thread_privacy.request(self._http_core, fid, tid, pid, is_hide=True)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def set_thread_public(self, fname_or_fid: str | int, /, tid: int, pid: int) -> BoolResponse:
         """
         公开主题帖
@@ -2402,6 +2891,7 @@ class Client:
         return await set_thread_privacy.request(self._http_core, fid, tid, pid, is_hide=False)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def set_profile(self, nick_name: str, sign: str = "", gender: Gender = Gender.UNKNOWN) -> BoolResponse:
         """
         设置主页信息
@@ -2418,6 +2908,7 @@ class Client:
         return await set_profile.request(self._http_core, nick_name, sign, gender)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def set_nickname_old(self, nick_name: str) -> BoolResponse:
         """
         设置旧版昵称
@@ -2432,6 +2923,7 @@ class Client:
         return await set_nickname_old.request(self._http_core, nick_name)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def sign_forum(self, fname_or_fid: str | int) -> BoolResponse:
         """
         单个贴吧签到
@@ -2449,6 +2941,7 @@ class Client:
         return await sign_forum.request(self._http_core, fname)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def sign_forums(self) -> BoolResponse:
         """
         一键签到
@@ -2460,6 +2953,7 @@ class Client:
         return await sign_forums.request(self._http_core)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def sign_growth(self) -> BoolResponse:
         """
         用户成长等级任务: 签到
@@ -2473,6 +2967,7 @@ class Client:
         return await sign_growth.request_web(self._http_core, act_type="page_sign")
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     @_try_websocket
     @deprecated("此接口风险极高，可能导致账号被永久封禁屏蔽，故弃用并将于近期移除")
     async def add_post(self, fname_or_fid: str | int, /, tid: int, content: str) -> BoolResponse:
@@ -2513,6 +3008,7 @@ class Client:
         return await add_post.request_http(self._http_core, fname, fid, tid, show_name, content)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     @_force_websocket
     async def send_msg(self, id_: str | int, content: str) -> BoolResponse:
         """
@@ -2540,6 +3036,7 @@ class Client:
         return BoolResponse()
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     @_force_websocket
     async def set_msg_readed(self, message: get_group_msg.WsMessage) -> BoolResponse:
         """
@@ -2554,7 +3051,7 @@ class Client:
 
         return await set_msg_readed.request(self._ws_core, message)
 
-    @handle_exception(get_group_msg.WsMsgGroups)
+    @handle_exception(lambda: get_group_msg.WsMsgGroups())
     @_force_websocket
     async def get_group_msg(self, group_ids: list[int], *, get_type: int = 1) -> get_group_msg.WsMsgGroups:
         """
@@ -2571,6 +3068,7 @@ class Client:
         return await get_group_msg.request(self._ws_core, group_ids, get_type)
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def send_chatroom_msg(
         self, chatroom_id: int, forum_id: int, text: str, atuser_ids: list[int] = None, robotc: int = -1
     ) -> BoolResponse:
@@ -2642,6 +3140,7 @@ class Client:
         )
 
     @handle_exception(BoolResponse, ok_log_level=logging.INFO)
+    @_high_priority
     async def _init_blcp(self):
         if self._blcp_core.status == -1:
             await self._blcp_core.connect()
@@ -2658,7 +3157,7 @@ class Client:
 
         return await get_forum_level.request_http(self._http_core, forum_id)
 
-    @handle_exception(get_roomlist_by_fid.RoomList)
+    @handle_exception(lambda: get_roomlist_by_fid.RoomList())
     async def get_roomlist_by_fid(self, forum_id: int) -> get_roomlist_by_fid.RoomList:
         """
         获取某吧所有群聊
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import dataclasses as dcs
+import random
+from typing import TYPE_CHECKING
 
 import aiohttp
 import yarl
 
+from .exception import HTTPStatusError, TiebaServerError, WsDisconnectedError
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 @dcs.dataclass
 class ProxyConfig:
@@ -46,7 +54,7 @@ class TimeoutConfig:
         http_connect (float, optional): 新建一个socket连接的超时时间. Defaults to 3.0.
         http_keepalive (float, optional): http长连接的保持时间. Defaults to 30.0.
         ws_send (float, optional): websocket发送数据的超时时间. Defaults to 3.0.
-        ws_read (float, optional): 从发送websocket数据到结束等待响应的超时时间. Defaults to 8.0.
+        ws_read (float, optional): 从创建websocket请求(发送前)到结束等待响应的超时时间 包含发送耗时. Defaults to 8.0.
         ws_close (float, optional): 等待websocket终止连接的时间. Defaults to 10.0.
         ws_keepalive (float, optional): websocket在长达ws_keepalive的时间内未发生IO则发送close信号关闭连接. Defaults to 300.0.
         ws_heartbeat (float, optional): websocket心跳间隔. 为None则不发送心跳. Defaults to None.
@@ -76,3 +84,125 @@ class TimeoutConfig:
     @property
     def ws_timeout(self) -> aiohttp.ClientWSTimeout:
         return aiohttp.ClientWSTimeout(self.ws_read, self.ws_close)
+
+
+@dcs.dataclass
+class RetryConfig:
+    """
+    只读请求的重试与对冲配置
+
+    Args:
+        max_retries (int, optional): 最大重试次数. Defaults to 2.
+        base_delay (float, optional): 首次重试前的最大退避时间. Defaults to 0.5.
+        max_delay (float, optional): 退避时间上限. Defaults to 8.0.
+        retry_codes (frozenset[int], optional): 可重试的贴吧服务器错误码. Defaults to frozenset().
+        retry_status (frozenset[int], optional): 可重试的http状态码. Defaults to {429, 500, 502, 503, 504}.
+        hedge (bool, optional): 是否启用对冲请求. Defaults to False.
+        hedge_delay (float | None, optional): 发出对冲请求前的等待时间 为None则使用该接口近期耗时的p95. Defaults to None.
+        hedge_min_samples (int, optional): 使用p95前所需的最少耗时样本数. Defaults to 20.
+
+    Note:
+        所有时间均以秒为单位\n
+        第n次重试前的退避时间在[0, min(max_delay, base_delay * 2^(n-1))]内均匀随机\n
+        超时与连接错误(包括websocket断线)总是可重试的\n
+        对冲即在首个请求超过hedge_delay仍未返回时发出第二个相同请求 并采用先成功返回的结果
+    """
+
+    max_retries: int = 2
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    retry_codes: frozenset[int] = frozenset()
+    retry_status: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    hedge: bool = False
+    hedge_delay: float | None = None
+    hedge_min_samples: int = 20
+
+    def is_retryable(self, err: Exception) -> bool:
+        """
+        判断异常是否可重试
+
+        Args:
+            err (Exception): 捕获的异常
+
+        Returns:
+            bool
+        """
+
+        if isinstance(
+            err,
+            (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, WsDisconnectedError),
+        ):
+            return True
+        if isinstance(err, HTTPStatusError):
+            return err.code in self.retry_status
+        if isinstance(err, TiebaServerError):
+            return err.code in self.retry_codes
+        return False
+
+    def backoff(self, attempt: int) -> float:
+        """
+        计算第attempt次重试前的退避时间
+
+        Args:
+            attempt (int): 重试序号 从1开始
+
+        Returns:
+            float: 退避时间
+        """
+
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * (1 << (attempt - 1))))
+
+
+@dcs.dataclass
+class ReconnectConfig:
+    """
+    websocket断线重连配置
+
+    Args:
+        max_attempts (int, optional): 每次断线后的最大重连次数 为0则不自动重连. Defaults to 5.
+        base_delay (float, optional): 首次重连失败后的最大退避时间. Defaults to 0.5.
+        max_delay (float, optional): 退避时间上限. Defaults to 8.0.
+        replay (bool, optional): 重连成功后是否重发断线时尚未完成的幂等请求. Defaults to True.
+
+    Note:
+        所有时间均以秒为单位\n
+        重连期间websocket状态为CONNECTING 只读接口将改用http\n
+        不可重发的请求会在断线时立即以WsDisconnectedError失败
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    replay: bool = True
+
+    def backoff(self, attempt: int) -> float:
+        """
+        计算第attempt次重连失败后的退避时间
+
+        Args:
+            attempt (int): 重连序号 从1开始
+
+        Returns:
+            float: 退避时间
+        """
+
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * (1 << (attempt - 1))))
+
+
+@dcs.dataclass
+class ParseConfig:
+    """
+    响应解析配置
+
+    Args:
+        executor (Executor, optional): 用于解析大响应的执行器 可使用ThreadPoolExecutor或ProcessPoolExecutor 为None则总是在事件循环中解析. Defaults to None.
+        threshold (int, optional): 响应体不小于该字节数时才交由executor解析. Defaults to 64KiB.
+
+    Note:
+        交由executor解析的响应体会被复制为bytes 解析结果原样返回\n
+        ThreadPoolExecutor无法并行执行解析 但能让事件循环在解析期间按GIL切换间隔获得执行机会 单线程即可\n
+        使用ProcessPoolExecutor时解析结果需经pickle传回 对象较多的结果在事件循环中反序列化的开销可能超过解析本身 且不适合搭配lazy解析
+    """
+
+    executor: Executor | None = None
+    threshold: int = 64 * 1024
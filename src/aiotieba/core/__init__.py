@@ -1,5 +1,6 @@
 from .account import Account
 from .blcp import BLCPCore, BLCPData
 from .http import HttpCore
-from .net import NetCore
-from .websocket import TypeWebsocketCallback, WsCore, WsResponse
+from .net import ConnectionPool, NetCore, SingleFlight
+from .scheduler import LaneStats, RateScheduler, priority
+from .websocket import TypeWebsocketCallback, WsCodec, WsCore, WsResponse, WsWaiter, WsWaiterStats
@@ -9,7 +9,7 @@ import aiohttp
 
 from ..__version__ import __version__
 from ..const import APP_BASE_HOST
-from ..helper.crypto import APP_SALT, sign
+from ..helper.crypto import APP_SALT, sign_urlencode
 
 if TYPE_CHECKING:
     import yarl
@@ -17,6 +17,12 @@ if TYPE_CHECKING:
     from .account import Account
     from .net import NetCore
 
+# protobuf请求的multipart信封 boundary与各part的headers均固定不变
+PROTO_BOUNDARY = "-*_r1999"
+PROTO_CONTENT_TYPE = f"multipart/form-data; boundary={PROTO_BOUNDARY}"
+PROTO_PREFIX = f'--{PROTO_BOUNDARY}\r\nContent-Disposition: form-data; name="data"; filename="file"\r\n\r\n'.encode()
+PROTO_SUFFIX = f"\r\n--{PROTO_BOUNDARY}--\r\n".encode()
+
 
 @dcs.dataclass
 class HttpContainer:
@@ -101,9 +107,8 @@ class HttpCore:
             aiohttp.ClientRequest
         """
 
-        signed_data = sign(data, salt=APP_SALT)
         payload = aiohttp.payload.BytesPayload(
-            urllib.parse.urlencode(signed_data, doseq=True).encode("utf-8"),
+            sign_urlencode(data, APP_SALT),
             content_type="application/x-www-form-urlencoded",
         )
 
@@ -131,21 +136,14 @@ class HttpCore:
             aiohttp.ClientRequest
         """
 
-        writer = aiohttp.MultipartWriter("form-data", boundary="-*_r1999")
-        payload_headers = {
-            aiohttp.hdrs.CONTENT_DISPOSITION: aiohttp.helpers.content_disposition_header(
-                "form-data", name="data", filename="file"
-            )
-        }
-        payload = aiohttp.BytesPayload(data, content_type="", headers=payload_headers)
-        payload.headers.popone(aiohttp.hdrs.CONTENT_TYPE)
-        writer._parts.append((payload, None, None))
+        # 直接拼接预先编码的信封 省去为每个请求构造MultipartWriter的开销
+        payload = aiohttp.BytesPayload(b"".join((PROTO_PREFIX, data, PROTO_SUFFIX)), content_type=PROTO_CONTENT_TYPE)
 
         request = aiohttp.ClientRequest(
             aiohttp.hdrs.METH_POST,
             url,
             headers=self.app_proto.headers,
-            data=writer,
+            data=payload,
             proxy=self.net_core.proxy.url,
             proxy_auth=self.net_core.proxy.auth,
             ssl=False,
@@ -2,13 +2,24 @@ from __future__ import annotations
 
 import asyncio
 import dataclasses as dcs
-from collections.abc import Callable
+import socket
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import aiohttp
+import yarl
 
-from ..config import ProxyConfig, TimeoutConfig
+from ..config import ParseConfig, ProxyConfig, RetryConfig, TimeoutConfig
+from ..const import APP_BASE_HOST, WEB_BASE_HOST
 from ..exception import HTTPStatusError
 from ..helper import timeout
+from ..logging import get_logger as LOG
+
+if TYPE_CHECKING:
+    from ..helper.cache import ResponseCache
+    from .scheduler import RateScheduler
 
 
 def check_status_code(response: aiohttp.ClientResponse) -> None:
@@ -17,6 +28,274 @@ def check_status_code(response: aiohttp.ClientResponse) -> None:
 
 
 TypeHeadersChecker = Callable[[aiohttp.ClientResponse], None]
+TypeResult = TypeVar("TypeResult")
+
+DEFAULT_PREWARM_URLS = (
+    yarl.URL.build(scheme="http", host=APP_BASE_HOST),
+    yarl.URL.build(scheme="https", host=APP_BASE_HOST),
+    yarl.URL.build(scheme="https", host=WEB_BASE_HOST),
+)
+
+
+@dcs.dataclass
+class ConnectionPool:
+    """
+    可在多个Client间共享的连接池
+
+    Args:
+        proxy (ProxyConfig, optional): 代理配置 应与共享该连接池的Client一致. Defaults to None.
+        timeout (TimeoutConfig, optional): 超时配置. Defaults to None.
+        limit (int, optional): 连接总数上限 0为不限制. Defaults to 0.
+        limit_per_host (int, optional): 每个主机的连接数上限 0为不限制. Defaults to 0.
+        prewarm_urls (tuple[str | yarl.URL, ...], optional): 需要预热的主机. Defaults to DEFAULT_PREWARM_URLS.
+        prewarm_num (int, optional): 每个主机保持预热的空闲连接数 0为不预热. Defaults to 2.
+
+    Note:
+        预热的连接会在`http_keepalive`到期前被刷新 以保证空闲一段时间后的首个请求无需重新握手
+    """
+
+    proxy: ProxyConfig
+    timeout: TimeoutConfig
+    limit: int
+    limit_per_host: int
+    prewarm_urls: tuple[yarl.URL, ...]
+    prewarm_num: int
+    connector: aiohttp.TCPConnector
+    refresher: asyncio.Task
+
+    def __init__(
+        self,
+        proxy: ProxyConfig | None = None,
+        timeout: TimeoutConfig | None = None,
+        *,
+        limit: int = 0,
+        limit_per_host: int = 0,
+        prewarm_urls: tuple[str | yarl.URL, ...] = DEFAULT_PREWARM_URLS,
+        prewarm_num: int = 2,
+    ) -> None:
+        if not isinstance(proxy, ProxyConfig):
+            proxy = ProxyConfig()
+        self.proxy = proxy
+
+        if not isinstance(timeout, TimeoutConfig):
+            timeout = TimeoutConfig()
+        self.timeout = timeout
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.prewarm_urls = tuple(yarl.URL(url) if isinstance(url, str) else url for url in prewarm_urls)
+        self.prewarm_num = prewarm_num
+
+        self.connector = None
+        self.refresher = None
+
+    async def __aenter__(self) -> ConnectionPool:
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.connector is None or self.connector.closed
+
+    async def open(self) -> None:
+        """
+        创建连接器并开始预热
+        """
+
+        if not self.closed:
+            return
+
+        self.connector = aiohttp.TCPConnector(
+            ttl_dns_cache=self.timeout.dns_ttl,
+            family=socket.AF_INET,
+            keepalive_timeout=self.timeout.http_keepalive,
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ssl=False,
+        )
+
+        if self.prewarm_num > 0 and self.prewarm_urls:
+            self.refresher = asyncio.get_running_loop().create_task(self.__refresh(), name="pool_refresher")
+
+    async def close(self) -> None:
+        """
+        关闭连接器并停止预热
+        """
+
+        if self.refresher is not None:
+            self.refresher.cancel()
+            self.refresher = None
+        if self.connector is not None:
+            await self.connector.close()
+
+    async def prewarm(self) -> None:
+        """
+        为每个预热主机建立或刷新`prewarm_num`个空闲连接
+
+        Note:
+            取出空闲连接后立即归还会重置其keepalive计时 失效的连接会被连接器丢弃并重新建立
+        """
+
+        coros = [self.__touch(url) for url in self.prewarm_urls for _ in range(self.prewarm_num)]
+        conns = await asyncio.gather(*coros, return_exceptions=True)
+
+        for conn in conns:
+            if isinstance(conn, BaseException):
+                LOG().debug("Failed to prewarm connection. err=%s", conn)
+                continue
+            conn.release()
+
+    async def __touch(self, url: yarl.URL) -> aiohttp.client_reqrep.Connection:
+        request = aiohttp.ClientRequest(
+            aiohttp.hdrs.METH_GET,
+            url,
+            proxy=self.proxy.url,
+            proxy_auth=self.proxy.auth,
+            ssl=False,
+        )
+        async with timeout(self.timeout.http_connect, self.connector._loop):
+            return await self.connector.connect(request, [], self.timeout.http_timeout)
+
+    async def __refresh(self) -> None:
+        interval = self.timeout.http_keepalive * 0.75
+        while True:
+            await self.prewarm()
+            await asyncio.sleep(interval)
+
+
+@dcs.dataclass
+class SingleFlight:
+    """
+    合并key相同的并发请求
+    同一时刻每个key至多只有一个请求在途 其余调用者共享该请求的结果或异常
+    """
+
+    flights: dict[Hashable, asyncio.Task]
+
+    def __init__(self) -> None:
+        self.flights = {}
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[TypeResult]], *args: Any) -> TypeResult:
+        """
+        执行func(*args) 若key对应的请求已在途则等待其结果
+
+        Args:
+            key (Hashable): 请求的唯一标识
+            func (Callable[..., Awaitable[TypeResult]]): 发送请求并解析响应的协程函数
+            *args (Any): 传给func的参数
+
+        Returns:
+            TypeResult: func的返回值
+        """
+
+        task = self.flights.get(key, None)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(func(*args))
+            self.flights[key] = task
+            task.add_done_callback(lambda _: self.flights.pop(key, None))
+
+        # 单个调用者被取消时不应影响其他共享该请求的调用者
+        return await asyncio.shield(task)
+
+
+@dcs.dataclass
+class BufferPool:
+    """
+    可复用的响应读缓冲区池
+
+    Args:
+        max_buffers (int, optional): 池中保留的缓冲区数量上限. Defaults to 8.
+        max_size (int, optional): 可归还到池中的缓冲区大小上限 以字节为单位. Defaults to 4MiB.
+    """
+
+    max_buffers: int
+    max_size: int
+    buffers: list[bytearray]
+
+    def __init__(self, max_buffers: int = 8, max_size: int = 4 * 1024 * 1024) -> None:
+        self.max_buffers = max_buffers
+        self.max_size = max_size
+        self.buffers = []
+
+    def acquire(self, size: int) -> bytearray:
+        """
+        取出一个长度不小于size的缓冲区
+
+        Args:
+            size (int): 所需的最小长度
+
+        Returns:
+            bytearray
+        """
+
+        for i, buffer in enumerate(self.buffers):
+            if len(buffer) >= size:
+                return self.buffers.pop(i)
+        # 向上取整到2的幂 以便复用
+        return bytearray(1 << max(size - 1, 4095).bit_length())
+
+    def release(self, buffer: bytearray) -> None:
+        """
+        归还缓冲区
+
+        Args:
+            buffer (bytearray): 不再被引用的缓冲区
+        """
+
+        if len(buffer) > self.max_size:
+            return
+        if len(self.buffers) >= self.max_buffers:
+            # 淘汰最小的缓冲区
+            if len(buffer) <= len(self.buffers[0]):
+                return
+            del self.buffers[0]
+        self.buffers.append(buffer)
+        self.buffers.sort(key=len)
+
+
+@dcs.dataclass
+class LatencyTracker:
+    """
+    记录各接口近期的请求耗时
+
+    Args:
+        window (int, optional): 每个接口保留的样本数. Defaults to 128.
+    """
+
+    window: int
+    samples: dict[Hashable, deque[float]]
+
+    def __init__(self, window: int = 128) -> None:
+        self.window = window
+        self.samples = {}
+
+    def record(self, endpoint: Hashable, latency: float) -> None:
+        samples = self.samples.get(endpoint, None)
+        if samples is None:
+            samples = self.samples[endpoint] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def quantile(self, endpoint: Hashable, q: float, min_samples: int = 1) -> float | None:
+        """
+        获取接口耗时的分位数
+
+        Args:
+            endpoint (Hashable): 接口
+            q (float): 分位 取值范围[0, 1]
+            min_samples (int, optional): 所需的最少样本数. Defaults to 1.
+
+        Returns:
+            float | None: 耗时分位数 样本不足时返回None
+        """
+
+        samples = self.samples.get(endpoint, None)
+        if samples is None or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
 
 
 @dcs.dataclass
@@ -28,17 +307,37 @@ class NetCore:
         connector (aiohttp.TCPConnector): 用于生成TCP连接的连接器
         proxy (ProxyConfig, optional): 代理配置. Defaults to None.
         timeout (TimeoutConfig, optional): 超时配置. Defaults to None.
+        single_flight (SingleFlight, optional): 只读请求的合并器 为None则不合并. Defaults to None.
+        cache (ResponseCache, optional): 只读请求的响应缓存 为None则不缓存. Defaults to None.
+        scheduler (RateScheduler, optional): 请求调度器 为None则不限速. Defaults to None.
+        sched_key (Hashable, optional): 在调度器中标识账号的键. Defaults to None.
+        retry (RetryConfig, optional): 只读请求的重试与对冲配置 为None则不重试. Defaults to None.
+        parse (ParseConfig, optional): 响应解析配置. Defaults to None.
     """
 
     connector: aiohttp.TCPConnector
     proxy: ProxyConfig
     timeout: TimeoutConfig
+    single_flight: SingleFlight | None
+    cache: ResponseCache | None
+    scheduler: RateScheduler | None
+    sched_key: Hashable
+    retry: RetryConfig | None
+    parse_config: ParseConfig
+    latency: LatencyTracker
+    buffer_pool: BufferPool
 
     def __init__(
         self,
         connector: aiohttp.TCPConnector,
         proxy: ProxyConfig | None = None,
         timeout: TimeoutConfig | None = None,
+        single_flight: SingleFlight | None = None,
+        cache: ResponseCache | None = None,
+        scheduler: RateScheduler | None = None,
+        sched_key: Hashable = None,
+        retry: RetryConfig | None = None,
+        parse: ParseConfig | None = None,
     ) -> None:
         self.connector = connector
 
@@ -50,6 +349,120 @@ class NetCore:
             timeout = TimeoutConfig()
         self.timeout = timeout
 
+        self.single_flight = single_flight
+        self.cache = cache
+        self.scheduler = scheduler
+        self.sched_key = sched_key
+        self.retry = retry
+
+        if not isinstance(parse, ParseConfig):
+            parse = ParseConfig()
+        self.parse_config = parse
+
+        self.latency = LatencyTracker()
+        self.buffer_pool = BufferPool()
+
+    async def schedule(self, endpoint: Hashable) -> None:
+        """
+        等待调度器放行
+
+        Args:
+            endpoint (Hashable): http请求的路径或websocket请求的cmd
+        """
+
+        if self.scheduler is not None:
+            await self.scheduler.acquire(self.sched_key, endpoint)
+
+    async def fetch(self, key: tuple, func: Callable[..., Awaitable[TypeResult]], *args: Any) -> TypeResult:
+        """
+        发送只读请求
+        仅适用于无副作用的读API 写API应直接调用func
+
+        Args:
+            key (tuple): 请求的唯一标识 通常为(接口, 序列化后的请求体)
+            func (Callable[..., Awaitable[TypeResult]]): 发送请求并解析响应的协程函数
+            *args (Any): 传给func的参数
+
+        Returns:
+            TypeResult: func的返回值
+
+        Note:
+            启用cache时 未过期的缓存结果将被直接返回\n
+            启用single_flight时 key相同的并发调用将共享同一次网络往返与解析结果\n
+            启用retry时 可重试的异常将在退避后重试 并可按配置发出对冲请求
+        """
+
+        cache = self.cache
+        if cache is not None:
+            # 同一模块内的http与websocket实现共享缓存
+            cache_key = (func.__module__, *key)
+            if (ret := cache.get(key[0], cache_key)) is not None:
+                return ret
+
+        if self.single_flight is None:
+            ret = await self.__retry(key[0], func, *args)
+        else:
+            # 同一接口的http与websocket实现各自独立合并
+            ret = await self.single_flight.do((func, *key), self.__retry, key[0], func, *args)
+
+        if cache is not None:
+            cache.set(key[0], cache_key, ret)
+
+        return ret
+
+    async def __retry(self, endpoint: Hashable, func: Callable[..., Awaitable[TypeResult]], *args: Any) -> TypeResult:
+        retry = self.retry
+        if retry is None:
+            return await func(*args)
+
+        attempt = 0
+        while True:
+            try:
+                if retry.hedge:
+                    return await self.__hedge(endpoint, func, *args)
+                return await self.__timed(endpoint, func, *args)
+            except Exception as err:  # noqa: PERF203
+                if attempt >= retry.max_retries or not retry.is_retryable(err):
+                    raise
+                attempt += 1
+                delay = retry.backoff(attempt)
+                LOG().debug("Retry %s in %.3fs. attempt=%d err=%s", endpoint, delay, attempt, err)
+                await asyncio.sleep(delay)
+
+    async def __timed(self, endpoint: Hashable, func: Callable[..., Awaitable[TypeResult]], *args: Any) -> TypeResult:
+        start = time.perf_counter()
+        ret = await func(*args)
+        self.latency.record(endpoint, time.perf_counter() - start)
+        return ret
+
+    async def __hedge(self, endpoint: Hashable, func: Callable[..., Awaitable[TypeResult]], *args: Any) -> TypeResult:
+        retry = self.retry
+        delay = retry.hedge_delay
+        if delay is None:
+            delay = self.latency.quantile(endpoint, 0.95, retry.hedge_min_samples)
+            if delay is None:
+                return await self.__timed(endpoint, func, *args)
+
+        loop = asyncio.get_running_loop()
+        tasks = {loop.create_task(self.__timed(endpoint, func, *args))}
+        try:
+            done, tasks = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return done.pop().result()
+
+            tasks.add(loop.create_task(self.__timed(endpoint, func, *args)))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if (error := task.exception()) is None:
+                        return task.result()
+            raise error
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def req2res(
         self, request: aiohttp.ClientRequest, read_until_eof: bool = True, read_bufsize: int = 64 * 1024
     ) -> aiohttp.ClientResponse:
@@ -114,6 +527,8 @@ class NetCore:
             bytes: body
         """
 
+        await self.schedule(request.url.path)
+
         response = await self.req2res(request, True, read_bufsize)
 
         # 检查headers
@@ -127,3 +542,83 @@ class NetCore:
         response.release()
 
         return body
+
+    async def parse(self, parse_func: Callable[[bytes], TypeResult], body: bytes) -> TypeResult:
+        """
+        解析响应体 足够大的响应体将交由ParseConfig.executor解析
+
+        Args:
+            parse_func (Callable[[bytes], TypeResult]): 解析函数 使用进程池时须可被pickle
+            body (bytes): 响应体
+
+        Returns:
+            TypeResult: parse_func的返回值
+        """
+
+        executor = self.parse_config.executor
+        if executor is None or len(body) < self.parse_config.threshold:
+            return parse_func(body)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, parse_func, body)
+
+    async def send_and_parse(
+        self,
+        request: aiohttp.ClientRequest,
+        parse_func: Callable[[memoryview], TypeResult],
+        read_bufsize: int = 64 * 1024,
+        headers_checker: TypeHeadersChecker = check_status_code,
+    ) -> TypeResult:
+        """
+        发送http请求 并将body读入可复用的缓冲区后直接解析
+
+        Args:
+            request (aiohttp.ClientRequest): 待发送的请求
+            parse_func (Callable[[memoryview], TypeResult]): 解析函数 不得在返回后继续引用传入的memoryview
+            read_bufsize (int, optional): 读缓冲区大小 以字节为单位. Defaults to 64KiB.
+            headers_checker (TypeHeadersChecker, optional): headers检查函数. Defaults to check_status_code.
+
+        Returns:
+            TypeResult: parse_func的返回值
+
+        Note:
+            相比`send_request` 响应体被读入池中复用的缓冲区 不再为每个响应额外保留分块与拼接后的bytes 因此峰值内存约减半\n
+            该方法并非零拷贝 `ParseFromString`仍会在内部将传入的memoryview复制为bytes 故解析耗时与`send_request`相当\n
+            交由ParseConfig.executor解析的响应体会先复制为bytes 以免缓冲区在解析期间被复用
+        """
+
+        await self.schedule(request.url.path)
+
+        response = await self.req2res(request, True, read_bufsize)
+
+        # 检查headers
+        headers_checker(response)
+
+        # content-length为压缩后的长度 仅作为解压后长度的下界
+        buffer = self.buffer_pool.acquire(response.content_length or read_bufsize)
+        view = memoryview(buffer)
+        try:
+            # 读取响应
+            size = 0
+            while chunk := await response.content.readany():
+                end = size + len(chunk)
+                if end > len(buffer):
+                    new_buffer = bytearray(1 << (end - 1).bit_length())
+                    new_buffer[:size] = view[:size]
+                    view.release()
+                    buffer = new_buffer
+                    view = memoryview(buffer)
+                view[size:end] = chunk
+                size = end
+
+            # 释放连接
+            response.release()
+
+            with view[:size] as body:
+                if self.parse_config.executor is not None and size >= self.parse_config.threshold:
+                    return await self.parse(parse_func, bytes(body))
+                return parse_func(body)
+
+        finally:
+            view.release()
+            self.buffer_pool.release(buffer)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import dataclasses as dcs
+import heapq
+import itertools
+import time
+from typing import TYPE_CHECKING
+
+from ..enums import ReqPriority
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Hashable
+
+_PRIORITY: contextvars.ContextVar[ReqPriority] = contextvars.ContextVar("priority", default=ReqPriority.NORMAL)
+
+
+@contextlib.contextmanager
+def priority(prio: ReqPriority) -> Generator[None, None, None]:
+    """
+    在上下文中以指定优先级发送请求
+
+    Args:
+        prio (ReqPriority): 优先级
+
+    Examples:
+        with priority(ReqPriority.LOW):
+            await client.get_threads("starry")
+    """
+
+    token = _PRIORITY.set(prio)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def get_priority() -> ReqPriority:
+    """
+    获取当前上下文的请求优先级
+
+    Returns:
+        ReqPriority
+    """
+
+    return _PRIORITY.get()
+
+
+@dcs.dataclass
+class TokenBucket:
+    """
+    令牌桶
+
+    Args:
+        rate (float): 每秒补充的令牌数 须为正数
+        burst (int): 桶容量
+
+    Raises:
+        ValueError: rate不为正数
+    """
+
+    rate: float
+    burst: int
+    tokens: float
+    updated: float
+
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive. got {rate}")
+
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """
+        距离下一个令牌可用的时间 以秒为单位
+        """
+
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+
+@dcs.dataclass
+class LaneStats:
+    """
+    单个优先级通道的统计信息
+
+    Attributes:
+        waiting (int): 当前排队的请求数
+        granted (int): 已放行的请求数
+        total_wait (float): 累计等待时间 以秒为单位
+        max_wait (float): 最长等待时间 以秒为单位
+
+        avg_wait (float): 平均等待时间 以秒为单位
+    """
+
+    waiting: int = 0
+    granted: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.granted if self.granted else 0.0
+
+
+@dcs.dataclass(order=True)
+class _Waiter:
+    prio: int
+    seq: int
+    enqueued: float = dcs.field(compare=False)
+    future: asyncio.Future = dcs.field(compare=False)
+    buckets: tuple[TokenBucket, ...] = dcs.field(compare=False)
+
+
+class RateScheduler:
+    """
+    按账号与接口限速的请求调度器
+    可在多个Client间共享
+
+    Args:
+        account_rate (float, optional): 每个账号每秒可发送的请求数. Defaults to 10.0.
+        account_burst (int, optional): 每个账号允许的突发请求数. Defaults to 20.
+        endpoint_rates (dict[Hashable, tuple[float, int]], optional): 接口到(每秒请求数, 突发请求数)的映射
+            接口为http请求的路径或websocket请求的cmd 未列出的接口仅受账号限速. Defaults to None.
+
+    Raises:
+        ValueError: 账号或接口的每秒请求数不为正数
+
+    Attributes:
+        stats (dict[ReqPriority, LaneStats]): 各优先级通道的排队深度与等待时间统计
+
+    Note:
+        每个账号的等待者按优先级排成一个堆 分发时仅检查堆顶 单次操作的复杂度为O(log n)\n
+        等待中的高优先级请求会阻止同一账号的低优先级请求被放行
+    """
+
+    __slots__ = [
+        "account_rate",
+        "account_burst",
+        "endpoint_rates",
+        "stats",
+        "_account_buckets",
+        "_endpoint_buckets",
+        "_waiters",
+        "_counter",
+        "_timers",
+    ]
+
+    def __init__(
+        self,
+        account_rate: float = 10.0,
+        account_burst: int = 20,
+        endpoint_rates: dict[Hashable, tuple[float, int]] | None = None,
+    ) -> None:
+        endpoint_rates = endpoint_rates or {}
+        # 令牌桶按需创建 在此提前检查以免在首次请求时才报错
+        for rate in (account_rate, *(rate for rate, _ in endpoint_rates.values())):
+            if rate <= 0:
+                raise ValueError(f"rate must be positive. got {rate}")
+
+        self.account_rate = account_rate
+        self.account_burst = account_burst
+        self.endpoint_rates = endpoint_rates
+
+        self.stats = {prio: LaneStats() for prio in ReqPriority}
+
+        self._account_buckets: dict[Hashable, TokenBucket] = {}
+        self._endpoint_buckets: dict[Hashable, TokenBucket] = {}
+        self._waiters: dict[Hashable, list[_Waiter]] = {}
+        self._counter = itertools.count()
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+
+    def __get_buckets(self, account: Hashable, endpoint: Hashable) -> tuple[TokenBucket, ...]:
+        bucket = self._account_buckets.get(account, None)
+        if bucket is None:
+            bucket = self._account_buckets[account] = TokenBucket(self.account_rate, self.account_burst)
+
+        if (rate := self.endpoint_rates.get(endpoint, None)) is None:
+            return (bucket,)
+
+        ep_bucket = self._endpoint_buckets.get(endpoint, None)
+        if ep_bucket is None:
+            ep_bucket = self._endpoint_buckets[endpoint] = TokenBucket(*rate)
+        return (bucket, ep_bucket)
+
+    async def acquire(self, account: Hashable, endpoint: Hashable, prio: ReqPriority | None = None) -> None:
+        """
+        等待直到允许发送请求
+
+        Args:
+            account (Hashable): 账号标识
+            endpoint (Hashable): 接口标识
+            prio (ReqPriority, optional): 优先级 为None则使用当前上下文的优先级. Defaults to None.
+        """
+
+        if prio is None:
+            prio = _PRIORITY.get()
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            prio, next(self._counter), time.monotonic(), loop.create_future(), self.__get_buckets(account, endpoint)
+        )
+        heapq.heappush(self._waiters.setdefault(account, []), waiter)
+        self.stats[prio].waiting += 1
+
+        self.__dispatch(account)
+
+        try:
+            await waiter.future
+        finally:
+            # 被取消的等待者留在堆中 到达堆顶时才被弹出
+            if waiter.future.cancelled():
+                self.stats[prio].waiting -= 1
+                self.__dispatch(account)
+
+    def __dispatch(self, account: Hashable) -> None:
+        timer = self._timers.pop(account, None)
+        if timer is not None:
+            timer.cancel()
+
+        waiters = self._waiters.get(account, None)
+        if waiters is None:
+            return
+
+        now = time.monotonic()
+        while waiters:
+            waiter = waiters[0]
+            if waiter.future.done():
+                heapq.heappop(waiters)
+                continue
+
+            buckets = waiter.buckets
+            for bucket in buckets:
+                bucket.refill(now)
+            if not all(b.tokens >= 1.0 for b in buckets):
+                # 令牌不足 堆顶之后的等待者继续排队
+                delay = max(b.delay() for b in buckets)
+                self._timers[account] = asyncio.get_running_loop().call_later(delay, self.__dispatch, account)
+                return
+
+            heapq.heappop(waiters)
+            for bucket in buckets:
+                bucket.tokens -= 1.0
+            waiter.future.set_result(None)
+
+            stats = self.stats[waiter.prio]
+            stats.waiting -= 1
+            stats.granted += 1
+            wait = now - waiter.enqueued
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+
+        del self._waiters[account]
@@ -4,20 +4,22 @@ import asyncio
 import binascii
 import dataclasses as dcs
 import gzip
+import heapq
+import math
 import random
+import struct
 import time
-import weakref
 from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING
 
 import aiohttp
 import yarl
-from cryptography.hazmat.primitives import padding
-from cryptography.hazmat.primitives.ciphers import algorithms
 
+from ..config import ReconnectConfig
 from ..enums import WsStatus
-from ..exception import HTTPStatusError
+from ..exception import HTTPStatusError, WsDisconnectedError
 from ..helper import timeout
+from ..logging import get_logger as LOG
 
 if TYPE_CHECKING:
     from .account import Account
@@ -25,6 +27,132 @@ if TYPE_CHECKING:
 
 TypeWebsocketCallback = Callable[["WsCore", bytes, int], Awaitable[None]]
 
+_HEADER = struct.Struct(">BII")
+_HEADER_SIZE = _HEADER.size
+_BLOCK_SIZE = 16
+_PADDINGS = [bytes([i]) * i for i in range(_BLOCK_SIZE + 1)]
+
+
+class WsCodec:
+    """
+    websocket帧编解码器
+
+    Args:
+        account (Account): 贴吧的用户参数容器
+        compress_threshold (int, optional): 请求压缩时仅对不小于该字节数的数据启用gzip. Defaults to 1024.
+
+    Note:
+        AES-ECB无分组间状态 故加解密上下文在账号密钥不变时可被所有帧复用\n
+        头部与密文被直接写入同一块预分配的缓冲区\n
+        该对象不是线程安全的
+    """
+
+    __slots__ = [
+        "account",
+        "compress_threshold",
+        "_cipher",
+        "_encryptor",
+        "_decryptor",
+    ]
+
+    def __init__(self, account: Account, compress_threshold: int = 1024) -> None:
+        self.account = account
+        self.compress_threshold = compress_threshold
+        self._cipher = None
+        self._encryptor = None
+        self._decryptor = None
+
+    def _ensure_cipher(self) -> None:
+        cipher = self.account.aes_ecb_chiper
+        if cipher is not self._cipher:
+            self._cipher = cipher
+            self._encryptor = cipher.encryptor()
+            self._decryptor = cipher.decryptor()
+
+    def pack(self, data: bytes, cmd: int, req_id: int, *, compress: bool = False, encrypt: bool = True) -> bytearray:
+        """
+        打包数据并添加9字节头部
+
+        Args:
+            data (bytes): 待发送的websocket数据
+            cmd (int): 请求的cmd类型
+            req_id (int): 请求的id
+            compress (bool, optional): 是否需要gzip压缩 数据小于compress_threshold时忽略. Defaults to False.
+            encrypt (bool, optional): 是否需要aes加密. Defaults to True.
+
+        Returns:
+            bytearray: 打包后的websocket数据
+        """
+
+        flag = 0x08
+
+        if compress and len(data) >= self.compress_threshold:
+            flag |= 0b01000000
+            data = gzip.compress(data, compresslevel=6, mtime=0)
+
+        if not encrypt:
+            buffer = bytearray(_HEADER_SIZE + len(data))
+            _HEADER.pack_into(buffer, 0, flag, cmd, req_id)
+            buffer[_HEADER_SIZE:] = data
+            return buffer
+
+        flag |= 0b10000000
+        self._ensure_cipher()
+
+        # PKCS7填充总会追加1~16字节 因此仅需单独加密最后一个分组
+        body_size = len(data) & ~(_BLOCK_SIZE - 1)
+        pad_size = _BLOCK_SIZE - (len(data) - body_size)
+        size = _HEADER_SIZE + body_size + _BLOCK_SIZE
+
+        # update_into要求输出缓冲区额外预留一个分组减一的长度
+        buffer = bytearray(size + _BLOCK_SIZE - 1)
+        buffer_view = memoryview(buffer)
+        _HEADER.pack_into(buffer, 0, flag, cmd, req_id)
+        if body_size:
+            self._encryptor.update_into(memoryview(data)[:body_size], buffer_view[_HEADER_SIZE:])
+        last_block = data[body_size:] + _PADDINGS[pad_size]
+        self._encryptor.update_into(last_block, buffer_view[_HEADER_SIZE + body_size :])
+        buffer_view.release()
+
+        del buffer[size:]
+        return buffer
+
+    def parse(self, data: bytes) -> tuple[bytes, int, int]:
+        """
+        对websocket返回数据进行解包
+
+        Args:
+            data (bytes): 接收到的websocket数据
+
+        Returns:
+            bytes: 解包后的websocket数据
+            int: 对应请求的cmd类型
+            int: 对应请求的id
+
+        Raises:
+            ValueError: 密文长度或填充无效
+        """
+
+        flag, cmd, req_id = _HEADER.unpack_from(data)
+
+        # 解密与解压均会产生新的bytes 此时无需先复制负载
+        data = memoryview(data)[_HEADER_SIZE:]
+        if flag & 0b10000000:
+            if not data or len(data) % _BLOCK_SIZE:
+                raise ValueError("Invalid ciphertext length")
+            self._ensure_cipher()
+            plain = self._decryptor.update(data)
+            pad_size = plain[-1]
+            if not 0 < pad_size <= _BLOCK_SIZE or not plain.endswith(_PADDINGS[pad_size]):
+                raise ValueError("Invalid padding bytes")
+            data = memoryview(plain)[:-pad_size]
+        if flag & 0b01000000:
+            data = gzip.decompress(data)
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+
+        return data, cmd, req_id
+
 
 def pack_ws_bytes(
     account: Account, data: bytes, cmd: int, req_id: int, *, compress: bool = False, encrypt: bool = True
@@ -42,28 +170,12 @@ def pack_ws_bytes(
 
     Returns:
         bytes: 打包后的websocket数据
-    """
-
-    flag = 0x08
-
-    if compress:
-        flag |= 0b01000000
-        data = gzip.compress(data, compresslevel=6, mtime=0)
-    if encrypt:
-        flag |= 0b10000000
-        padder = padding.PKCS7(algorithms.AES.block_size).padder()
-        data = padder.update(data) + padder.finalize()
-        encryptor = account.aes_ecb_chiper.encryptor()
-        data = encryptor.update(data) + encryptor.finalize()
 
-    data = b"".join([
-        flag.to_bytes(1, "big"),
-        cmd.to_bytes(4, "big"),
-        req_id.to_bytes(4, "big"),
-        data,
-    ])
+    Note:
+        每次调用都会新建加密上下文 连续打包时应复用WsCodec
+    """
 
-    return data
+    return bytes(WsCodec(account, 0).pack(data, cmd, req_id, compress=compress, encrypt=encrypt))
 
 
 def parse_ws_bytes(account: Account, data: bytes) -> tuple[bytes, int, int]:
@@ -78,23 +190,12 @@ def parse_ws_bytes(account: Account, data: bytes) -> tuple[bytes, int, int]:
         bytes: 解包后的websocket数据
         int: 对应请求的cmd类型
         int: 对应请求的id
-    """
-
-    data_view = memoryview(data)
-    flag = data_view[0]
-    cmd = int.from_bytes(data_view[1:5], "big")
-    req_id = int.from_bytes(data_view[5:9], "big")
 
-    data = data_view[9:].tobytes()
-    if flag & 0b10000000:
-        decryptor = account.aes_ecb_chiper.decryptor()
-        data = decryptor.update(data) + decryptor.finalize()
-        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
-        data = unpadder.update(data) + unpadder.finalize()
-    if flag & 0b01000000:
-        data = gzip.decompress(data)
+    Note:
+        每次调用都会新建解密上下文 连续解包时应复用WsCodec
+    """
 
-    return data, cmd, req_id
+    return WsCodec(account).parse(data)
 
 
 @dcs.dataclass
@@ -175,18 +276,21 @@ class WsResponse:
         future (asyncio.Future): 用于等待读事件到来的Future
         req_id (int): 请求id
         read_timeout (float): 读超时时间
+        request (tuple[bytes, int, bool, bool] | None): 可在重连后重发的请求 依次为数据 cmd 是否压缩 是否加密
     """
 
     loop: asyncio.AbstractEventLoop
     future: asyncio.Future
     req_id: int
     read_timeout: float
+    request: tuple[bytes, int, bool, bool] | None
 
     def __init__(self, req_id: int, read_timeout: float) -> None:
         self.loop = asyncio.get_running_loop()
         self.future = self.loop.create_future()
         self.req_id = req_id
         self.read_timeout = read_timeout
+        self.request = None
 
     async def read(self) -> bytes:
         """
@@ -199,46 +303,82 @@ class WsResponse:
             asyncio.TimeoutError: 读取超时
         """
 
+        # 超时由WsWaiter的共享定时器统一设置
         try:
-            async with timeout(self.read_timeout, self.loop):
-                return await self.future
-        except asyncio.TimeoutError as err:
-            self.future.cancel()
-            raise asyncio.TimeoutError("Timeout to read") from err
+            return await self.future
         except BaseException:
             self.future.cancel()
             raise
 
 
+def _fail_future(future: asyncio.Future, err: BaseException) -> None:
+    future.set_exception(err)
+    # 调用方可能已丢弃该响应 标记异常已被获取以免事件循环记录"never retrieved"
+    future.exception()
+
+
+@dcs.dataclass
+class WsWaiterStats:
+    """
+    websocket等待映射的统计信息
+
+    Attributes:
+        timeouts (int): 等待超时的请求数
+        late (int): 在超时或取消后才到达的响应数
+        orphans (int): 无法对应到本连接所发请求的响应数
+    """
+
+    timeouts: int = 0
+    late: int = 0
+    orphans: int = 0
+
+
 @dcs.dataclass
 class WsWaiter:
     """
     websocket等待映射
+
+    Args:
+        read_timeout (float): 读超时时间
+        resolution (float, optional): 超时检查的时间粒度 以秒为单位. Defaults to 0.05.
+
+    Attributes:
+        stats (WsWaiterStats): 统计信息
+
+    Note:
+        所有请求的截止时间存放于同一个最小堆 并由单个定时器按resolution对齐后批量过期\n
+        截止时间从new()创建请求时开始计算 而非从WsResponse.read()开始 因此包含发送请求的耗时
     """
 
     loop: asyncio.AbstractEventLoop
-    waiter: weakref.WeakValueDictionary
+    waiter: dict[int, WsResponse]
     req_id: int
     read_timeout: float
-
-    def __init__(self, read_timeout: float) -> None:
+    resolution: float
+    stats: WsWaiterStats
+    _first_id: int
+    _deadlines: list[tuple[float, int]]
+    _timer: asyncio.TimerHandle | None
+    _timer_when: float
+
+    def __init__(self, read_timeout: float, resolution: float = 0.05) -> None:
         self.loop = asyncio.get_running_loop()
-        self.waiter = weakref.WeakValueDictionary()
-        self.req_id = int(time.time())
+        self.waiter = {}
+        self.req_id = self._first_id = int(time.time())
         self.read_timeout = read_timeout
-        weakref.finalize(self, self.__cancel_all)
+        self.resolution = resolution
+        self.stats = WsWaiterStats()
+        self._deadlines = []
+        self._timer = None
+        self._timer_when = 0.0
 
-    def __cancel_all(self) -> None:
-        for ws_resp in self.waiter.values():
-            ws_resp.future.cancel()
+    def __len__(self) -> int:
+        return len(self.waiter)
 
     def new(self) -> WsResponse:
         """
         创建一个可用于等待数据的响应对象
 
-        Args:
-            req_id (int): 请求id
-
         Returns:
             WsResponse: websocket响应
         """
@@ -246,6 +386,11 @@ class WsWaiter:
         self.req_id += 1
         ws_resp = WsResponse(self.req_id, self.read_timeout)
         self.waiter[self.req_id] = ws_resp
+
+        deadline = self.loop.time() + self.read_timeout
+        heapq.heappush(self._deadlines, (deadline, self.req_id))
+        self.__schedule(deadline)
+
         return ws_resp
 
     def set_done(self, req_id: int, data: bytes) -> None:
@@ -257,35 +402,132 @@ class WsWaiter:
             data (bytes): 填入的数据
         """
 
-        ws_resp: WsResponse = self.waiter.get(req_id, None)
-        if ws_resp is None:
+        ws_resp = self.waiter.pop(req_id, None)
+        if ws_resp is None or ws_resp.future.done():
+            if self._first_id < req_id <= self.req_id:
+                self.stats.late += 1
+            else:
+                self.stats.orphans += 1
             return
         ws_resp.future.set_result(data)
 
+    def fail_pending(self, reason: Exception, *, keep_replayable: bool = False) -> list[WsResponse]:
+        """
+        令所有等待中的响应以WsDisconnectedError失败
+
+        Args:
+            reason (Exception): 导致断线的异常
+            keep_replayable (bool, optional): 是否保留可重发的响应. Defaults to False.
+
+        Returns:
+            list[WsResponse]: 被保留的可重发响应 其截止时间不变
+        """
+
+        replayable = []
+        for req_id, ws_resp in list(self.waiter.items()):
+            if ws_resp.future.done():
+                del self.waiter[req_id]
+            elif keep_replayable and ws_resp.request is not None:
+                replayable.append(ws_resp)
+            else:
+                del self.waiter[req_id]
+                err = WsDisconnectedError("Websocket disconnected")
+                err.__cause__ = reason
+                _fail_future(ws_resp.future, err)
+        return replayable
+
+    def cancel_all(self) -> None:
+        """
+        取消所有等待中的响应
+        """
+
+        for ws_resp in self.waiter.values():
+            ws_resp.future.cancel()
+        self.waiter.clear()
+        self._deadlines.clear()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def __schedule(self, deadline: float) -> None:
+        # 向上对齐到时间粒度 使相近的截止时间在同一次回调中过期
+        when = math.ceil(deadline / self.resolution) * self.resolution
+        if self._timer is not None:
+            if when >= self._timer_when:
+                return
+            self._timer.cancel()
+        self._timer = self.loop.call_at(when, self.__expire)
+        self._timer_when = when
+
+    def __expire(self) -> None:
+        self._timer = None
+        now = self.loop.time()
+        deadlines = self._deadlines
+
+        while deadlines and deadlines[0][0] <= now:
+            _, req_id = heapq.heappop(deadlines)
+            # 已完成的请求在堆中惰性删除
+            ws_resp = self.waiter.pop(req_id, None)
+            if ws_resp is None or ws_resp.future.done():
+                continue
+            _fail_future(ws_resp.future, asyncio.TimeoutError("Timeout to read"))
+            self.stats.timeouts += 1
+
+        if deadlines:
+            self.__schedule(deadlines[0][0])
+
 
 @dcs.dataclass
 class WsCore:
     """
     保存websocket接口相关状态的核心容器
+
+    Args:
+        account (Account): 贴吧的用户参数容器
+        net_core (NetCore): 网络请求核心容器
+        reconnect (ReconnectConfig, optional): 断线重连配置. Defaults to None.
+        on_reconnect (Callable[[], Awaitable[None]], optional): 重连建立后执行的握手 应在成功后将状态置为OPEN. Defaults to None.
+
+    Note:
+        未提供on_reconnect时不会自动重连
     """
 
     account: Account
+    codec: WsCodec
     net_core: NetCore
+    reconnect: ReconnectConfig
+    on_reconnect: Callable[[], Awaitable[None]] | None
     waiter: WsWaiter
     callbacks: dict[int, TypeWebsocketCallback]
     websocket: aiohttp.ClientWebSocketResponse
     ws_dispatcher: asyncio.Task
+    ws_reconnector: asyncio.Task
     mid_manager: MsgIDManager
     _status: WsStatus
     loop: asyncio.AbstractEventLoop
 
-    def __init__(self, account: Account, net_core: NetCore) -> None:
+    def __init__(
+        self,
+        account: Account,
+        net_core: NetCore,
+        reconnect: ReconnectConfig | None = None,
+        on_reconnect: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
         self.set_account(account)
         self.net_core = net_core
 
+        if reconnect is None:
+            reconnect = ReconnectConfig()
+        self.reconnect = reconnect
+        self.on_reconnect = on_reconnect
+
+        self.waiter: WsWaiter = None
+        self.mid_manager: MsgIDManager = None
+
         self.callbacks: dict[int, TypeWebsocketCallback] = {}
         self.websocket: aiohttp.ClientWebSocketResponse = None
         self.ws_dispatcher: asyncio.Task = None
+        self.ws_reconnector: asyncio.Task = None
 
         self._status = WsStatus.CLOSED
 
@@ -293,6 +535,7 @@ class WsCore:
 
     def set_account(self, new_account: Account) -> None:
         self.account = new_account
+        self.codec = WsCodec(new_account)
 
     async def connect(self) -> None:
         """
@@ -304,9 +547,18 @@ class WsCore:
 
         self._status = WsStatus.CONNECTING
 
+        if self.ws_reconnector is not None:
+            self.ws_reconnector.cancel()
+            self.ws_reconnector = None
+        if self.waiter is not None:
+            self.waiter.cancel_all()
+
         self.waiter = WsWaiter(self.net_core.timeout.ws_read)
         self.mid_manager = MsgIDManager()
 
+        await self.__open()
+
+    async def __open(self) -> None:
         from aiohttp import hdrs
 
         ws_url = yarl.URL.build(scheme="ws", host="im.tieba.baidu.com", port=8000)
@@ -359,21 +611,31 @@ class WsCore:
 
         if self.ws_dispatcher is not None and not self.ws_dispatcher.done():
             self.ws_dispatcher.cancel()
-        self.ws_dispatcher = self.loop.create_task(self.__ws_dispatch(), name="ws_dispatcher")
+        self.ws_dispatcher = self.loop.create_task(self.__ws_dispatch(self.websocket), name="ws_dispatcher")
 
     async def close(self) -> None:
-        if self.status == WsStatus.OPEN:
+        # 先置为CLOSED 使分发任务不会将主动关闭视为断线
+        self._status = WsStatus.CLOSED
+
+        if self.ws_reconnector is not None:
+            self.ws_reconnector.cancel()
+            self.ws_reconnector = None
+        if self.websocket is not None and not self.websocket.closed:
             await self.websocket.close()
+        if self.ws_dispatcher is not None:
             self.ws_dispatcher.cancel()
-        self._status = WsStatus.CLOSED
+        if self.waiter is not None:
+            self.waiter.cancel_all()
 
     def __default_callback(self, req_id: int, data: bytes) -> None:
         self.waiter.set_done(req_id, data)
 
-    async def __ws_dispatch(self) -> None:
+    async def __ws_dispatch(self, websocket: aiohttp.ClientWebSocketResponse) -> None:
         try:
-            async for msg in self.websocket:
-                data, cmd, req_id = parse_ws_bytes(self.account, msg.data)
+            async for msg in websocket:
+                if msg.type == aiohttp.WSMsgType.ERROR:
+                    raise msg.data
+                data, cmd, req_id = self.codec.parse(msg.data)
                 res_callback = self.callbacks.get(cmd, None)
                 if res_callback is None:
                     self.__default_callback(req_id, data)
@@ -381,9 +643,72 @@ class WsCore:
                     self.loop.create_task(res_callback(self, data, req_id))
 
         except asyncio.CancelledError:
+            return
+        except Exception as err:
+            reason = err
+        else:
+            reason = ConnectionResetError(f"Websocket closed. code={websocket.close_code}")
+
+        # 主动关闭或重连握手期间的断线无需处理
+        if self._status != WsStatus.OPEN or websocket is not self.websocket:
+            return
+
+        self.__handle_disconnect(reason)
+
+    def __handle_disconnect(self, reason: Exception) -> None:
+        reconnect = self.reconnect
+        can_reconnect = self.on_reconnect is not None and reconnect.max_attempts > 0
+
+        replayable = self.waiter.fail_pending(reason, keep_replayable=can_reconnect and reconnect.replay)
+
+        if not can_reconnect:
             self._status = WsStatus.CLOSED
-        except Exception:
-            self._status = WsStatus.CLOSED
+            return
+
+        LOG().warning("Websocket disconnected. reconnecting... pending=%d err=%r", len(replayable), reason)
+        self._status = WsStatus.CONNECTING
+        self.ws_reconnector = self.loop.create_task(self.__reconnect(replayable), name="ws_reconnector")
+
+    async def __reconnect(self, replayable: list[WsResponse]) -> None:
+        reconnect = self.reconnect
+        attempt = 0
+
+        while True:
+            try:
+                await self.__open()
+                await self.on_reconnect()
+                break
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as err:
+                self._status = WsStatus.CONNECTING
+                if self.websocket is not None and not self.websocket.closed:
+                    await self.websocket.close()
+
+                attempt += 1
+                if attempt >= reconnect.max_attempts:
+                    LOG().warning("Failed to reconnect websocket. attempts=%d err=%r", attempt, err)
+                    self._status = WsStatus.CLOSED
+                    self.waiter.fail_pending(err)
+                    return
+
+                delay = reconnect.backoff(attempt)
+                LOG().debug("Reconnect websocket in %.3fs. attempt=%d err=%r", delay, attempt, err)
+                await asyncio.sleep(delay)
+
+        for ws_resp in replayable:
+            if ws_resp.future.done():
+                continue
+            data, cmd, compress, encrypt = ws_resp.request
+            req_data = self.codec.pack(data, cmd, ws_resp.req_id, compress=compress, encrypt=encrypt)
+            try:
+                await self.websocket.send_bytes(req_data)
+            except Exception as err:
+                _fail_future(ws_resp.future, err)
+
+        self.ws_reconnector = None
 
     @property
     def status(self) -> WsStatus:
@@ -391,19 +716,23 @@ class WsCore:
         websocket状态
         """
 
-        if self._status != WsStatus.CLOSED and self.websocket._writer.transport.is_closing():
-            self._status = WsStatus.CLOSED
+        if self._status == WsStatus.OPEN and self.websocket._writer.transport.is_closing():
+            # 分发任务将随后处理断线并在可能时重连
+            return WsStatus.CONNECTING if self.on_reconnect is not None else WsStatus.CLOSED
         return self._status
 
-    async def send(self, data: bytes, cmd: int, *, compress: bool = False, encrypt: bool = True) -> WsResponse:
+    async def send(
+        self, data: bytes, cmd: int, *, compress: bool = False, encrypt: bool = True, idempotent: bool = False
+    ) -> WsResponse:
         """
         将protobuf序列化结果打包发送
 
         Args:
             data (bytes): 待发送的数据
             cmd (int): 请求的cmd类型
-            compress (bool, optional): 是否需要gzip压缩. Defaults to False.
+            compress (bool, optional): 是否需要gzip压缩 数据较小时忽略. Defaults to False.
             encrypt (bool, optional): 是否需要aes加密. Defaults to True.
+            idempotent (bool, optional): 请求是否幂等 幂等请求在断线重连后会被重发. Defaults to False.
 
         Returns:
             WsResponse: websocket响应对象
@@ -412,8 +741,12 @@ class WsCore:
             asyncio.TimeoutError: 发送超时
         """
 
+        await self.net_core.schedule(cmd)
+
         response = self.waiter.new()
-        req_data = pack_ws_bytes(self.account, data, cmd, response.req_id, compress=compress, encrypt=encrypt)
+        if idempotent:
+            response.request = (data, cmd, compress, encrypt)
+        req_data = self.codec.pack(data, cmd, response.req_id, compress=compress, encrypt=encrypt)
 
         try:
             async with timeout(self.net_core.timeout.ws_send, self.loop):
@@ -423,5 +756,6 @@ class WsCore:
             raise asyncio.TimeoutError("Timeout to send") from err
         except BaseException:
             response.future.cancel()
+            raise
         else:
             return response
@@ -0,0 +1,672 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import dataclasses as dcs
+import hashlib
+import multiprocessing as mp
+import os
+import pickle
+import queue
+from collections import Counter, OrderedDict, deque
+from itertools import starmap
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from .enums import PostSortType, ThreadSortType
+from .logging import get_logger as LOG
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable, Mapping
+
+    from .api.get_comments import Comment, Comments
+    from .api.get_posts import Comment_p, Forum_p, Post, Posts, Thread_p
+    from .api.get_threads import Thread
+    from .client import Client
+
+    TypeThreadPage = Posts | Comments
+
+
+@dcs.dataclass
+class FullThread:
+    """
+    完整的主题帖
+
+    Attributes:
+        forum (Forum_p): 所在吧信息
+        thread (Thread_p): 主题帖信息
+        posts (list[Post]): 按楼层排序的全部楼层
+        comments (dict[int, list[Comment_p | Comment]]): 楼层pid到该楼层全部楼中楼的映射 按时间顺序
+        errors (list[Exception]): 请求过程中捕获的异常
+
+    Note:
+        楼中楼已随get_posts完整返回的楼层直接使用其Comment_p 其余楼层使用get_comments返回的Comment
+    """
+
+    forum: Forum_p
+    thread: Thread_p
+    posts: list[Post] = dcs.field(default_factory=list)
+    comments: dict[int, list[Comment_p | Comment]] = dcs.field(default_factory=dict)
+    errors: list[Exception] = dcs.field(default_factory=list)
+
+    def __iter__(self):
+        return iter(self.posts)
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def comments_of(self, post: Post) -> list[Comment_p | Comment]:
+        """
+        获取楼层的全部楼中楼
+
+        Args:
+            post (Post): 楼层
+
+        Returns:
+            list[Comment_p | Comment]: 楼中楼列表
+        """
+
+        return self.comments.get(post.pid, [])
+
+
+async def iter_full_thread(
+    client: Client,
+    tid: int,
+    /,
+    *,
+    rn: int = 30,
+    comment_rn: int = 50,
+    concurrency: int = 8,
+    lazy: bool = False,
+) -> AsyncGenerator[TypeThreadPage, None]:
+    """
+    并发请求主题帖的全部回复页与楼中楼页 按到达顺序产出
+
+    Args:
+        client (Client): 用于发出请求的客户端
+        tid (int): 主题帖tid
+        rn (int, optional): 每页回复的条目数. Defaults to 30.
+        comment_rn (int, optional): 随回复页附带的楼中楼数量 楼中楼更多的楼层才会额外请求get_comments. Defaults to 50. Max to 50.
+        concurrency (int, optional): 同时进行的请求数上限. Defaults to 8.
+        lazy (bool, optional): True则返回的回复与楼中楼仅在访问属性时才从protobuf中解析. Defaults to False.
+
+    Yields:
+        Posts | Comments: 回复页或楼中楼页
+
+    Note:
+        首个回复页的total_page决定了需要请求的回复页 每个需要补全的楼层的首个楼中楼页同理\n
+        回复页总是优先于楼中楼页发出 出错页同样会被产出\n
+        提前退出迭代时应调用aclose()以立即取消进行中的请求
+    """
+
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be positive. got {concurrency}")
+
+    # 元素为 (页码, 楼层pid) 回复页的pid为0
+    post_queue: deque[tuple[int, int]] = deque([(1, 0)])
+    comment_queue: deque[tuple[int, int]] = deque()
+    running: dict[asyncio.Future[TypeThreadPage], tuple[int, int]] = {}
+
+    def fetch(pn: int, pid: int) -> Awaitable[TypeThreadPage]:
+        if pid:
+            return client.get_comments(tid, pid, pn, lazy=lazy)
+        return client.get_posts(
+            tid,
+            pn,
+            rn=rn,
+            with_comments=True,
+            comment_sort_by_agree=False,
+            comment_rn=comment_rn,
+            lazy=lazy,
+        )
+
+    def launch() -> None:
+        while len(running) < concurrency and (queue := post_queue or comment_queue):
+            key = queue.popleft()
+            running[asyncio.ensure_future(fetch(*key))] = key
+
+    try:
+        launch()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                pn, pid = running.pop(fut)
+                page = fut.result()
+
+                if not page.err:
+                    if pn == 1:
+                        queue = comment_queue if pid else post_queue
+                        queue.extend((_pn, pid) for _pn in range(2, page.page.total_page + 1))
+                    if not pid:
+                        comment_queue.extend((1, post.pid) for post in page if post.reply_num > len(post.comments))
+
+                yield page
+
+            launch()
+
+    finally:
+        for fut in running:
+            fut.cancel()
+
+
+async def fetch_full_thread(
+    client: Client,
+    tid: int,
+    /,
+    *,
+    rn: int = 30,
+    comment_rn: int = 50,
+    concurrency: int = 8,
+    lazy: bool = False,
+) -> FullThread:
+    """
+    并发获取主题帖的全部楼层与楼中楼
+
+    Args:
+        client (Client): 用于发出请求的客户端
+        tid (int): 主题帖tid
+        rn (int, optional): 每页回复的条目数. Defaults to 30.
+        comment_rn (int, optional): 随回复页附带的楼中楼数量 楼中楼更多的楼层才会额外请求get_comments. Defaults to 50. Max to 50.
+        concurrency (int, optional): 同时进行的请求数上限. Defaults to 8.
+        lazy (bool, optional): True则返回的回复与楼中楼仅在访问属性时才从protobuf中解析. Defaults to False.
+
+    Returns:
+        FullThread: 完整的主题帖 若首个回复页出错则posts为空
+    """
+
+    from .api.get_posts import Posts
+
+    first: Posts | None = None
+    posts: dict[int, Post] = {}
+    # 楼层pid -> 页码 -> 楼中楼页
+    comment_pages: dict[int, dict[int, Comments]] = {}
+    errors: list[Exception] = []
+
+    async with contextlib.aclosing(
+        iter_full_thread(client, tid, rn=rn, comment_rn=comment_rn, concurrency=concurrency, lazy=lazy)
+    ) as pages:
+        async for page in pages:
+            if page.err:
+                errors.append(page.err)
+            elif isinstance(page, Posts):
+                if first is None:
+                    first = page
+                for post in page:
+                    posts.setdefault(post.pid, post)
+            else:
+                comment_pages.setdefault(page.post.pid, {})[page.page.current_page] = page
+
+    if first is None:
+        empty = Posts()
+        return FullThread(empty.forum, empty.thread, errors=errors)
+
+    full = FullThread(first.forum, first.thread, errors=errors)
+    full.posts = sorted(posts.values(), key=lambda p: p.floor)
+    for post in full.posts:
+        if (pages := comment_pages.get(post.pid)) is None:
+            full.comments[post.pid] = list(post.comments)
+            continue
+
+        comments = {}
+        for _, page in sorted(pages.items()):
+            for comment in page:
+                comments.setdefault(comment.pid, comment)
+        full.comments[post.pid] = list(comments.values())
+
+    return full
+
+
+@dcs.dataclass
+class ThreadState:
+    """
+    主题帖的监视状态
+
+    Attributes:
+        last_time (int): 已处理的最后回复时间 10位时间戳 以秒为单位
+        reply_num (int): 已处理的回复数
+        last_pid (int): 已处理的最后回复的pid 为0则以last_time为界
+        last_floor (int): 已处理的最后回复的楼层 用于定位续取的页 为0则需二分查找
+    """
+
+    last_time: int = 0
+    reply_num: int = 0
+    last_pid: int = 0
+    last_floor: int = 0
+
+
+@dcs.dataclass
+class ForumChanges:
+    """
+    一轮轮询发现的变化
+
+    Attributes:
+        threads (list[Thread]): 新主题帖
+        posts (list[Post]): 新回复 按pid顺序
+        errors (list[Exception]): 捕获的异常 出错的主题帖会在下一轮重试
+    """
+
+    threads: list[Thread] = dcs.field(default_factory=list)
+    posts: list[Post] = dcs.field(default_factory=list)
+    errors: list[Exception] = dcs.field(default_factory=list)
+
+
+class ForumWatcher:
+    """
+    基于首页帖子列表增量监视贴吧的新主题帖与新回复
+
+    Args:
+        client (Client): 用于发出请求的客户端
+        fname_or_fid (str | int): 贴吧名或fid 优先贴吧名
+        rn (int, optional): 每轮请求的首页帖子数. Defaults to 30. Max to 100.
+        post_rn (int, optional): 每页回复的条目数. Defaults to 30.
+        max_post_pages (int, optional): 每个主题帖每轮至多取得的含新回复的页数. Defaults to 3.
+        concurrency (int, optional): 同时请求回复的主题帖数上限. Defaults to 4.
+        capacity (int, optional): 至多保存监视状态的主题帖数 超出时淘汰最久未出现在首页的主题帖. Defaults to 4096.
+        emit_existing (bool, optional): True则首轮将首页已有的帖子视为新主题帖 False则首轮仅记录状态. Defaults to False.
+
+    Note:
+        仅对最后回复时间或回复数增加的主题帖请求回复\n
+        回复按时间顺序自已处理的最后回复所在页起请求 新回复超出页数上限时余下的回复留待下一轮\n
+        被淘汰后重新出现在首页的主题帖以上一轮的最后回复时间为界判断新回复
+    """
+
+    __slots__ = [
+        "_client",
+        "_fname_or_fid",
+        "_rn",
+        "_post_rn",
+        "_max_post_pages",
+        "_concurrency",
+        "_capacity",
+        "_emit_existing",
+        "_states",
+        "_polled",
+        "_create_mark",
+        "_time_mark",
+    ]
+
+    def __init__(
+        self,
+        client: Client,
+        fname_or_fid: str | int,
+        *,
+        rn: int = 30,
+        post_rn: int = 30,
+        max_post_pages: int = 3,
+        concurrency: int = 4,
+        capacity: int = 4096,
+        emit_existing: bool = False,
+    ) -> None:
+        self._client = client
+        self._fname_or_fid = fname_or_fid
+        self._rn = rn
+        self._post_rn = post_rn
+        self._max_post_pages = max_post_pages
+        self._concurrency = concurrency
+        self._capacity = capacity
+        self._emit_existing = emit_existing
+
+        self._states: OrderedDict[int, ThreadState] = OrderedDict()
+        self._polled = False
+        self._create_mark = 0
+        self._time_mark = 0
+
+    @property
+    def states(self) -> Mapping[int, ThreadState]:
+        """
+        tid到监视状态的映射
+        """
+
+        return MappingProxyType(self._states)
+
+    async def poll(self) -> ForumChanges:
+        """
+        进行一轮轮询
+
+        Returns:
+            ForumChanges: 本轮发现的变化
+        """
+
+        changes = ForumChanges()
+
+        threads = await self._client.get_threads(self._fname_or_fid, rn=self._rn, sort=ThreadSortType.REPLY)
+        if threads.err:
+            changes.errors.append(threads.err)
+            return changes
+
+        targets: list[tuple[Thread, ThreadState]] = []
+        for thread in threads:
+            if (state := self._states.get(thread.tid)) is None:
+                if not self._polled and not self._emit_existing:
+                    state = ThreadState(thread.last_time, thread.reply_num)
+                elif not self._polled or thread.create_time > self._create_mark:
+                    changes.threads.append(thread)
+                    state = ThreadState(thread.create_time, last_floor=1)
+                else:
+                    state = ThreadState(self._time_mark)
+                self._states[thread.tid] = state
+
+            if thread.last_time > state.last_time or thread.reply_num > state.reply_num:
+                targets.append((thread, state))
+
+        # 按最后回复时间由旧到新排列 使最久未回复的主题帖先被淘汰
+        for thread in reversed(threads):
+            self._states.move_to_end(thread.tid)
+        while len(self._states) > self._capacity:
+            self._states.popitem(last=False)
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def fetch(thread: Thread, state: ThreadState) -> tuple[list[Post], bool] | Exception:
+            async with semaphore:
+                return await self._fetch_new_posts(thread, state)
+
+        results = await asyncio.gather(*starmap(fetch, targets))
+        for (thread, state), res in zip(targets, results, strict=True):
+            if isinstance(res, Exception):
+                changes.errors.append(res)
+                continue
+            posts, complete = res
+            changes.posts += posts
+            if posts:
+                state.last_pid = posts[-1].pid
+                state.last_floor = posts[-1].floor
+            if complete:
+                state.last_time = thread.last_time
+                state.reply_num = thread.reply_num
+            elif posts:
+                # 新回复超出单轮的页数上限 仅推进至已取得的最后一条回复 余下的回复留待下一轮
+                state.last_time = posts[-1].create_time
+
+        changes.posts.sort(key=lambda p: p.pid)
+
+        for thread in threads:
+            self._create_mark = max(self._create_mark, thread.create_time)
+            self._time_mark = max(self._time_mark, thread.last_time)
+        self._polled = True
+
+        return changes
+
+    async def _fetch_new_posts(self, thread: Thread, state: ThreadState) -> tuple[list[Post], bool] | Exception:
+        rn = self._post_rn
+        pages: dict[int, Posts] = {}
+
+        async def fetch(pn: int) -> Posts:
+            if (posts := pages.get(pn)) is None:
+                posts = pages[pn] = await self._client.get_posts(thread.tid, pn, rn=rn, sort=PostSortType.ASC)
+                if posts.err:
+                    raise posts.err
+            return posts
+
+        def is_new(post: Post) -> bool:
+            return (post.pid > state.last_pid) if state.last_pid else (post.create_time > state.last_time)
+
+        def reached(posts: Posts) -> bool:
+            # 该页之后的页均含有新回复
+            return not posts or is_new(posts[-1])
+
+        try:
+            if state.last_floor:
+                # 删帖只会使回复前移 故已处理的最后回复不晚于按楼层号推算的页
+                hi = (state.last_floor - 1) // rn + 1
+            else:
+                first = await fetch(1)
+                hi = 1 if reached(first) else max(first.page.total_page, 1)
+
+            # 该页首条回复已处理时新回复自该页起 否则二分查找首个含有新回复的页
+            lo = hi
+            posts = await fetch(hi)
+            if reached(posts) and (not posts or is_new(posts[0])):
+                lo = 1
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if reached(await fetch(mid)):
+                        hi = mid
+                    else:
+                        lo = mid + 1
+
+            new_posts = []
+            pn = lo
+            page_num = 0
+            while True:
+                posts = await fetch(pn)
+                # 首楼即主题帖本身
+                new_posts += [post for post in posts if post.floor != 1 and is_new(post)]
+                if not posts.page.has_more:
+                    return new_posts, True
+                if reached(posts):
+                    page_num += 1
+                    if page_num >= self._max_post_pages:
+                        return new_posts, False
+                pn += 1
+
+        except Exception as err:
+            return err
+
+    async def watch(self, interval: float = 10.0) -> AsyncGenerator[ForumChanges, None]:
+        """
+        持续轮询
+
+        Args:
+            interval (float, optional): 两轮轮询的间隔 以秒为单位. Defaults to 10.0.
+
+        Yields:
+            ForumChanges: 每轮发现的变化
+        """
+
+        while True:
+            yield await self.poll()
+            await asyncio.sleep(interval)
+
+
+class HashRing:
+    """
+    一致性哈希环
+
+    Args:
+        nodes (int): 节点数
+        replicas (int, optional): 每个节点在环上的虚拟节点数. Defaults to 64.
+
+    Note:
+        键的哈希值由其str形式的blake2b摘要决定 在不同进程间保持一致\n
+        节点数变化时仅有约1/nodes的键改变归属
+    """
+
+    __slots__ = ["nodes", "_points", "_owners"]
+
+    def __init__(self, nodes: int, replicas: int = 64) -> None:
+        if nodes < 1:
+            raise ValueError(f"nodes must be positive. got {nodes}")
+
+        self.nodes = nodes
+        ring = sorted((self._hash(f"{node}#{i}"), node) for node in range(nodes) for i in range(replicas))
+        self._points = [point for point, _ in ring]
+        self._owners = [node for _, node in ring]
+
+    @staticmethod
+    def _hash(key: Any) -> int:
+        return int.from_bytes(hashlib.blake2b(str(key).encode("utf-8"), digest_size=8).digest(), "big")
+
+    def get(self, key: Any) -> int:
+        """
+        获取键所属的节点
+
+        Args:
+            key (Any): 键 如贴吧名 fid或tid
+
+        Returns:
+            int: 节点序号
+        """
+
+        idx = bisect.bisect(self._points, self._hash(key))
+        return self._owners[idx % len(self._owners)]
+
+
+def _dumps_result(key: Any, result: Any, err: Exception | None) -> bytes:
+    try:
+        return pickle.dumps((key, result, err), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as _err:
+        err = RuntimeError(f"Failed to pickle result of {key!r}. err={_err!r}")
+        return pickle.dumps((key, None, err), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _run_worker(
+    idx: int,
+    task: Callable[[Client, Any], Awaitable[Any]],
+    client_kwargs: dict[str, Any],
+    concurrency: int,
+    in_queue: mp.Queue,
+    out_queue: mp.Queue,
+) -> None:
+    asyncio.run(_worker(idx, task, client_kwargs, concurrency, in_queue, out_queue))
+
+
+async def _worker(
+    idx: int,
+    task: Callable[[Client, Any], Awaitable[Any]],
+    client_kwargs: dict[str, Any],
+    concurrency: int,
+    in_queue: mp.Queue,
+    out_queue: mp.Queue,
+) -> None:
+    from .client import Client
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    running: set[asyncio.Task] = set()
+
+    async def handle(client: Client, key: Any) -> None:
+        try:
+            try:
+                data = _dumps_result(key, await task(client, key), None)
+            except Exception as err:
+                data = _dumps_result(key, None, err)
+            # 结果队列已满时在此阻塞 从而限制未被主进程取走的结果数
+            await loop.run_in_executor(None, out_queue.put, data)
+        finally:
+            semaphore.release()
+
+    async with Client(**client_kwargs) as client:
+        while (key := await loop.run_in_executor(None, in_queue.get)) is not None:
+            await semaphore.acquire()
+            fut = asyncio.create_task(handle(client, key))
+            running.add(fut)
+            fut.add_done_callback(running.discard)
+        await asyncio.gather(*running)
+
+    # 以工作进程序号作为结束标记
+    await loop.run_in_executor(None, out_queue.put, idx)
+
+
+class ShardedRunner:
+    """
+    多进程分片运行器
+
+    每个工作进程拥有独立的事件循环与Client
+    键按一致性哈希分配到工作进程 结果经有界队列汇总到主进程
+
+    Args:
+        task (Callable[[Client, Any], Awaitable[Any]]): 在工作进程中对每个键执行的异步函数 须为可被pickle的模块级函数
+        workers (int, optional): 工作进程数 为None则使用cpu核数. Defaults to None.
+        client_kwargs (dict[str, Any], optional): 工作进程构造Client时使用的关键字参数 须可被pickle. Defaults to None.
+        concurrency (int, optional): 每个工作进程内同时执行的任务数上限. Defaults to 8.
+        queue_size (int, optional): 结果队列容量 队列满时工作进程暂停产出. Defaults to 256.
+
+    Note:
+        工作进程以spawn方式启动 task返回的结果与抛出的异常需可被pickle\n
+        同一键总是被分配到同一工作进程 使各进程的贴吧名缓存等状态保持局部性
+    """
+
+    __slots__ = ["task", "workers", "client_kwargs", "concurrency", "queue_size", "ring"]
+
+    def __init__(
+        self,
+        task: Callable[[Client, Any], Awaitable[Any]],
+        workers: int | None = None,
+        *,
+        client_kwargs: dict[str, Any] | None = None,
+        concurrency: int = 8,
+        queue_size: int = 256,
+    ) -> None:
+        self.task = task
+        self.workers = workers or os.cpu_count() or 1
+        self.client_kwargs = client_kwargs or {}
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.ring = HashRing(self.workers)
+
+    async def run(self, keys: Iterable[Any]) -> AsyncGenerator[tuple[Any, Any, Exception | None], None]:
+        """
+        在工作进程中对所有键执行task 按完成顺序产出
+
+        Args:
+            keys (Iterable[Any]): 键的序列 如贴吧名或tid 须可哈希且可被pickle
+
+        Yields:
+            tuple[Any, Any, Exception | None]: 键 task的返回值 以及task抛出的异常
+
+        Note:
+            工作进程异常退出时 其余工作进程的结果仍会被产出 分配给该进程且未完成的键以RuntimeError产出\n
+            提前退出迭代时应调用aclose()以立即终止工作进程
+        """
+
+        ctx = mp.get_context("spawn")
+        out_queue = ctx.Queue(self.queue_size)
+        in_queues = [ctx.Queue() for _ in range(self.workers)]
+        procs = [
+            ctx.Process(
+                target=_run_worker,
+                args=(idx, self.task, self.client_kwargs, self.concurrency, in_queue, out_queue),
+                daemon=True,
+            )
+            for idx, in_queue in enumerate(in_queues)
+        ]
+
+        for proc in procs:
+            proc.start()
+
+        try:
+            # 各工作进程尚未完成的键
+            pending = [Counter() for _ in procs]
+            for key in keys:
+                idx = self.ring.get(key)
+                in_queues[idx].put(key)
+                pending[idx][key] += 1
+            for in_queue in in_queues:
+                in_queue.put(None)
+
+            loop = asyncio.get_running_loop()
+            finished = [False] * len(procs)
+            while not all(finished):
+                try:
+                    data = await loop.run_in_executor(None, out_queue.get, True, 0.2)
+                except queue.Empty:
+                    # 工作进程异常退出时不会发出结束标记
+                    for idx, proc in enumerate(procs):
+                        if finished[idx] or proc.is_alive():
+                            continue
+                        finished[idx] = True
+                        LOG().error("Worker %d exited unexpectedly. exitcode=%s", idx, proc.exitcode)
+                        err = RuntimeError(f"Worker {idx} exited unexpectedly. exitcode={proc.exitcode}")
+                        for key in pending[idx].elements():
+                            yield key, None, err
+                        pending[idx].clear()
+                    continue
+
+                if isinstance(data, int):
+                    finished[data] = True
+                    continue
+                key, result, err = pickle.loads(data)
+                pending[self.ring.get(key)][key] -= 1
+                yield key, result, err
+
+            for proc in procs:
+                proc.join()
+
+        finally:
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+            for in_queue in in_queues:
+                in_queue.cancel_join_thread()
@@ -280,3 +280,18 @@ class MsgType(enum.IntEnum):
     PRIVATE_MSG = 1
     MISC = 10
     READED = 22
+
+
+class ReqPriority(enum.IntEnum):
+    """
+    请求调度优先级 值越小越优先
+
+    Note:
+        HIGH 吧务操作等写请求\n
+        NORMAL 普通请求\n
+        LOW 后台爬取
+    """
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
@@ -118,3 +118,9 @@ class ContentTypeError(RuntimeError):
     """
     无法解析响应头中的content-type
     """
+
+
+class WsDisconnectedError(ConnectionError):
+    """
+    websocket连接在等待响应期间断开
+    """
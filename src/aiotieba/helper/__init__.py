@@ -1,4 +1,5 @@
-from ..helper import cache, crypto, utils
+from ..helper import cache, crypto, pagination, utils
+from .pagination import iter_pages
 from .utils import (
     default_datetime,
     deprecated,
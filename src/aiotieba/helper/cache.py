@@ -1,19 +1,100 @@
 from __future__ import annotations
 
+import dataclasses as dcs
+import hashlib
+import pickle
+import sqlite3
+import time
 from collections import OrderedDict
-from typing import ClassVar
+from typing import TYPE_CHECKING, Any, Protocol
+
+from ..logging import get_logger as LOG
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from pathlib import Path
+
+
+# 只读接口的默认缓存时间 以秒为单位
+# 键为`NetCore.fetch`中key的首项 即protobuf接口的cmd或json接口的路径
+DEFAULT_TTLS: dict[Hashable, float] = {
+    303021: 600.0,  # get_forum_detail
+    309466: 3600.0,  # get_tab_map
+    301007: 600.0,  # get_bawu_info
+    "/c/f/forum/getforumdata": 600.0,  # get_statistics
+    303012: 300.0,  # get_uinfo_profile
+    303024: 600.0,  # get_uinfo_getuserinfo_app
+    309702: 600.0,  # tieba_uid2user_info
+    "/im/pcmsg/query/getUserInfo": 600.0,  # get_uinfo_getUserInfo_web
+    "/i/sys/user_json": 600.0,  # get_uinfo_user_json
+    "/home/get/panel": 300.0,  # get_uinfo_panel
+}
+
+
+@dcs.dataclass
+class CacheStats:
+    """
+    缓存命中统计
+
+    Attributes:
+        hits (int): 命中次数
+        misses (int): 未命中次数
+
+        hit_rate (float): 命中率
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
 
 
 class ForumInfoCache:
     """
-    吧信息缓存
+    贴吧名与forum_id的双向缓存
+    可在多个Client间共享
+
+    Args:
+        capacity (int, optional): 最大条目数. Defaults to 4096.
+        path (str | Path, optional): 用于持久化的sqlite文件路径 为None则仅缓存于内存. Defaults to None.
+
+    Attributes:
+        stats (CacheStats): 命中统计
+
+    Note:
+        两个方向的映射共用同一个LRU淘汰顺序 淘汰时成对移除\n
+        启用持久化时 启动时载入最近使用的capacity条映射 新增的映射会立即写入文件 使用顺序在close()时写入
     """
 
-    _fname2fid: ClassVar[OrderedDict] = OrderedDict()
-    _fid2fname: ClassVar[OrderedDict] = OrderedDict()
+    __slots__ = ["capacity", "stats", "_fname2fid", "_fid2fname", "_conn"]
+
+    def __init__(self, capacity: int = 4096, path: str | Path | None = None) -> None:
+        self.capacity = capacity
+        self.stats = CacheStats()
+        # 以_fname2fid的顺序作为唯一的淘汰顺序
+        self._fname2fid: OrderedDict[str, int] = OrderedDict()
+        self._fid2fname: dict[int, str] = {}
+
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS forum "
+                "(fname TEXT PRIMARY KEY, fid INTEGER UNIQUE NOT NULL, atime REAL NOT NULL)"
+            )
+            rows = self._conn.execute("SELECT fname, fid FROM forum ORDER BY atime DESC LIMIT ?", (capacity,))
+            for fname, fid in reversed(rows.fetchall()):
+                self._fname2fid[fname] = fid
+                self._fid2fname[fid] = fname
+
+    def __len__(self) -> int:
+        return len(self._fname2fid)
 
-    @classmethod
-    def get_fid(cls, fname: str) -> int:
+    def get_fid(self, fname: str) -> int:
         """
         通过贴吧名获取forum_id
 
@@ -21,13 +102,18 @@ class ForumInfoCache:
             fname (str): 贴吧名
 
         Returns:
-            int: 该贴吧的forum_id
+            int: 该贴吧的forum_id 未命中时返回0
         """
 
-        return cls._fname2fid.get(fname, "")
+        fid = self._fname2fid.get(fname, 0)
+        if fid:
+            self._fname2fid.move_to_end(fname)
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return fid
 
-    @classmethod
-    def get_fname(cls, fid: int) -> str:
+    def get_fname(self, fid: int) -> str:
         """
         通过forum_id获取贴吧名
 
@@ -35,13 +121,18 @@ class ForumInfoCache:
             fid (int): forum_id
 
         Returns:
-            str: 该贴吧的贴吧名
+            str: 该贴吧的贴吧名 未命中时返回''
         """
 
-        return cls._fid2fname.get(fid, "")
+        fname = self._fid2fname.get(fid, "")
+        if fname:
+            self._fname2fid.move_to_end(fname)
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return fname
 
-    @classmethod
-    def add_forum(cls, fname: str, fid: int) -> None:
+    def add_forum(self, fname: str, fid: int) -> None:
         """
         将贴吧名与forum_id的映射关系添加到缓存
 
@@ -50,9 +141,399 @@ class ForumInfoCache:
             fid (int): 贴吧id
         """
 
-        if len(cls._fname2fid) == 128:
-            cls._fname2fid.popitem(last=False)
-            cls._fid2fname.popitem(last=False)
+        # 移除与新映射冲突的旧映射 保证两个方向始终成对
+        if (old_fid := self._fname2fid.pop(fname, 0)) and old_fid != fid:
+            del self._fid2fname[old_fid]
+        if (old_fname := self._fid2fname.pop(fid, "")) and old_fname != fname:
+            del self._fname2fid[old_fname]
+
+        self._fname2fid[fname] = fid
+        self._fid2fname[fid] = fname
+        while len(self._fname2fid) > self.capacity:
+            _, evicted_fid = self._fname2fid.popitem(last=False)
+            del self._fid2fname[evicted_fid]
+
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM forum WHERE fname=? OR fid=?", (fname, fid))
+            self._conn.execute("INSERT INTO forum VALUES (?,?,?)", (fname, fid, time.time()))
+            self._conn.execute(
+                "DELETE FROM forum WHERE fname IN (SELECT fname FROM forum ORDER BY atime DESC LIMIT -1 OFFSET ?)",
+                (self.capacity,),
+            )
+
+    def clear(self) -> None:
+        """
+        清空缓存与统计
+        """
+
+        self._fname2fid.clear()
+        self._fid2fname.clear()
+        self.stats = CacheStats()
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM forum")
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+
+        # 将内存中的使用顺序写回 使下次启动时载入的是最近使用的映射
+        now = time.time()
+        num = len(self._fname2fid)
+        self._conn.executemany(
+            "UPDATE forum SET atime=? WHERE fname=?",
+            ((now - (num - i) * 1e-3, fname) for i, fname in enumerate(self._fname2fid)),
+        )
+        self._conn.close()
+        self._conn = None
+
+
+@dcs.dataclass
+class UserIdentity:
+    """
+    用户的各类标识
+
+    Attributes:
+        user_id (int): user_id
+        portrait (str): portrait
+        user_name (str): 用户名
+        tieba_uid (int): 用户个人主页uid
+        expire_at (float): 过期时间 10位时间戳 以秒为单位
+    """
+
+    user_id: int = 0
+    portrait: str = ""
+    user_name: str = ""
+    tieba_uid: int = 0
+    expire_at: float = 0.0
+
+
+class UserIdentityCache:
+    """
+    user_id / portrait / user_name / tieba_uid之间的映射缓存
+    可在多个Client间共享
+
+    Args:
+        capacity (int, optional): 最多缓存的用户数. Defaults to 65536.
+        ttl (float, optional): 每个用户的缓存时间 以秒为单位. Defaults to 3600.0.
+
+    Attributes:
+        stats (CacheStats): 命中统计
+
+    Note:
+        以user_id的LRU顺序淘汰 淘汰或过期时一并移除该用户的全部标识
+    """
+
+    __slots__ = ["capacity", "ttl", "stats", "_users", "_portraits", "_user_names", "_tieba_uids"]
+
+    def __init__(self, capacity: int = 65536, ttl: float = 3600.0) -> None:
+        self.capacity = capacity
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._users: OrderedDict[int, UserIdentity] = OrderedDict()
+        self._portraits: dict[str, int] = {}
+        self._user_names: dict[str, int] = {}
+        self._tieba_uids: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get(self, id_: str | int) -> UserIdentity | None:
+        """
+        查询用户标识
+
+        Args:
+            id_ (str | int): 用户id user_id / portrait / user_name
+
+        Returns:
+            UserIdentity | None: 用户标识 未命中时返回None
+        """
+
+        if isinstance(id_, int):
+            user_id = id_
+        elif id_.startswith("tb."):
+            user_id = self._portraits.get(id_, 0)
+        else:
+            user_id = self._user_names.get(id_, 0)
+
+        return self._get(user_id)
+
+    def get_by_tieba_uid(self, tieba_uid: int) -> UserIdentity | None:
+        """
+        通过tieba_uid查询用户标识
+
+        Args:
+            tieba_uid (int): 用户个人主页uid
+
+        Returns:
+            UserIdentity | None: 用户标识 未命中时返回None
+        """
+
+        return self._get(self._tieba_uids.get(tieba_uid, 0))
+
+    def _get(self, user_id: int) -> UserIdentity | None:
+        ident = self._users.get(user_id)
+        if ident is not None:
+            if ident.expire_at > time.time():
+                self._users.move_to_end(user_id)
+                self.stats.hits += 1
+                return ident
+            self._remove(user_id)
+
+        self.stats.misses += 1
+        return None
+
+    def add(self, user: Any) -> None:
+        """
+        记录用户标识
+
+        Args:
+            user (Any): 提供user_id portrait user_name tieba_uid中任意属性的用户信息 缺失或为空的属性保留已知值
+
+        Note:
+            user_id为0的用户将被忽略
+        """
+
+        if not (user_id := getattr(user, "user_id", 0)):
+            return
+
+        if (ident := self._users.get(user_id)) is None:
+            ident = self._users[user_id] = UserIdentity(user_id)
+        else:
+            self._users.move_to_end(user_id)
+        ident.expire_at = time.time() + self.ttl
+
+        for name, index in self._indexes():
+            if (val := getattr(user, name, None)) and val != getattr(ident, name):
+                self._reindex(index, name, ident, val)
+
+        while len(self._users) > self.capacity:
+            self._remove(next(iter(self._users)))
+
+    def _indexes(self) -> tuple[tuple[str, dict], ...]:
+        return (("portrait", self._portraits), ("user_name", self._user_names), ("tieba_uid", self._tieba_uids))
+
+    def _reindex(self, index: dict, name: str, ident: UserIdentity, val: Any) -> None:
+        if (old := getattr(ident, name)) and index.get(old) == ident.user_id:
+            del index[old]
+        # 标识转移到其他用户时 原用户的该项标识作废
+        if (prev := index.get(val)) is not None and (prev_ident := self._users.get(prev)) is not None:
+            setattr(prev_ident, name, type(val)())
+        index[val] = ident.user_id
+        setattr(ident, name, val)
+
+    def _remove(self, user_id: int) -> None:
+        ident = self._users.pop(user_id)
+        for name, index in self._indexes():
+            if (key := getattr(ident, name)) and index.get(key) == user_id:
+                del index[key]
+
+    def clear(self) -> None:
+        """
+        清空缓存与统计
+        """
+
+        self._users.clear()
+        self._portraits.clear()
+        self._user_names.clear()
+        self._tieba_uids.clear()
+        self.stats = CacheStats()
+
+
+class CacheBackend(Protocol):
+    def get(self, key: Hashable) -> tuple[float, Any] | None: ...
+
+    def set(self, key: Hashable, expire_at: float, value: Any) -> None: ...
+
+    def delete(self, key: Hashable) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """
+    基于内存的LRU缓存后端
+
+    Args:
+        capacity (int, optional): 最大条目数. Defaults to 4096.
+    """
+
+    __slots__ = ["capacity", "_data"]
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self.capacity = capacity
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> tuple[float, Any] | None:
+        item = self._data.get(key, None)
+        if item is not None:
+            self._data.move_to_end(key)
+        return item
+
+    def set(self, key: Hashable, expire_at: float, value: Any) -> None:
+        self._data[key] = (expire_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.capacity:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SqliteCacheBackend:
+    """
+    基于sqlite文件的LRU缓存后端
+    可在进程重启后保留缓存
+
+    Args:
+        path (str | Path): 数据库文件路径
+        capacity (int, optional): 最大条目数. Defaults to 65536.
+
+    Note:
+        缓存值通过pickle序列化 无法序列化的值将被忽略\n
+        key以sha1摘要的形式存储 不会在文件中留下BDUSS等敏感信息
+    """
+
+    __slots__ = ["capacity", "_conn"]
+
+    def __init__(self, path: str | Path, capacity: int = 65536) -> None:
+        self.capacity = capacity
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key BLOB PRIMARY KEY, expire_at REAL NOT NULL, atime REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_atime ON cache (atime)")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    @staticmethod
+    def _digest(key: Hashable) -> bytes:
+        return hashlib.sha1(pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)).digest()
+
+    def get(self, key: Hashable) -> tuple[float, Any] | None:
+        digest = self._digest(key)
+        row = self._conn.execute("SELECT expire_at, value FROM cache WHERE key=?", (digest,)).fetchone()
+        if row is None:
+            return None
+
+        self._conn.execute("UPDATE cache SET atime=? WHERE key=?", (time.time(), digest))
+        try:
+            return row[0], pickle.loads(row[1])
+        except Exception:
+            self.delete(key)
+            return None
+
+    def set(self, key: Hashable, expire_at: float, value: Any) -> None:
+        try:
+            value_bytes = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as err:
+            LOG().debug("Failed to pickle %s. err=%s", type(value).__name__, err)
+            return
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?,?,?,?)", (self._digest(key), expire_at, time.time(), value_bytes)
+        )
+        self._conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY atime DESC LIMIT -1 OFFSET ?)",
+            (self.capacity,),
+        )
+
+    def delete(self, key: Hashable) -> None:
+        self._conn.execute("DELETE FROM cache WHERE key=?", (self._digest(key),))
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM cache")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache:
+    """
+    只读接口的响应缓存
+    可在多个Client间共享
+
+    Args:
+        ttls (dict[Hashable, float], optional): 接口到缓存时间的映射 未列出的接口不缓存. Defaults to DEFAULT_TTLS.
+        backend (CacheBackend, optional): 缓存后端. Defaults to MemoryCacheBackend().
+
+    Attributes:
+        stats (dict[Hashable, CacheStats]): 各接口的命中统计
+
+    Note:
+        命中时返回的是缓存中的同一对象 请勿修改其内容
+    """
+
+    __slots__ = ["ttls", "backend", "stats"]
+
+    def __init__(self, ttls: dict[Hashable, float] | None = None, backend: CacheBackend | None = None) -> None:
+        if ttls is None:
+            ttls = DEFAULT_TTLS.copy()
+        self.ttls = ttls
+
+        if backend is None:
+            backend = MemoryCacheBackend()
+        self.backend = backend
+
+        self.stats: dict[Hashable, CacheStats] = {}
+
+    def get(self, endpoint: Hashable, key: Hashable) -> Any | None:
+        """
+        读取缓存
+
+        Args:
+            endpoint (Hashable): 接口
+            key (Hashable): 缓存键
+
+        Returns:
+            Any | None: 缓存值 未命中或接口不可缓存时返回None
+        """
+
+        if endpoint not in self.ttls:
+            return None
+
+        stats = self.stats.get(endpoint, None)
+        if stats is None:
+            stats = self.stats[endpoint] = CacheStats()
+
+        item = self.backend.get(key)
+        if item is not None:
+            expire_at, value = item
+            if expire_at > time.time():
+                stats.hits += 1
+                return value
+            self.backend.delete(key)
+
+        stats.misses += 1
+        return None
+
+    def set(self, endpoint: Hashable, key: Hashable, value: Any) -> None:
+        """
+        写入缓存
+
+        Args:
+            endpoint (Hashable): 接口
+            key (Hashable): 缓存键
+            value (Any): 缓存值
+        """
+
+        ttl = self.ttls.get(endpoint, 0.0)
+        if ttl <= 0.0:
+            return
+        self.backend.set(key, time.time() + ttl, value)
+
+    def clear(self) -> None:
+        """
+        清空缓存与统计
+        """
 
-        cls._fname2fid[fname] = fid
-        cls._fid2fname[fid] = fname
+        self.backend.clear()
+        self.stats.clear()
@@ -1,5 +1,5 @@
 from __future__ import annotations
 
 from .const import APP_SALT, MISC_SALT, PC_SALT
-from .crypto import c3_aid, cuid_galaxy2, enuid, rc4_42
+from .crypto import c3_aid, cuid_galaxy2, enuid, rc4_42, sign_urlencode
 from .sign import compute_sign, sign
@@ -45,15 +45,19 @@ def rc4_42(xyus_md5_str: str, aes_cbc_sec_key: bytes) -> bytes:
         bytes
     """
 
-def sign(data: list[tuple[str, str | int]]) -> str:
+def sign_urlencode(data: list[tuple[str, str | int]], salt: bytes) -> bytes:
     """
-    为参数元组列表计算贴吧客户端签名
+    为参数元组列表计算贴吧客户端签名 并一次性编码为表单
 
     Args:
         data (list[tuple[str, str | int]]): 参数元组列表
+        salt (bytes): 签名盐
 
     Returns:
-        str: 签名
+        bytes: 追加了sign字段的urlencoded表单
+
+    Note:
+        结果与`urllib.parse.urlencode(sign(data, salt=salt))`一致 但不会修改data
     """
 
 def enuid(cuid_galaxy2: str) -> str:
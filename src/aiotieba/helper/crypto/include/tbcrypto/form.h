@@ -0,0 +1,16 @@
+#pragma once
+
+#include <stddef.h>
+
+#define TBC_URLENCODE_MAX_SIZE(srcSize) ((srcSize) * 3)
+
+/**
+ * @brief url-encode a byte string in the way of `urllib.parse.quote_plus`
+ *
+ * @param src utf-8 bytes. alloc and free by user
+ * @param srcSize size of src
+ * @param dst at least `TBC_URLENCODE_MAX_SIZE(srcSize)` bytes. alloc and free by user
+ *
+ * @return number of bytes written to dst
+ */
+size_t tbc_urlencode(const unsigned char* src, size_t srcSize, unsigned char* dst);
@@ -0,0 +1,29 @@
+#include <stdbool.h>
+
+#include "tbcrypto/const.h"
+
+#include "tbcrypto/form.h"
+
+static inline bool __tbc_isUnreserved(unsigned char c) {
+    return (c >= 'A' && c <= 'Z') || (c >= 'a' && c <= 'z') || (c >= '0' && c <= '9') || c == '_' || c == '.' ||
+           c == '-' || c == '~';
+}
+
+size_t tbc_urlencode(const unsigned char* src, size_t srcSize, unsigned char* dst) {
+    unsigned char* cursor = dst;
+
+    for (size_t i = 0; i < srcSize; i++) {
+        unsigned char c = src[i];
+        if (__tbc_isUnreserved(c)) {
+            *cursor++ = c;
+        } else if (c == ' ') {
+            *cursor++ = '+';
+        } else {
+            *cursor++ = '%';
+            *cursor++ = HEX_UPPERCASE_TABLE[c >> 4];
+            *cursor++ = HEX_UPPERCASE_TABLE[c & 0x0F];
+        }
+    }
+
+    return cursor - dst;
+}
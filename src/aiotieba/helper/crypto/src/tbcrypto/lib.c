@@ -1,10 +1,15 @@
 #include "tbcrypto/pywrap.h"
 
+#include "mbedtls/md5.h"
+
 #include "tbcrypto/bb64.h"
 #include "tbcrypto/const.h"
 #include "tbcrypto/cuid.h"
+#include "tbcrypto/form.h"
 #include "tbcrypto/rc442.h"
 
+static const unsigned char SIGN_FIELD[] = {'s', 'i', 'g', 'n', '='};
+
 PyObject* cuid_galaxy2(PyObject* Py_UNUSED(self), PyObject* args) {
     unsigned char dst[TBC_CUID_GALAXY2_SIZE];
     const unsigned char* androidID;
@@ -98,11 +103,144 @@ PyObject* enuid(PyObject* Py_UNUSED(self), PyObject* args) {
     return PyUnicode_FromKindAndData(PyUnicode_1BYTE_KIND, dst, TBC_ENUID_SIZE);
 }
 
+static int __tbc_unpackPair(PyObject* pair, const char** key, Py_ssize_t* keySize, PyObject** valStr, const char** val,
+                            Py_ssize_t* valSize) {
+    if (!PyTuple_Check(pair) || PyTuple_GET_SIZE(pair) != 2) {
+        PyErr_SetString(PyExc_TypeError, "Invalid item of data. Expect tuple[str, str | int]");
+        return -1;
+    }
+
+    *key = PyUnicode_AsUTF8AndSize(PyTuple_GET_ITEM(pair, 0), keySize);
+    if (*key == NULL) {
+        return -1;
+    }
+
+    PyObject* valObj = PyTuple_GET_ITEM(pair, 1);
+    if (PyUnicode_Check(valObj)) {
+        Py_INCREF(valObj);
+        *valStr = valObj;
+    } else {
+        *valStr = PyObject_Str(valObj);
+        if (*valStr == NULL) {
+            return -1;
+        }
+    }
+
+    *val = PyUnicode_AsUTF8AndSize(*valStr, valSize);
+    if (*val == NULL) {
+        Py_DECREF(*valStr);
+        return -1;
+    }
+
+    return 0;
+}
+
+PyObject* sign_urlencode(PyObject* Py_UNUSED(self), PyObject* args) {
+    PyObject* data;
+    const unsigned char* salt;
+    Py_ssize_t saltSize;
+
+    if (!PyArg_ParseTuple(args, "O!y#", &PyList_Type, &data, &salt, &saltSize)) {
+        PyErr_SetString(PyExc_TypeError, "Failed to parse args");
+        return NULL;
+    }
+
+    PyObject* ret = NULL;
+    PyObject** valStrs = NULL;
+    unsigned char* buffer = NULL;
+    Py_ssize_t pairNum = 0;
+
+    // snapshot the list so that neither pass could be affected by the caller
+    PyObject* items = PyList_GetSlice(data, 0, PY_SSIZE_T_MAX);
+    if (items == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t itemNum = PyList_GET_SIZE(items);
+    valStrs = PyMem_Malloc((itemNum + 1) * sizeof(PyObject*));
+    if (valStrs == NULL) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+
+    // pass 1: stringify every pair in original order and size the output
+    size_t bufferSize = sizeof(SIGN_FIELD) + TBC_MD5_STR_SIZE;
+    const char* key;
+    Py_ssize_t keySize;
+    const char* val;
+    Py_ssize_t valSize;
+    for (; pairNum < itemNum; pairNum++) {
+        if (__tbc_unpackPair(PyList_GET_ITEM(items, pairNum), &key, &keySize, &valStrs[pairNum], &val, &valSize)) {
+            goto exit;
+        }
+        bufferSize += TBC_URLENCODE_MAX_SIZE(keySize + valSize) + 2;
+    }
+
+    buffer = PyMem_Malloc(bufferSize);
+    if (buffer == NULL) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+
+    // pass 2: url-encode in original order
+    unsigned char* cursor = buffer;
+    for (Py_ssize_t i = 0; i < itemNum; i++) {
+        key = PyUnicode_AsUTF8AndSize(PyTuple_GET_ITEM(PyList_GET_ITEM(items, i), 0), &keySize);
+        val = PyUnicode_AsUTF8AndSize(valStrs[i], &valSize);
+        cursor += tbc_urlencode((const unsigned char*)key, keySize, cursor);
+        *cursor++ = '=';
+        cursor += tbc_urlencode((const unsigned char*)val, valSize, cursor);
+        *cursor++ = '&';
+    }
+
+    // pass 3: md5 over the sorted pairs
+    if (PyList_Sort(items)) {
+        goto exit;
+    }
+
+    mbedtls_md5_context md5Ctx;
+    mbedtls_md5_init(&md5Ctx);
+    mbedtls_md5_starts(&md5Ctx);
+    for (Py_ssize_t i = 0; i < itemNum; i++) {
+        PyObject* valStr;
+        if (__tbc_unpackPair(PyList_GET_ITEM(items, i), &key, &keySize, &valStr, &val, &valSize)) {
+            goto exit;
+        }
+        mbedtls_md5_update(&md5Ctx, (const unsigned char*)key, keySize);
+        mbedtls_md5_update(&md5Ctx, (const unsigned char*)"=", 1);
+        mbedtls_md5_update(&md5Ctx, (const unsigned char*)val, valSize);
+        Py_DECREF(valStr);
+    }
+    mbedtls_md5_update(&md5Ctx, salt, saltSize);
+
+    unsigned char md5[TBC_MD5_HASH_SIZE];
+    mbedtls_md5_finish(&md5Ctx, md5);
+
+    memcpy(cursor, SIGN_FIELD, sizeof(SIGN_FIELD));
+    cursor += sizeof(SIGN_FIELD);
+    for (size_t i = 0; i < TBC_MD5_HASH_SIZE; i++) {
+        *cursor++ = HEX_LOWERCASE_TABLE[md5[i] >> 4];
+        *cursor++ = HEX_LOWERCASE_TABLE[md5[i] & 0x0F];
+    }
+
+    ret = PyBytes_FromStringAndSize((char*)buffer, cursor - buffer);
+
+exit:
+    PyMem_Free(buffer);
+    for (Py_ssize_t i = 0; i < pairNum; i++) {
+        Py_DECREF(valStrs[i]);
+    }
+    PyMem_Free(valStrs);
+    Py_DECREF(items);
+    return ret;
+}
+
 static PyMethodDef crypto_methods[] = {
     {"cuid_galaxy2", (PyCFunction)cuid_galaxy2, METH_VARARGS, NULL},
     {"c3_aid", (PyCFunction)c3_aid, METH_VARARGS, NULL},
     {"rc4_42", (PyCFunction)rc4_42, METH_VARARGS, NULL},
     {"enuid", (PyCFunction)enuid, METH_VARARGS, NULL},
+    {"sign_urlencode", (PyCFunction)sign_urlencode, METH_VARARGS, NULL},
     {NULL, NULL, 0, NULL},
 };
 
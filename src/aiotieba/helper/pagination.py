@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable
+
+TypePage = TypeVar("TypePage")
+
+
+async def iter_pages(
+    fetch: Callable[[int], Awaitable[TypePage]], start_pn: int = 1, *, prefetch: int = 2
+) -> AsyncGenerator[TypePage, None]:
+    """
+    按页码顺序迭代分页结果 并预取后继页
+
+    Args:
+        fetch (Callable[[int], Awaitable[TypePage]]): 输入页码返回该页结果的异步函数
+        start_pn (int, optional): 起始页码. Defaults to 1.
+        prefetch (int, optional): 消费当前页时至多预取的后继页数 0则逐页请求. Defaults to 2.
+
+    Yields:
+        TypePage: 各页的结果
+
+    Note:
+        结果需提供has_more属性 若其page字段提供了非零的total_page则不会预取超出该页码的页
+        has_more为False时停止迭代 因此出错页(其err字段非空)会被产出 随后迭代停止
+        提前退出迭代时应调用aclose()以立即取消预取中的请求
+    """
+
+    if prefetch < 0:
+        raise ValueError(f"prefetch must be non-negative. got {prefetch}")
+
+    pending: deque[asyncio.Future[TypePage]] = deque()
+    next_pn = start_pn
+    total_page = 0
+
+    def fill(num: int) -> None:
+        nonlocal next_pn
+        while len(pending) < num and (not total_page or next_pn <= total_page):
+            pending.append(asyncio.ensure_future(fetch(next_pn)))
+            next_pn += 1
+
+    try:
+        fill(1)
+        while pending:
+            page: Any = await pending.popleft()
+
+            if not total_page:
+                total_page = getattr(getattr(page, "page", None), "total_page", 0)
+
+            if not page.has_more:
+                yield page
+                return
+
+            fill(prefetch)
+            yield page
+            fill(1)
+
+    finally:
+        for fut in pending:
+            fut.cancel()
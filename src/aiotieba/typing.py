@@ -1,8 +1,39 @@
-from aiotieba.api._classdef import UserInfo
+from __future__ import annotations
 
-from .api._classdef import contents
-from .api.get_comments import Comment, Comments
-from .api.get_posts import Post, Posts
-from .api.get_threads import Thread, Threads
+import importlib
+from typing import TYPE_CHECKING
 
-TypeUserInfo = UserInfo
+if TYPE_CHECKING:
+    from .api._classdef import UserInfo, contents
+    from .api.get_comments import Comment, Comments
+    from .api.get_posts import Post, Posts
+    from .api.get_threads import Thread, Threads
+
+    TypeUserInfo = UserInfo
+
+_LAZY_ATTRS = {
+    "UserInfo": ("._classdef", "UserInfo"),
+    "TypeUserInfo": ("._classdef", "UserInfo"),
+    "contents": ("._classdef", "contents"),
+    "Comment": (".get_comments", "Comment"),
+    "Comments": (".get_comments", "Comments"),
+    "Post": (".get_posts", "Post"),
+    "Posts": (".get_posts", "Posts"),
+    "Thread": (".get_threads", "Thread"),
+    "Threads": (".get_threads", "Threads"),
+}
+
+
+def __getattr__(name: str):
+    if (target := _LAZY_ATTRS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attr = target
+    value = getattr(importlib.import_module(module_name, "aiotieba.api"), attr)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return [*globals(), *_LAZY_ATTRS]
@@ -0,0 +1,133 @@
+import time
+
+import pytest
+
+from aiotieba import Client, ReqUInfo
+from aiotieba.api._classdef import UserInfo
+from aiotieba.helper.cache import (
+    ForumInfoCache,
+    MemoryCacheBackend,
+    ResponseCache,
+    SqliteCacheBackend,
+    UserIdentityCache,
+)
+
+
+def test_ResponseCache():
+    cache = ResponseCache({"ep": 60.0}, MemoryCacheBackend(capacity=2))
+
+    assert cache.get("ep", "a") is None
+    cache.set("ep", "a", 1)
+    cache.set("ep", "b", 2)
+    assert cache.get("ep", "a") == 1
+    # b最久未被访问 应被淘汰
+    cache.set("ep", "c", 3)
+    assert cache.get("ep", "b") is None
+    assert cache.get("ep", "c") == 3
+
+    stats = cache.stats["ep"]
+    assert stats.hits == 2
+    assert stats.misses == 2
+
+    # 未配置ttl的接口不缓存也不计数
+    cache.set("other", "a", 1)
+    assert cache.get("other", "a") is None
+    assert "other" not in cache.stats
+
+    cache.backend.set("a", time.time() - 1.0, 1)
+    assert cache.get("ep", "a") is None
+
+
+def test_SqliteCacheBackend(tmp_path):
+    path = tmp_path / "cache.db"
+
+    backend = SqliteCacheBackend(path, capacity=2)
+    cache = ResponseCache({"ep": 60.0}, backend)
+    cache.set("ep", ("ep", b"\x00"), {"fname": "starry"})
+    cache.set("ep", ("ep", b"\x01"), {"fname": "other"})
+    cache.set("ep", ("ep", b"\x02"), {"fname": "third"})
+    assert len(backend) == 2
+    backend.close()
+
+    cache = ResponseCache({"ep": 60.0}, SqliteCacheBackend(path))
+    assert cache.get("ep", ("ep", b"\x02")) == {"fname": "third"}
+
+
+def test_ForumInfoCache(tmp_path):
+    path = tmp_path / "forum.db"
+
+    cache = ForumInfoCache(capacity=2, path=path)
+    cache.add_forum("a", 1)
+    cache.add_forum("b", 2)
+    assert cache.get_fid("a") == 1
+    # b最久未被访问 应与其fid成对淘汰
+    cache.add_forum("c", 3)
+    assert cache.get_fname(2) == ""
+    assert cache.get_fid("b") == 0
+    assert cache.get_fname(3) == "c"
+
+    # 贴吧改名时旧的映射被移除
+    cache.add_forum("a2", 1)
+    assert cache.get_fid("a") == 0
+    assert cache.get_fname(1) == "a2"
+    assert len(cache) == 2
+
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 3
+    cache.close()
+
+    cache = ForumInfoCache(capacity=2, path=path)
+    assert cache.get_fid("a2") == 1
+    assert cache.get_fname(3) == "c"
+    assert cache.get_fid("b") == 0
+    cache.close()
+
+
+def test_UserIdentityCache():
+    cache = UserIdentityCache(capacity=2, ttl=60.0)
+    cache.add(UserInfo(1, "tb.1.a", "alice"))
+    cache.add(UserInfo(2, "tb.1.b", "bob", tieba_uid=20))
+    cache.add(UserInfo(0, "tb.1.z", "anonymous"))
+
+    assert cache.get("tb.1.a").user_name == "alice"
+    assert cache.get("bob").user_id == 2
+    assert cache.get_by_tieba_uid(20).portrait == "tb.1.b"
+    assert cache.get("anonymous") is None
+
+    # 缺失的字段保留已知值 改名后旧用户名失效
+    cache.add(UserInfo(1, user_name="alice2"))
+    assert cache.get(1).portrait == "tb.1.a"
+    assert cache.get("alice") is None
+    assert cache.get("alice2").user_id == 1
+
+    # 用户2最久未被访问 应连同其全部标识一起淘汰
+    cache.add(UserInfo(3, "tb.1.c"))
+    assert cache.get("bob") is None
+    assert cache.get_by_tieba_uid(20) is None
+    assert len(cache) == 2
+
+    cache.ttl = -1.0
+    cache.add(UserInfo(4, "tb.1.d"))
+    assert cache.get("tb.1.d") is None
+
+
+@pytest.mark.asyncio
+async def test_get_user_info_cached():
+    cache = UserIdentityCache()
+    cache.add(UserInfo(1, "tb.1.a", "alice"))
+    client = Client(id_cache=cache)
+
+    user = await client.get_user_info("alice", ReqUInfo.USER_ID | ReqUInfo.PORTRAIT)
+    assert (user.user_id, user.portrait) == (1, "tb.1.a")
+    assert cache.stats.hits == 1
+    assert user.err is None
+
+    # 命中缓存的结果与请求的结果同样携带err
+    user = await client.get_user_info(1, ReqUInfo.USER_NAME)
+    assert user.user_name == "alice"
+    assert user.err is None
+    assert cache.stats.hits == 2
+
+    cache.add(UserInfo(2, "tb.1.b", "bob"))
+    results = {id_: user async for id_, user, err in client.get_user_infos([1, "bob", 1, ""], ReqUInfo.BASIC)}
+    assert results == {1: UserInfo(1), "bob": UserInfo(2)}
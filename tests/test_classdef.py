@@ -0,0 +1,98 @@
+import pickle
+
+import pytest
+
+from aiotieba import Client
+from aiotieba.api._classdef import FragText, UserInfo
+from aiotieba.api.get_threads import Thread
+from aiotieba.api.get_threads._classdef import Contents_t
+
+
+def test_slots_dataclass():
+    thread = Thread(tid=1, title="标题", contents=Contents_t([FragText("正文")], texts=[FragText("正文")]))
+
+    assert not hasattr(thread, "__dict__")
+    assert thread.text == "标题\n正文"
+    # cached_property的结果缓存在槽位中 不随字段修改而刷新
+    thread.title = "新标题"
+    assert thread.text == "标题\n正文"
+    del thread.text
+    assert thread.text == "新标题\n正文"
+
+    restored = pickle.loads(pickle.dumps(thread))
+    assert restored == thread
+    assert restored.text == thread.text
+    assert restored.contents.text == "正文"
+
+
+def test_FragDecoder():
+    from aiotieba.api.get_threads.protobuf import FrsPageResIdl_pb2
+
+    thread_proto = FrsPageResIdl_pb2.FrsPageResIdl().data.thread_list.add()
+    for _type, text in [(0, "你好"), (4, "@贴吧"), (34, "过时"), (99, "未知"), (1, "")]:
+        frag = thread_proto.first_post_content.add()
+        frag.type = _type
+        frag.text = text
+    thread_proto.first_post_content[-1].link = "https://tieba.baidu.com"
+
+    contents = Contents_t.from_proto(thread_proto)
+
+    assert [type(frag).__name__ for frag in contents] == ["FragText", "FragAt", "FragUnknown", "FragLink"]
+    assert contents.texts == [contents[0], contents[1], contents[3]]
+    assert contents.ats == [contents[1]]
+    assert contents.links == [contents[3]]
+    assert contents[2].proto.text == "未知"
+    assert contents.text == "你好@贴吧https://tieba.baidu.com"
+
+
+def test_UserTable():
+    from aiotieba.api.get_comments import parse_body
+    from aiotieba.api.get_comments.protobuf import PbFloorResIdl_pb2
+
+    res_proto = PbFloorResIdl_pb2.PbFloorResIdl()
+    for user_id in [1, 2, 1, 0, 0]:
+        comment_proto = res_proto.data.subpost_list.add()
+        comment_proto.author.id = user_id
+    body = res_proto.SerializeToString()
+
+    for lazy in (False, True):
+        comments = parse_body(body, lazy)
+        assert comments[0].user is comments[2].user
+        assert comments[0].user is not comments[1].user
+        # user_id为0的用户无法区分 不应被合并
+        assert comments[3].user is not comments[4].user
+
+
+def test_to_columns():
+    from aiotieba.api.get_threads import parse_body
+    from aiotieba.api.get_threads.protobuf import FrsPageResIdl_pb2
+
+    res_proto = FrsPageResIdl_pb2.FrsPageResIdl()
+    res_proto.data.user_list.add().id = 1
+    for i in range(10):
+        thread_proto = res_proto.data.thread_list.add()
+        thread_proto.id = 100 + i
+        thread_proto.author_id = 1
+        thread_proto.title = f"标题{i}"
+        thread_proto.first_post_content.add().text = f"正文{i}"
+    body = res_proto.SerializeToString()
+
+    columns = parse_body(body).to_columns()
+    assert columns == parse_body(body, lazy=True).to_columns()
+    assert columns["tid"] == [100 + i for i in range(10)]
+    assert columns["text"][0] == "标题0\n正文0"
+    assert parse_body(body).to_columns(["tid"]) == {"tid": columns["tid"]}
+
+    pa = pytest.importorskip("pyarrow")
+    table = parse_body(body, lazy=True).to_arrow()
+    assert table.schema.field("tid").type == pa.int64()
+    assert table.column("text").to_pylist() == columns["text"]
+
+
+@pytest.mark.asyncio
+async def test_handle_exception_slots():
+    # 未进入上下文的Client在发送请求时抛出异常
+    user = await Client().get_self_info()
+    assert isinstance(user, UserInfo)
+    assert isinstance(user.err, AttributeError)
+    assert not user
@@ -0,0 +1,229 @@
+import asyncio
+import os
+
+import pytest
+
+from aiotieba.api.get_comments import Comment, Comments
+from aiotieba.api.get_comments._classdef import Page_c, Post_c
+from aiotieba.api.get_posts import Comment_p, Post, Posts
+from aiotieba.api.get_posts._classdef import Page_p
+from aiotieba.api.get_threads import Thread, Threads
+from aiotieba.crawler import ForumWatcher, HashRing, ShardedRunner, fetch_full_thread
+from aiotieba.enums import PostSortType
+from aiotieba.helper import iter_pages
+
+
+class FakeClient:
+    """
+    3页回复 每页2个楼层 第3楼有65条楼中楼 其余楼层各有1条
+    """
+
+    def __init__(self) -> None:
+        self.inflight = 0
+        self.max_inflight = 0
+        self.requests = []
+
+    async def _enter(self, key) -> None:
+        self.requests.append(key)
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        await asyncio.sleep(0.01)
+        self.inflight -= 1
+
+    async def get_posts(self, tid, pn, *, comment_rn, **kwargs) -> Posts:
+        await self._enter(("posts", pn))
+        posts = []
+        for floor in (pn * 2 - 1, pn * 2):
+            reply_num = 65 if floor == 3 else 1
+            comments = [Comment_p(pid=floor * 1000 + i) for i in range(min(reply_num, comment_rn))]
+            posts.append(Post(pid=floor, floor=floor, reply_num=reply_num, comments=comments))
+        return Posts(posts, page=Page_p(current_page=pn, total_page=3, has_more=pn < 3))
+
+    async def get_comments(self, tid, pid, pn, **kwargs) -> Comments:
+        await self._enter(("comments", pn))
+        comments = [Comment(pid=pid * 1000 + i) for i in range((pn - 1) * 30, min(pn * 30, 65))]
+        return Comments(comments, page=Page_c(current_page=pn, total_page=3), post=Post_c(pid=pid))
+
+
+@pytest.mark.asyncio
+async def test_fetch_full_thread():
+    client = FakeClient()
+    full = await fetch_full_thread(client, 1, comment_rn=50, concurrency=2)
+
+    assert [post.floor for post in full] == [1, 2, 3, 4, 5, 6]
+    assert not full.errors
+    assert client.max_inflight == 2
+    # 仅楼中楼未随回复页完整返回的第3楼需要额外请求
+    assert client.requests.count(("comments", 1)) == 1
+    assert len(client.requests) == 6
+
+    comments = full.comments_of(full.posts[2])
+    assert [c.pid for c in comments] == [3000 + i for i in range(65)]
+    assert all(isinstance(c, Comment) for c in comments)
+    assert [c.pid for c in full.comments_of(full.posts[0])] == [1000]
+
+
+class FakeForum:
+    """
+    以递增的时钟同时作为回复的pid与创建时间
+    """
+
+    def __init__(self) -> None:
+        self.clock = 0
+        self.threads = {}
+        self.post_requests = []
+
+    def add_thread(self, tid: int) -> None:
+        self.clock += 1
+        self.threads[tid] = [self.clock]
+
+    def reply(self, tid: int, num: int = 1) -> None:
+        for _ in range(num):
+            self.clock += 1
+            self.threads[tid].append(self.clock)
+
+    async def get_threads(self, fname, *, rn, sort) -> Threads:
+        threads = [
+            Thread(tid=tid, create_time=pids[0], last_time=pids[-1], reply_num=len(pids) - 1)
+            for tid, pids in sorted(self.threads.items(), key=lambda item: -item[1][-1])
+        ]
+        return Threads(threads[:rn])
+
+    async def get_posts(self, tid, pn, *, rn, sort) -> Posts:
+        self.post_requests.append((tid, pn))
+        pids = self.threads[tid]
+        total_page = (len(pids) + rn - 1) // rn
+        posts = [Post(pid=pid, tid=tid, floor=floor, create_time=pid) for floor, pid in enumerate(pids, 1)]
+        if sort == PostSortType.DESC:
+            posts.reverse()
+        posts = posts[(pn - 1) * rn : pn * rn]
+        return Posts(posts, page=Page_p(current_page=pn, total_page=total_page, has_more=pn < total_page))
+
+    def iter_posts(self, tid, *, rn, sort, prefetch):
+        return iter_pages(lambda pn: self.get_posts(tid, pn, rn=rn, sort=sort), prefetch=prefetch)
+
+
+@pytest.mark.asyncio
+async def test_ForumWatcher():
+    forum = FakeForum()
+    forum.add_thread(1)
+    forum.add_thread(2)
+    forum.reply(1, 3)
+
+    watcher = ForumWatcher(forum, "fake", rn=10, post_rn=2, capacity=2)
+
+    # 首轮仅记录状态
+    changes = await watcher.poll()
+    assert not changes.threads
+    assert not changes.posts
+    assert not forum.post_requests
+
+    # 无变化时不请求回复
+    changes = await watcher.poll()
+    assert not changes.posts
+    assert not forum.post_requests
+
+    forum.reply(1, 3)
+    forum.add_thread(3)
+    forum.reply(3)
+    changes = await watcher.poll()
+    assert [t.tid for t in changes.threads] == [3]
+    assert [p.pid for p in changes.posts] == [6, 7, 8, 10]
+    # 尚无楼层记录的主题帖二分查找新回复所在页 新主题帖自首页起
+    assert sorted(forum.post_requests) == [(1, 1), (1, 2), (1, 3), (1, 4), (3, 1)]
+    assert watcher.states[1].last_pid == 8
+    assert watcher.states[1].last_floor == 7
+    # 容量为2 最久未回复的主题帖2被淘汰
+    assert list(watcher.states) == [1, 3]
+
+    forum.post_requests.clear()
+    forum.reply(1)
+    changes = await watcher.poll()
+    assert [p.pid for p in changes.posts] == [11]
+    # 由上一轮的楼层直接定位
+    assert forum.post_requests == [(1, 4)]
+
+    # 被淘汰的主题帖重新出现时以上一轮的最后回复时间为界
+    forum.reply(2)
+    changes = await watcher.poll()
+    assert not changes.threads
+    assert [p.pid for p in changes.posts] == [12]
+
+
+@pytest.mark.asyncio
+async def test_ForumWatcher_page_cap():
+    forum = FakeForum()
+    forum.add_thread(1)
+
+    watcher = ForumWatcher(forum, "fake", rn=10, post_rn=2, max_post_pages=1)
+    await watcher.poll()
+
+    # 新回复数超过post_rn*max_post_pages
+    forum.reply(1, 5)
+    changes = await watcher.poll()
+    assert [p.pid for p in changes.posts] == [2]
+
+    forum.reply(1, 2)
+    polled = [[p.pid for p in (await watcher.poll()).posts] for _ in range(4)]
+    # 余下的回复在之后的轮次中按时间顺序取得 不重复不遗漏
+    assert polled == [[3, 4], [5, 6], [7, 8], []]
+    assert watcher.states[1].last_time == 8
+
+
+def test_HashRing():
+    ring = HashRing(4)
+    owners = [ring.get(key) for key in range(1000)]
+    assert owners == [HashRing(4).get(key) for key in range(1000)]
+    assert all(owners.count(node) > 100 for node in range(4))
+
+    # 增加节点时仅少部分键改变归属
+    ring = HashRing(5)
+    moved = sum(owner != ring.get(key) for key, owner in enumerate(owners))
+    assert moved < 400
+
+
+async def square(client, key: int) -> tuple[int, int]:
+    if key == 3:
+        raise ValueError(key)
+    return os.getpid(), key * key
+
+
+@pytest.mark.asyncio
+async def test_ShardedRunner():
+    runner = ShardedRunner(square, 2, concurrency=2, queue_size=4)
+    results = {}
+    pids = {}
+    async for key, result, err in runner.run(range(20)):
+        if key == 3:
+            assert isinstance(err, ValueError)
+            continue
+        assert err is None
+        pid, results[key] = result
+        pids[key] = pid
+
+    assert results == {key: key * key for key in range(20) if key != 3}
+    assert len(set(pids.values())) == 2
+    # 同一节点上的键由同一进程处理
+    for key, pid in pids.items():
+        assert all(pids[other] == pid for other in pids if runner.ring.get(other) == runner.ring.get(key))
+
+
+async def crash(client, key: int) -> int:
+    if key == 7:
+        os._exit(1)
+    return key
+
+
+@pytest.mark.asyncio
+async def test_ShardedRunner_worker_crash():
+    runner = ShardedRunner(crash, 2, concurrency=1)
+    errs = {}
+    async for key, _, err in runner.run(range(20)):
+        assert key not in errs
+        errs[key] = err
+
+    # 异常退出的工作进程未完成的键以RuntimeError产出 其余工作进程的结果不受影响
+    assert sorted(errs) == list(range(20))
+    assert isinstance(errs[7], RuntimeError)
+    dead = runner.ring.get(7)
+    assert all(errs[key] is None for key in range(20) if runner.ring.get(key) != dead)
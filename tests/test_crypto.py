@@ -1,7 +1,9 @@
+import urllib.parse
+
 import pytest
 
 import aiotieba as tb
-from aiotieba.helper.crypto import APP_SALT, compute_sign, rc4_42
+from aiotieba.helper.crypto import APP_SALT, compute_sign, rc4_42, sign, sign_urlencode
 
 
 @pytest.mark.asyncio(loop_scope="session")
@@ -20,6 +22,7 @@ async def test_clib(client: tb.Client):
         ("hello_cosmic", "你好42"),
     ]
     assert compute_sign(data, salt=APP_SALT) == "0be9991d2f8371952ab0b9cb14363bc2"
+    assert sign_urlencode(data, APP_SALT) == urllib.parse.urlencode(sign(data.copy(), salt=APP_SALT)).encode()
 
     query_key = rc4_42("d0337b3b3d597c5f87a1c0c37139d87b", b"6723280942424242")
     assert query_key == b"\x9f\xabU\x14\xa7\x0e\xb6k\xc4wV\xf2HN+."
@@ -1,3 +1,5 @@
+import dataclasses as dcs
+
 import pytest
 
 import aiotieba as tb
@@ -177,3 +179,16 @@ async def test_FragLink(client: tb.Client):
     frag = comment.contents.links[1]
     assert frag.url.host == "stackoverflow.com"
     assert frag.is_external is True
+
+
+@pytest.mark.flaky(reruns=2, reruns_delay=5.0)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_Comments_lazy(client: tb.Client):
+    comments = await client.get_comments(8211419000, 146544112004)
+    lazy_comments = await client.get_comments(8211419000, 146544112004, lazy=True)
+
+    assert lazy_comments.objs
+    for obj, lazy_obj in zip(comments, lazy_comments, strict=True):
+        assert lazy_obj.text == obj.text
+        for field in dcs.fields(obj):
+            assert repr(getattr(lazy_obj, field.name)) == repr(getattr(obj, field.name))
@@ -1,3 +1,5 @@
+import dataclasses as dcs
+
 import pytest
 
 import aiotieba as tb
@@ -194,3 +196,16 @@ async def test_ShareThread_pt(client: tb.Client):
     assert frag.title != ""
     assert frag.url.host == "tieba.baidu.com"
     assert frag.is_external is False
+
+
+@pytest.mark.flaky(reruns=2, reruns_delay=5.0)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_Posts_lazy(client: tb.Client):
+    posts = await client.get_posts(8211419000, with_comments=True)
+    lazy_posts = await client.get_posts(8211419000, with_comments=True, lazy=True)
+
+    assert lazy_posts.objs
+    for obj, lazy_obj in zip(posts, lazy_posts, strict=True):
+        assert lazy_obj.text == obj.text
+        for field in dcs.fields(obj):
+            assert repr(getattr(lazy_obj, field.name)) == repr(getattr(obj, field.name))
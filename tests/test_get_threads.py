@@ -1,3 +1,5 @@
+import dataclasses as dcs
+
 import pytest
 
 import aiotieba as tb
@@ -155,3 +157,19 @@ async def test_Threads(client: tb.Client):
             assert frag.width > 0
             assert frag.height > 0
             assert frag.view_num > 0
+
+
+@pytest.mark.flaky(reruns=2, reruns_delay=5.0)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_Threads_lazy(client: tb.Client):
+    threads = await client.get_threads("starry")
+    lazy_threads = await client.get_threads("starry", lazy=True)
+
+    assert lazy_threads.objs
+    objs = {obj.tid: obj for obj in threads}
+    for lazy_obj in lazy_threads:
+        if (obj := objs.get(lazy_obj.tid)) is None:
+            continue
+        assert lazy_obj.text == obj.text
+        for field in dcs.fields(obj):
+            assert repr(getattr(lazy_obj, field.name)) == repr(getattr(obj, field.name))
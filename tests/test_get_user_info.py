@@ -75,3 +75,10 @@ async def test_get_user_info(client: tb.Client):
     assert user.user_name == self_info.user_name
     assert user.tieba_uid > 0
     assert user.age > 0
+
+    ids = [self_info.user_id, self_info.portrait, self_info.user_id, "tb.1.invalid"]
+    results = {id_: (user, err) async for id_, user, err in client.get_user_infos(ids, tb.ReqUInfo.BASIC)}
+    assert len(results) == 3
+    assert results[self_info.portrait][0].user_id == self_info.user_id
+    assert results[self_info.user_id][0].portrait == self_info.portrait
+    assert results["tb.1.invalid"][0].user_id == 0
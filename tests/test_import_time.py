@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+# aiotieba自身模块的导入耗时预算 不含aiohttp等第三方依赖
+IMPORT_BUDGET_MS = float(os.getenv("TB_IMPORT_BUDGET_MS", "150"))
+
+# 冷启动时不应被执行的重量级模块
+LAZY_MODULES = ["bs4", "lxml", "aiotieba.api.get_posts._classdef", "aiotieba.api.get_threads.protobuf"]
+
+
+def _cold_import() -> tuple[float, list[str]]:
+    code = f"import sys, aiotieba; print(*[m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+
+    self_us = 0
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[2].strip().startswith("aiotieba"):
+            self_us += int(parts[0])
+
+    return self_us / 1000, proc.stdout.split()
+
+
+def test_import_time():
+    elapsed, loaded = min(_cold_import() for _ in range(3))
+
+    assert not loaded, f"modules should be loaded lazily: {loaded}"
+    assert elapsed < IMPORT_BUDGET_MS, f"import aiotieba took {elapsed:.1f}ms. budget={IMPORT_BUDGET_MS:.0f}ms"
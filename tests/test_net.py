@@ -0,0 +1,309 @@
+import asyncio
+import contextlib
+import gc
+import gzip
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from cryptography.hazmat.primitives import padding
+
+from aiotieba import Client
+from aiotieba.config import ReconnectConfig, RetryConfig, TimeoutConfig
+from aiotieba.core import Account, ConnectionPool, NetCore, SingleFlight, WsCodec, WsCore, WsWaiter
+from aiotieba.enums import WsStatus
+from aiotieba.exception import HTTPStatusError, TiebaServerError, WsDisconnectedError
+
+
+@pytest.mark.asyncio
+async def test_ConnectionPool():
+    accepted = 0
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        nonlocal accepted
+        accepted += 1
+        with contextlib.suppress(ConnectionError, asyncio.IncompleteReadError):
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+    async with server, ConnectionPool(prewarm_urls=(url,), prewarm_num=2) as pool:
+        # 打开后在后台预热2个空闲连接
+        for _ in range(100):
+            if accepted == 2:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        assert accepted == 2
+        assert sum(len(conns) for conns in pool.connector._conns.values()) == 2
+
+        # 与HttpCore一致以ssl=False发送的请求和再次预热均复用空闲连接
+        async with aiohttp.ClientSession(connector=pool.connector, connector_owner=False) as session:
+            for _ in range(3):
+                async with session.get(url, ssl=False) as resp:
+                    assert await resp.read() == b"ok"
+        await pool.prewarm()
+        assert accepted == 2
+
+        # 共享连接池的Client退出时不关闭连接池
+        async with Client(pool=pool), Client(pool=pool):
+            pass
+        assert not pool.closed
+
+    assert pool.closed
+
+    # 独占连接池随Client一同关闭
+    client = Client()
+    async with client:
+        assert not client._pool.closed
+    assert client._pool.closed
+
+
+@pytest.mark.asyncio
+async def test_SingleFlight():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch(x: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return x * 2
+
+    rets = await asyncio.gather(*[single_flight.do("k", fetch, 21) for _ in range(16)])
+    assert rets == [42] * 16
+    assert calls == 1
+    assert not single_flight.flights
+
+    async def fail() -> None:
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    rets = await asyncio.gather(*[single_flight.do("e", fail) for _ in range(4)], return_exceptions=True)
+    assert all(isinstance(ret, RuntimeError) for ret in rets)
+
+    # 已完成的请求不会被复用
+    assert await single_flight.do("k", fetch, 1) == 2
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_retry():
+    net_core = NetCore(None, retry=RetryConfig(max_retries=2, base_delay=0.01))
+    calls = 0
+
+    async def flaky() -> str:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise HTTPStatusError(503, "Service Unavailable")
+        return "ok"
+
+    assert await net_core.fetch(("ep",), flaky) == "ok"
+    assert calls == 3
+
+    async def bad() -> None:
+        nonlocal calls
+        calls += 1
+        raise TiebaServerError(4, "参数错误")
+
+    calls = 0
+    with pytest.raises(TiebaServerError):
+        await net_core.fetch(("ep",), bad)
+    assert calls == 1
+
+    assert net_core.retry.is_retryable(WsDisconnectedError("Websocket disconnected"))
+
+
+@pytest.mark.asyncio
+async def test_hedge():
+    net_core = NetCore(None, retry=RetryConfig(hedge=True, hedge_delay=0.02))
+    delays = [1.0, 0.0]
+
+    async def slow_once() -> float:
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    ret = await asyncio.wait_for(net_core.fetch(("ep",), slow_once), 0.5)
+    assert ret == 0.0
+    assert not delays
+
+
+@pytest.mark.asyncio
+async def test_parse_executor():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiotieba.config import ParseConfig
+
+    def parse(body: bytes) -> tuple[int, str]:
+        return len(body), threading.current_thread().name
+
+    with ThreadPoolExecutor(1, thread_name_prefix="parser") as executor:
+        net_core = NetCore(None, parse=ParseConfig(executor, threshold=16))
+
+        size, thread_name = await net_core.parse(parse, b"x" * 8)
+        assert size == 8
+        assert not thread_name.startswith("parser")
+
+        size, thread_name = await net_core.parse(parse, b"x" * 16)
+        assert size == 16
+        assert thread_name.startswith("parser")
+
+
+def test_WsCodec():
+    account = Account()
+    codec = WsCodec(account, compress_threshold=64)
+
+    for size in (0, 1, 15, 16, 17, 100, 4096):
+        data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+
+        # 与逐帧新建上下文的实现结果一致
+        packed = codec.pack(data, 0x1234, size, compress=True)
+        expected = gzip.compress(data, compresslevel=6, mtime=0) if size >= 64 else data
+        padder = padding.PKCS7(128).padder()
+        encryptor = account.aes_ecb_chiper.encryptor()
+        expected = encryptor.update(padder.update(expected) + padder.finalize()) + encryptor.finalize()
+        assert packed[9:] == expected
+        assert packed[0] == (0xC8 if size >= 64 else 0x88)
+
+        assert codec.parse(bytes(packed)) == (data, 0x1234, size)
+        assert codec.parse(bytes(codec.pack(data, 1, 2, encrypt=False))) == (data, 1, 2)
+
+    with pytest.raises(ValueError, match="length"):
+        codec.parse(bytes(codec.pack(b"x", 1, 2))[:-1])
+
+
+@pytest.mark.asyncio
+async def test_WsWaiter():
+    waiter = WsWaiter(0.1, resolution=0.02)
+    loop = asyncio.get_running_loop()
+
+    resps = [waiter.new() for _ in range(100)]
+    for resp in resps[::2]:
+        waiter.set_done(resp.req_id, b"ok")
+
+    start = loop.time()
+    rets = await asyncio.gather(*[resp.read() for resp in resps], return_exceptions=True)
+    elapsed = loop.time() - start
+    assert rets[::2] == [b"ok"] * 50
+    assert all(isinstance(ret, asyncio.TimeoutError) for ret in rets[1::2])
+    # 亚秒级精度
+    assert 0.08 < elapsed < 0.3
+    assert waiter.stats.timeouts == 50
+    assert not waiter.waiter
+    assert not waiter._deadlines
+
+    # 超时后才到达的响应与未知响应
+    waiter.set_done(resps[1].req_id, b"late")
+    waiter.set_done(1, b"orphan")
+    assert waiter.stats.late == 1
+    assert waiter.stats.orphans == 1
+
+    # 调用方取消后到达的响应
+    resp = waiter.new()
+    task = asyncio.create_task(resp.read())
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.sleep(0)
+    waiter.set_done(resp.req_id, b"late")
+    assert waiter.stats.late == 2
+    await asyncio.sleep(0.15)
+    assert waiter.stats.timeouts == 50
+
+    # 被丢弃的响应超时后不会产生"never retrieved"日志
+    errors = []
+    loop.set_exception_handler(lambda _, ctx: errors.append(ctx))
+    waiter.new()
+    await asyncio.sleep(0.15)
+    gc.collect()
+    loop.set_exception_handler(None)
+    assert waiter.stats.timeouts == 51
+    assert not errors
+
+
+class FakeWebSocket:
+    def __init__(self) -> None:
+        self.inbox = asyncio.Queue()
+        self.sent = []
+        self.closed = False
+        self.close_code = None
+        self._writer = SimpleNamespace(transport=SimpleNamespace(is_closing=lambda: self.closed))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        msg = await self.inbox.get()
+        if msg is None:
+            self.closed = True
+            raise StopAsyncIteration
+        return msg
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(bytes(data))
+
+    async def close(self) -> None:
+        self.closed = True
+        self.inbox.put_nowait(None)
+
+
+@pytest.mark.asyncio
+async def test_ws_reconnect(monkeypatch):
+    sockets = []
+    fail_times = 1
+
+    async def fake_open(self: WsCore) -> None:
+        nonlocal fail_times
+        if len(sockets) and fail_times:
+            fail_times -= 1
+            raise ConnectionRefusedError
+        self.websocket = FakeWebSocket()
+        sockets.append(self.websocket)
+        self.ws_dispatcher = asyncio.create_task(self._WsCore__ws_dispatch(self.websocket))
+
+    opened = asyncio.Event()
+
+    async def handshake() -> None:
+        ws_core._status = WsStatus.OPEN
+        opened.set()
+
+    monkeypatch.setattr(WsCore, "_WsCore__open", fake_open)
+    net_core = NetCore(None, timeout=TimeoutConfig(ws_read=2.0))
+    ws_core = WsCore(Account(), net_core, ReconnectConfig(base_delay=0.01), handshake)
+    await ws_core.connect()
+    await handshake()
+    opened.clear()
+    mid_manager = ws_core.mid_manager
+
+    read_resp = await ws_core.send(b"read", 1, idempotent=True)
+    write_resp = await ws_core.send(b"write", 2)
+
+    # 断线后不可重发的请求立即失败 只读请求改走http
+    sockets[0].inbox.put_nowait(None)
+    with pytest.raises(WsDisconnectedError):
+        await asyncio.wait_for(write_resp.read(), 0.5)
+    assert ws_core.status == WsStatus.CONNECTING
+
+    # 退避重连成功后重发幂等请求 并保留msg_id状态
+    await asyncio.wait_for(opened.wait(), 1.0)
+    await asyncio.sleep(0)
+    assert len(sockets) == 2
+    assert ws_core.mid_manager is mid_manager
+    replayed = ws_core.codec.parse(sockets[1].sent[0])
+    assert replayed == (b"read", 1, read_resp.req_id)
+
+    reply = ws_core.codec.pack(b"result", 1, read_resp.req_id)
+    sockets[1].inbox.put_nowait(aiohttp.WSMessage(aiohttp.WSMsgType.BINARY, bytes(reply), None))
+    assert await asyncio.wait_for(read_resp.read(), 0.5) == b"result"
+
+    # 主动关闭不会触发重连
+    await ws_core.close()
+    await asyncio.sleep(0.05)
+    assert ws_core.status == WsStatus.CLOSED
+    assert len(sockets) == 2
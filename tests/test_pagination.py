@@ -0,0 +1,74 @@
+import asyncio
+import dataclasses as dcs
+
+import pytest
+
+from aiotieba.helper import iter_pages
+
+
+@dcs.dataclass
+class Page:
+    total_page: int = 0
+
+
+@dcs.dataclass
+class Result:
+    pn: int
+    has_more: bool
+    page: Page = dcs.field(default_factory=Page)
+
+
+@pytest.mark.asyncio
+async def test_iter_pages():
+    requested = []
+    inflight = 0
+    max_inflight = 0
+
+    async def fetch(pn: int) -> Result:
+        nonlocal inflight, max_inflight
+        requested.append(pn)
+        inflight += 1
+        max_inflight = max(max_inflight, inflight)
+        await asyncio.sleep(0.01)
+        inflight -= 1
+        return Result(pn, pn < 5, Page(5))
+
+    pns = [res.pn async for res in iter_pages(fetch, prefetch=3)]
+    assert pns == [1, 2, 3, 4, 5]
+    # 已知总页数时不会越界预取
+    assert sorted(requested) == [1, 2, 3, 4, 5]
+    assert max_inflight == 3
+
+    # 总页数未知时 越过末页的预取请求被取消
+    finished = []
+    cancelled = []
+
+    async def fetch_unknown(pn: int) -> Result:
+        try:
+            # 仅首页与末页会及时完成 其余页只能被取消
+            await asyncio.sleep(0.01 * pn if pn <= finish_pn else 10)
+        except asyncio.CancelledError:
+            cancelled.append(pn)
+            raise
+        finished.append(pn)
+        return Result(pn, pn < 2)
+
+    finish_pn = 2
+    pns = [res.pn async for res in iter_pages(fetch_unknown, prefetch=2)]
+    assert pns == [1, 2]
+    await asyncio.sleep(0.01)
+    assert finished == [1, 2]
+    assert cancelled == [3]
+
+    # 提前关闭时取消所有预取请求
+    finish_pn = 1
+    finished.clear()
+    cancelled.clear()
+    gen = iter_pages(fetch_unknown, prefetch=2)
+    assert (await gen.__anext__()).pn == 1
+    # 使预取请求开始执行
+    await asyncio.sleep(0)
+    await gen.aclose()
+    await asyncio.sleep(0.01)
+    assert finished == [1]
+    assert sorted(cancelled) == [2, 3]
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from aiotieba.core import RateScheduler, priority
+from aiotieba.core.scheduler import TokenBucket
+from aiotieba.enums import ReqPriority
+
+
+@pytest.mark.asyncio
+async def test_RateScheduler():
+    scheduler = RateScheduler(account_rate=50.0, account_burst=1, endpoint_rates={"/slow": (20.0, 1)})
+    order = []
+
+    async def send(name: str, prio: ReqPriority) -> None:
+        with priority(prio):
+            await scheduler.acquire("acc", "/c/f/frs/page")
+        order.append(name)
+
+    # 消耗掉突发令牌
+    await scheduler.acquire("acc", "/c/f/frs/page")
+
+    tasks = [asyncio.create_task(send(f"low{i}", ReqPriority.LOW)) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(send("high", ReqPriority.HIGH)))
+    await asyncio.gather(*tasks)
+
+    assert order[0] == "high"
+    assert order[1:] == ["low0", "low1", "low2"]
+
+    stats = scheduler.stats
+    assert stats[ReqPriority.LOW].granted == 3
+    assert stats[ReqPriority.LOW].waiting == 0
+    assert stats[ReqPriority.HIGH].avg_wait > 0.0
+
+    # 其他账号不受该账号限速影响
+    await asyncio.wait_for(scheduler.acquire("other", "/c/f/frs/page"), 0.01)
+
+    # 接口限速在账号之间共享
+    await scheduler.acquire("a", "/slow")
+    task = asyncio.create_task(scheduler.acquire("b", "/slow"))
+    await asyncio.sleep(0.01)
+    assert not task.done()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert stats[ReqPriority.NORMAL].waiting == 0
+
+
+def test_RateScheduler_invalid_rate():
+    with pytest.raises(ValueError, match="rate must be positive"):
+        TokenBucket(0.0, 1)
+    with pytest.raises(ValueError, match="rate must be positive"):
+        RateScheduler(account_rate=0.0)
+    with pytest.raises(ValueError, match="rate must be positive"):
+        RateScheduler(endpoint_rates={"/blocked": (-1.0, 1)})